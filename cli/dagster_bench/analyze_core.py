@@ -1,8 +1,8 @@
 """Analyze Dagster lag across different asset counts and generate charts."""
 
 import argparse
+import asyncio
 import json
-import subprocess
 import sys
 
 try:
@@ -13,70 +13,101 @@ except ImportError:
     print("Install: uv pip install matplotlib numpy")
     sys.exit(1)
 
-from dagster_bench.utils import parse_asset_count
-
-
-def run_measurement(
-    asset_prefix,
+from dagster_bench.capacity import best_model, fit_capacity, format_model, predict
+from dagster_bench.events import PHASES
+from dagster_bench.measure_core import (
+    default_repo_location,
+    format_locations,
+    run_measurement,
+    start_metrics,
+)
+from dagster_bench.results import DEFAULT_RESULTS_FILE, ResultStore, new_session_id
+from dagster_bench.stats import format_summary_table, summarize_phases, summarize_samples
+from dagster_bench.utils import (
+    parse_asset_count,
+    parse_layout,
+    parse_partition_count,
+    parse_shards,
+    parse_topology,
+)
+
+LAG_COMPONENTS = {
+    'queue': lambda sample: sample['enqueue_to_start'],
+    'init': lambda sample: sample['start_to_step'],
+    'total': lambda sample: sample['enqueue_to_start'] + sample['start_to_step'],
+}
+
+
+async def measure_prefixes(
+    prefixes,
     url,
     runs=3,
-    repo_location=None,
     username=None,
     password=None,
+    workers=4,
+    transport='auto',
+    lifecycle='full',
     verbose=False,
+    on_result=None,
+    metrics=None,
 ):
-    """Run lag measurement for a given asset prefix.
-
-    Returns dict with 'enqueue_to_start' and 'start_to_step' metrics, or None if failed.
-    """
-    cmd = [
-        "bench",
-        "measure",
-        asset_prefix,
-        "--url", url,
-        "--runs", str(runs)
-    ]
-
-    if username:
-        cmd.extend(["--username", username])
-    if password:
-        cmd.extend(["--password", password])
-    if repo_location:
-        cmd.extend(["--repo-location", repo_location])
-
-    if verbose:
-        print(f"  Measuring {asset_prefix}...")
-
-    try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            check=True
-        )
-
-        # Parse JSON output from last line
-        lines = result.stdout.strip().split('\n')
-        for line in reversed(lines):
-            line = line.strip()
-            if line.startswith('{') and line.endswith('}'):
-                try:
-                    data = json.loads(line)
-                    if 'enqueue_to_start' in data and 'start_to_step' in data:
-                        return data
-                except json.JSONDecodeError:
-                    continue
+    """Measure lag for several asset prefixes in-process.
 
-        return None
-
-    except subprocess.CalledProcessError as e:
-        if verbose:
-            print(f"    Error: {e}")
-        return None
+    Each prefix is measured against its own 'simple-asset-{prefix}' location (or its shard
+    locations), with up to workers prefixes measured at the same time. on_result(prefix,
+    result) is called as each measurement finishes; result is None if it failed. Runs and
+    requests are recorded in metrics (a metrics.BenchMetrics) when given.
 
+    Returns a dict mapping prefix to the structured result of run_measurement, or None.
+    """
+    semaphore = asyncio.Semaphore(workers)
+
+    async def measure(prefix):
+        async with semaphore:
+            if verbose:
+                print(f"  Measuring {prefix}...")
+            try:
+                result = await run_measurement(
+                    url,
+                    prefix,
+                    runs,
+                    None,
+                    username,
+                    password,
+                    transport=transport,
+                    lifecycle=lifecycle,
+                    verbose=verbose,
+                    quiet=True,
+                    metrics=metrics,
+                )
+                if not result['enqueue_to_start'] or not result['start_to_step']:
+                    result = None
+            except Exception as e:
+                if verbose:
+                    print(f"    Error: {e}")
+                result = None
+        if on_result is not None:
+            on_result(prefix, result)
+        return prefix, result
+
+    return dict(await asyncio.gather(*(measure(prefix) for prefix in prefixes)))
+
+
+def save_results(
+    asset_counts,
+    enqueue_lags,
+    step_lags,
+    prefixes,
+    output_file,
+    summaries=None,
+    phase_summaries=None,
+):
+    """Save measurement results to JSON.
 
-def save_results(asset_counts, enqueue_lags, step_lags, prefixes, output_file):
-    """Save measurement results to JSON."""
+    summaries and phase_summaries optionally hold, per prefix, the distribution statistics
+    of each lag component and of each run phase (see stats.summarize_samples and
+    stats.summarize_phases).
+    """
     data = {
         'measurements': [
             {
@@ -89,6 +120,12 @@ def save_results(asset_counts, enqueue_lags, step_lags, prefixes, output_file):
             for prefix, count, enqueue, step in zip(prefixes, asset_counts, enqueue_lags, step_lags)
         ]
     }
+    if summaries is not None:
+        for measurement, summary in zip(data['measurements'], summaries):
+            measurement['distribution_seconds'] = summary
+    if phase_summaries is not None:
+        for measurement, summary in zip(data['measurements'], phase_summaries):
+            measurement['phases_seconds'] = summary
 
     with open(output_file, 'w') as f:
         json.dump(data, f, indent=2)
@@ -96,9 +133,16 @@ def save_results(asset_counts, enqueue_lags, step_lags, prefixes, output_file):
     return data
 
 
-def create_chart(asset_counts, enqueue_lags, step_lags, prefixes, output_file):
-    """Create stacked bar chart showing both lag components."""
-    fig, ax = plt.subplots(figsize=(14, 8))
+def create_chart(asset_counts, enqueue_lags, step_lags, prefixes, output_file, phase_lags=None):
+    """Create stacked bar chart showing both lag components.
+
+    phase_lags optionally maps each run phase to its mean duration per prefix; the full
+    lifecycle is then stacked phase by phase in a second panel.
+    """
+    if phase_lags is None:
+        fig, ax = plt.subplots(figsize=(14, 8))
+    else:
+        fig, (ax, phase_ax) = plt.subplots(1, 2, figsize=(24, 8))
 
     # Convert to numpy arrays
     enqueue_lags = np.array(enqueue_lags)
@@ -155,11 +199,189 @@ def create_chart(asset_counts, enqueue_lags, step_lags, prefixes, output_file):
                ha='center', va='bottom', fontsize=10, fontweight='bold',
                bbox=dict(boxstyle='round,pad=0.4', facecolor='yellow', alpha=0.8))
 
+    if phase_lags is not None:
+        _plot_phases(phase_ax, phase_lags, prefixes)
+
+    plt.tight_layout()
+    plt.savefig(output_file, dpi=150, bbox_inches='tight')
+    plt.close()
+
+
+def _plot_phases(ax, phase_lags, prefixes):
+    """Stack the mean duration of every run phase per configuration."""
+    x = np.arange(len(prefixes))
+    width = 0.6
+    colors = plt.get_cmap('tab10').colors
+    bottom = np.zeros(len(prefixes))
+
+    for color, (phase, lags) in zip(colors, phase_lags.items()):
+        # Phases a launcher or executor does not report add nothing to the stack
+        lags = np.nan_to_num(np.array(lags, dtype=float))
+        if not lags.any():
+            continue
+        ax.bar(x, lags, width, bottom=bottom, label=phase, color=color, alpha=0.8)
+        for i, lag in enumerate(lags):
+            if lag > 0.1:  # Only show if significant
+                ax.text(i, bottom[i] + lag/2, f'{lag:.2f}s',
+                       ha='center', va='center', fontsize=8, fontweight='bold', color='white')
+        bottom += lags
+
+    for i, total in enumerate(bottom):
+        ax.text(i, total, f'{total:.2f}s',
+               ha='center', va='bottom', fontsize=10, fontweight='bold',
+               bbox=dict(boxstyle='round,pad=0.4', facecolor='yellow', alpha=0.8))
+
+    ax.set_xlabel('Asset Configuration', fontsize=12, fontweight='bold')
+    ax.set_ylabel('Duration (seconds)', fontsize=12, fontweight='bold')
+    ax.set_title('Run Lifecycle Breakdown\n(Enqueued → Run Success)',
+                 fontsize=14, fontweight='bold', pad=20)
+    ax.set_xticks(x)
+    ax.set_xticklabels(prefixes, fontsize=11)
+    ax.legend(fontsize=10, loc='upper left')
+    ax.grid(True, alpha=0.3, linestyle='--', axis='y')
+
+
+def location_size(prefix, against='assets'):
+    """Return the assets, or partitions of all assets, that each location of a prefix holds."""
+    shards, base = parse_shards(prefix)
+    assets = parse_asset_count(base) / shards
+    if against == 'partitions':
+        return assets * parse_partition_count(base)
+    return assets
+
+
+def capacity_points(records, against='assets', prefixes=None):
+    """Group stored lag samples into points of the capacity model.
+
+    Only samples measured one run and one location at a time and without upstream assets
+    are used, so bench analyze samples of several workers are left out. Without
+    prefixes, only prefixes in the default layout and without dependencies are, so the
+    size of a location is the only thing that varies. Returns (prefixes, sizes,
+    {component: [lags of every prefix]}), sorted by size.
+    """
+    groups = {}
+    for record in records:
+        prefix = record.get('prefix')
+        if record.get('mode', 'sequential') != 'sequential' or record.get('upstream'):
+            continue
+        # Only one location may have been measured at a time, or the queue was shared
+        if (record.get('workers') or 1) > 1:
+            continue
+        if prefixes is not None and prefix not in prefixes:
+            continue
+        if prefixes is None and (
+            parse_layout(prefix)[0] != 'separate' or parse_topology(prefix)[0] != 'none'
+        ):
+            continue
+        groups.setdefault(prefix, []).append(record)
+
+    points = sorted(
+        (location_size(prefix, against), prefix) for prefix in groups
+        if location_size(prefix, against) > 0
+    )
+    return (
+        [prefix for _, prefix in points],
+        np.array([size for size, _ in points]),
+        {
+            component: [[lag(sample) for sample in groups[prefix]] for _, prefix in points]
+            for component, lag in LAG_COMPONENTS.items()
+        },
+    )
+
+
+def format_interval(estimate, unit='', spec='.3g'):
+    low, high = estimate['ci']
+    return f"{estimate['value']:{spec}}{unit} [{low:{spec}}, {high:{spec}}]"
+
+
+def create_capacity_chart(sizes, lags, models, quantile, against, output_file):
+    """Plot the quantile of every lag component per size with the fitted curves."""
+    fig, axes = plt.subplots(1, len(lags), figsize=(8 * len(lags), 6))
+    curve_sizes = np.linspace(0, sizes.max() * 1.5, 300)[1:]
+    for ax, (component, groups) in zip(np.atleast_1d(axes), lags.items()):
+        ax.scatter(sizes, [np.percentile(values, quantile) for values in groups],
+                   color='black', zorder=3, label=f'p{quantile:g}')
+        for model, result in models[component].items():
+            params = {name: np.array([p['value']]) for name, p in result['parameters'].items()}
+            ax.plot(curve_sizes, predict(model, params, curve_sizes)[:, 0],
+                    label=f"{model} (R² {result['r2']:.3f})")
+        breakpoint = models[component].get('piecewise', {}).get('parameters', {}).get('t')
+        if breakpoint is not None:
+            ax.axvspan(*breakpoint['ci'], color='grey', alpha=0.15, label='breakpoint CI')
+        ax.set_xlabel(f'{against.capitalize()} per location', fontsize=12, fontweight='bold')
+        ax.set_ylabel(f'p{quantile:g} lag (seconds)', fontsize=12, fontweight='bold')
+        ax.set_title(f'{component.capitalize()} lag', fontsize=14, fontweight='bold')
+        ax.legend(fontsize=10, loc='upper left')
+        ax.grid(True, alpha=0.3, linestyle='--')
     plt.tight_layout()
     plt.savefig(output_file, dpi=150, bbox_inches='tight')
     plt.close()
 
 
+def run_capacity_model(args):
+    """Fit the capacity model to the lag samples in the results file and report it."""
+    filters = {'kind': 'lag'}
+    if args.session:
+        filters['session'] = args.session
+    records = ResultStore(args.results).load(**filters)
+    prefixes, sizes, lags = capacity_points(records, args.against, args.prefixes)
+    if len(prefixes) < 2:
+        print(f"Error: Need lag samples of at least 2 sizes in {args.results}, "
+              f"found {len(prefixes)}")
+        sys.exit(1)
+
+    predict_at = [parse_asset_count(value) for value in args.predict]
+    models = {
+        component: fit_capacity(
+            sizes, groups, args.quantile, predict_at, args.max_lag, args.confidence,
+        )
+        for component, groups in lags.items()
+    }
+
+    unit = 'partitions' if args.against == 'partitions' else 'assets'
+    quantile = f"p{args.quantile:g}"
+    print("=" * 70)
+    print("Capacity Model")
+    print("=" * 70)
+    for prefix, size, groups in zip(prefixes, sizes, lags['total']):
+        print(f"  {prefix:<12} {size:>10,.0f} {unit} per location, {len(groups)} samples")
+    print("=" * 70)
+
+    for component, results in models.items():
+        print(f"\n{component.capitalize()} lag {quantile} (seconds) vs {unit} per location x:")
+        print(f"  {'Model':<10} {'R²':>7} {'AIC':>8}  Fit")
+        for model, result in results.items():
+            print(f"  {model:<10} {result['r2']:>7.3f} {result['aic']:>8.1f}  "
+                  f"{format_model(model, result['parameters'])}")
+        best = best_model(results)
+        print(f"  Best fit (lowest AIC): {best}")
+        if 'piecewise' in results:
+            breakpoint = results['piecewise']['parameters']['t']
+            print(f"  Breakpoint: {format_interval(breakpoint, spec=',.0f')} {unit}")
+        for size, prediction in results[best]['predictions'].items():
+            print(f"  Predicted {quantile} at {size:,} {unit}: {format_interval(prediction, 's')}")
+        if args.max_lag is not None:
+            print(f"  Most {unit} with {quantile} within {args.max_lag:g}s: "
+                  f"{format_interval(results[best]['max_size'], spec=',.0f')}")
+    print(f"\nIntervals: {args.confidence:.0%} bootstrap confidence intervals")
+
+    output = args.output if args.output != 'lag_analysis.png' else 'capacity_model.png'
+    json_file = output.replace('.png', '.json')
+    with open(json_file, 'w') as f:
+        json.dump({
+            'against': args.against,
+            'quantile': args.quantile,
+            'points': [
+                {'prefix': prefix, 'size': float(size), 'samples': len(groups)}
+                for prefix, size, groups in zip(prefixes, sizes, lags['total'])
+            ],
+            'models': models,
+        }, f, indent=2)
+    create_capacity_chart(sizes, lags, models, args.quantile, args.against, output)
+    print(f"\n✅ Model saved: {json_file}")
+    print(f"✅ Chart saved: {output}")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Analyze Dagster lag across asset counts',
@@ -168,15 +390,20 @@ def main():
 Examples:
   bench analyze --prefixes a1p2k 2k
   bench analyze --prefixes 250 500 2k 5k 10k --runs 5
+  bench analyze --prefixes 250 500 2k 5k 10k --workers 1  # one location at a time
   bench analyze --prefixes 2k 10k --url https://dagster.example.com --username user --password pass
+  bench analyze --model --predict 20k 50k --max-lag 30  # capacity model of stored samples
+  bench analyze --model --against partitions --prefixes a1p2k a1p5k a1p10k a1p25k
 
-Note: Repository locations are auto-constructed as 'simple-asset-{prefix}'
+Note: Repository locations are auto-constructed as 'simple-asset-{prefix}',
+      or 'simple-asset-{prefix}-{index}' for sharded prefixes like s4x10k
       Default URL is http://localhost:80 with admin:admin auth
         """
     )
 
-    parser.add_argument('--prefixes', nargs='+', required=True,
-                        help='Asset prefixes to test (e.g., 500 2k 10k 25k 50k)')
+    parser.add_argument('--prefixes', nargs='+',
+                        help='Asset prefixes to test (e.g., 500 2k 10k 25k 50k); with --model, '
+                             'the prefixes to fit (default: all without layout or topology)')
     parser.add_argument('--url', default='http://localhost:80',
                         help='Dagster URL (default: http://localhost:80)')
     parser.add_argument('--username', default='admin',
@@ -187,88 +414,165 @@ Note: Repository locations are auto-constructed as 'simple-asset-{prefix}'
                         help='Number of test runs per prefix (default: 3)')
     parser.add_argument('--output', default='lag_analysis.png',
                         help='Output chart filename (default: lag_analysis.png)')
+    parser.add_argument('--results', default=DEFAULT_RESULTS_FILE,
+                        help=f'JSONL file every sample is appended to (default: '
+                             f'{DEFAULT_RESULTS_FILE}, empty to disable)')
+    parser.add_argument('--workers', type=int,
+                        help='Locations measured in parallel (default: up to 4)')
+    parser.add_argument('--transport', choices=['auto', 'subscribe', 'poll'], default='auto',
+                        help='How run events are collected (default: auto)')
+    parser.add_argument('--lifecycle', choices=['full', 'start'], default='full',
+                        help='Watch each run until it succeeds, breaking down every phase, '
+                             'or only until its step starts (default: full)')
+    parser.add_argument('--metrics-port', dest='metrics_port', type=int,
+                        help='Serve Prometheus metrics on this port while measuring '
+                             '(needs prometheus_client)')
+    parser.add_argument('--metrics-addr', dest='metrics_addr', default='0.0.0.0',
+                        help='Address to serve metrics on (default: 0.0.0.0)')
     parser.add_argument('--verbose', '-v', action='store_true',
                         help='Verbose output')
 
+    model = parser.add_argument_group('capacity model')
+    model.add_argument('--model', action='store_true',
+                       help='Fit linear, power-law and piecewise-linear models to the lag '
+                            'samples in --results instead of measuring')
+    model.add_argument('--against', choices=['assets', 'partitions'], default='assets',
+                       help='Size of a location the lag is modelled against (default: assets)')
+    model.add_argument('--quantile', type=float, default=95,
+                       help='Lag quantile to model, in percent (default: 95)')
+    model.add_argument('--predict', nargs='+', default=[],
+                       help='Sizes to predict the lag quantile at (e.g. 20k 50k)')
+    model.add_argument('--max-lag', dest='max_lag', type=float,
+                       help='Report the largest size predicted to stay within this many seconds')
+    model.add_argument('--confidence', type=float, default=0.95,
+                       help='Confidence level of the bootstrap intervals (default: 0.95)')
+    model.add_argument('--session', help='Only fit samples of this session')
+
     args = parser.parse_args()
 
+    if args.model:
+        if not 0 < args.quantile < 100:
+            parser.error('--quantile must be between 0 and 100')
+        run_capacity_model(args)
+        return
+    if not args.prefixes:
+        parser.error('--prefixes is required unless --model is given')
+
+    if args.workers is None:
+        args.workers = min(4, len(args.prefixes))
+    if args.workers < 1:
+        parser.error('--workers must be at least 1')
+
     print("=" * 70)
     print("Dagster Lag Analysis - Elbow Chart")
     print("=" * 70)
     print(f"Asset prefixes: {', '.join(args.prefixes)}")
     print(f"Dagster URL:    {args.url}")
     print(f"Runs per test:  {args.runs}")
+    print(f"Workers:        {args.workers}")
     print("=" * 70)
     print()
 
     # Run measurements
-    results = {}
-    asset_counts = []
-    enqueue_lags = []
-    step_lags = []
-
-    print("Running measurements...")
-    for prefix in args.prefixes:
-        # Auto-construct repo location name
-        repo_location = f"simple-asset-{prefix}"
-
-        if args.verbose:
-            print(f"\nTesting {prefix}...")
-            print(f"  Repo location: {repo_location}")
-        else:
-            print(f"  {prefix} ({repo_location})...", end='', flush=True)
-
-        data = run_measurement(
-            prefix,
-            args.url,
-            args.runs,
-            repo_location,
-            args.username,
-            args.password,
-            args.verbose,
-        )
-
+    def report(prefix, data):
         if data is not None:
-            asset_count = parse_asset_count(prefix)
-            results[prefix] = {
-                'count': asset_count,
-                'enqueue': data['enqueue_to_start'],
-                'step': data['start_to_step']
-            }
-            asset_counts.append(asset_count)
-            enqueue_lags.append(data['enqueue_to_start'])
-            step_lags.append(data['start_to_step'])
-
-            if not args.verbose:
-                total = data['enqueue_to_start'] + data['start_to_step']
-                enq = data['enqueue_to_start']
-                stp = data['start_to_step']
-                print(f" {total:.2f}s (Q:{enq:.2f}s + I:{stp:.2f}s)")
+            enq = float(np.mean(data['enqueue_to_start']))
+            stp = float(np.mean(data['start_to_step']))
+            print(f"  {prefix} ({format_locations(data['repo_location'])}): {enq + stp:.2f}s "
+                  f"(Q:{enq:.2f}s + I:{stp:.2f}s)")
         else:
-            if not args.verbose:
-                print(" FAILED")
+            print(f"  {prefix} ({format_locations(default_repo_location(prefix))}): FAILED")
             print(f"    Warning: Failed to measure {prefix}")
 
-    if len(results) < 1:
+    try:
+        metrics = start_metrics(args.metrics_port, args.metrics_addr)
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    print("Running measurements...")
+    results = asyncio.run(measure_prefixes(
+        args.prefixes,
+        args.url,
+        args.runs,
+        args.username,
+        args.password,
+        workers=args.workers,
+        transport=args.transport,
+        lifecycle=args.lifecycle,
+        verbose=args.verbose,
+        on_result=report,
+        metrics=metrics,
+    ))
+
+    measured_prefixes = [prefix for prefix in args.prefixes if results[prefix] is not None]
+    if len(measured_prefixes) < 1:
         print("\nError: No successful measurements")
         sys.exit(1)
 
+    asset_counts = [parse_asset_count(prefix) for prefix in measured_prefixes]
+    enqueue_lags = [np.mean(results[prefix]['enqueue_to_start']) for prefix in measured_prefixes]
+    step_lags = [np.mean(results[prefix]['start_to_step']) for prefix in measured_prefixes]
+
     # Sort by asset count
     sorted_indices = np.argsort(asset_counts)
-    sorted_prefixes = [args.prefixes[i] for i in sorted_indices]
+    sorted_prefixes = [measured_prefixes[i] for i in sorted_indices]
     asset_counts = np.array(asset_counts)[sorted_indices]
     enqueue_lags = np.array(enqueue_lags)[sorted_indices]
     step_lags = np.array(step_lags)[sorted_indices]
 
+    summaries = {
+        prefix: summarize_samples(results[prefix]['samples']) for prefix in sorted_prefixes
+    }
+    phase_summaries = {
+        prefix: summarize_phases(results[prefix]['samples']) for prefix in sorted_prefixes
+    }
+    # Merged phases are only summarized for prefixes whose runs had them
+    phase_lags = {
+        phase: [phase_summaries[prefix].get(phase, {}).get('mean') for prefix in sorted_prefixes]
+        for phase in PHASES
+        if any(phase in summary for summary in phase_summaries.values())
+    }
+
     # Save results to JSON first
     print("\nSaving results...")
     json_file = args.output.replace('.png', '.json')
-    data = save_results(asset_counts, enqueue_lags, step_lags, sorted_prefixes, json_file)
+    save_results(
+        asset_counts,
+        enqueue_lags,
+        step_lags,
+        sorted_prefixes,
+        json_file,
+        [summaries[prefix] for prefix in sorted_prefixes],
+        [phase_summaries[prefix] for prefix in sorted_prefixes],
+    )
     print(f"✅ Data saved: {json_file}")
 
+    if args.results:
+        store = ResultStore(args.results)
+        session = new_session_id()
+        written = sum(
+            store.append(
+                results[prefix]['samples'],
+                kind='lag',
+                session=session,
+                prefix=prefix,
+                repo_location=results[prefix]['repo_location'],
+                asset_count=results[prefix]['asset_count'],
+                url=args.url,
+                # Locations measured at the same time share the daemon and its queue
+                mode='sequential' if args.workers == 1 else 'parallel',
+                workers=args.workers,
+            )
+            for prefix in sorted_prefixes
+        )
+        print(f"✅ {written} samples appended: {args.results}")
+
     # Create chart from data
     print("Generating chart...")
-    create_chart(asset_counts, enqueue_lags, step_lags, sorted_prefixes, args.output)
+    create_chart(
+        asset_counts, enqueue_lags, step_lags, sorted_prefixes, args.output, phase_lags
+    )
     print(f"✅ Chart saved: {args.output}")
 
     # Print summary
@@ -283,6 +587,12 @@ Note: Repository locations are auto-constructed as 'simple-asset-{prefix}'
         print(f"{prefix:<15} {enqueue:<12.3f} {step:<12.3f} {total:<12.3f} {int(total*1000):<12,}")
 
     print("=" * 70)
+
+    for prefix in sorted_prefixes:
+        print(f"\n{prefix} (seconds):")
+        print(format_summary_table(summaries[prefix], indent='  '))
+        print()
+        print(format_summary_table(phase_summaries[prefix], indent='  '))
     print()
 
 
@@ -0,0 +1,170 @@
+"""Capacity model: scaling curves of a lag quantile against the size of a code location.
+
+Lag samples are grouped by configuration (e.g. assets per location) and each group is
+reduced to a quantile, such as p95. Three models are fitted to these points:
+- linear: y = a + b·x
+- power: y = a·x^b, fitted in log-log space
+- piecewise: y = a + b·x + c·max(0, x - t), continuous at the breakpoint t, which is
+  searched on a grid
+
+Every fit is repeated on bootstrap resamples of the samples within each group, all at
+once with batched least squares, which gives confidence intervals for the parameters,
+the breakpoint and predictions.
+"""
+
+import numpy as np
+
+MODELS = ('linear', 'power', 'piecewise')
+
+# Parameters of each model, the breakpoint included
+PARAMETER_COUNTS = {'linear': 2, 'power': 2, 'piecewise': 4}
+
+
+def bootstrap_quantiles(groups, quantile=95, n_boot=2000, seed=0):
+    """Return the quantile of every group of values and of its bootstrap resamples.
+
+    Returns a (K, n_boot + 1) array for K groups; column 0 holds the estimates from the
+    samples themselves.
+    """
+    rng = np.random.default_rng(seed)
+    rows = []
+    for values in groups:
+        values = np.asarray(values, dtype=float)
+        resamples = values[rng.integers(0, values.size, size=(n_boot, values.size))]
+        rows.append(np.concatenate([
+            [np.percentile(values, quantile)], np.percentile(resamples, quantile, axis=1),
+        ]))
+    return np.array(rows)
+
+
+def _solve(design, y):
+    """Least squares for a (..., K, p) design and (K, B) targets: (..., p, B) coefficients."""
+    return np.linalg.pinv(design) @ y
+
+
+def fit_linear(x, y):
+    coef = _solve(np.column_stack([np.ones_like(x), x]), y)
+    return {'a': coef[0], 'b': coef[1]}
+
+
+def fit_power(x, y):
+    if np.any(x <= 0) or np.any(y <= 0):
+        return None
+    coef = _solve(np.column_stack([np.ones_like(x), np.log(x)]), np.log(y))
+    return {'a': np.exp(coef[0]), 'b': coef[1]}
+
+
+def breakpoint_grid(x, size=200):
+    """Candidate breakpoints, leaving two distinct sizes left and one right of each."""
+    sizes = np.unique(x)
+    if sizes.size < 4:
+        return None
+    low, high = sizes[1], sizes[-2]
+    return np.unique(np.concatenate([sizes[1:-1], np.linspace(low, high, size)]))
+
+
+def fit_piecewise(x, y, grid=None):
+    grid = breakpoint_grid(x) if grid is None else grid
+    if grid is None:
+        return None
+    # (T, K, 3) designs, one per candidate breakpoint
+    hinge = np.maximum(0.0, x[None, :] - grid[:, None])
+    design = np.stack([np.ones_like(hinge), np.broadcast_to(x, hinge.shape), hinge], axis=2)
+    coef = _solve(design, y)
+    sse = ((design @ coef - y) ** 2).sum(axis=1)
+    best = sse.argmin(axis=0)
+    columns = np.arange(y.shape[1])
+    return {
+        'a': coef[best, 0, columns],
+        'b': coef[best, 1, columns],
+        'c': coef[best, 2, columns],
+        't': grid[best],
+    }
+
+
+FITS = {'linear': fit_linear, 'power': fit_power, 'piecewise': fit_piecewise}
+
+
+def predict(model, params, x):
+    """Predict every bootstrap replicate at sizes x: a (len(x), B) array."""
+    x = np.asarray(x, dtype=float)[:, None]
+    if model == 'linear':
+        return params['a'] + params['b'] * x
+    if model == 'power':
+        return params['a'] * x ** params['b']
+    return params['a'] + params['b'] * x + params['c'] * np.maximum(0.0, x - params['t'])
+
+
+def interval(values, confidence=0.95):
+    alpha = (1 - confidence) / 2
+    # Without interpolation, as values may be infinite
+    low, high = np.nanquantile(values, [alpha, 1 - alpha], method='inverted_cdf')
+    return float(low), float(high)
+
+
+def max_size(model, params, budget, upper):
+    """Return, per replicate, the largest size up to upper predicted to stay within budget.
+
+    Sizes are scanned on a geometric grid; inf means the budget holds up to upper.
+    """
+    grid = np.geomspace(upper / 1e5, upper, 5000)
+    over = predict(model, params, grid) > budget
+    first = over.argmax(axis=0)
+    sizes = np.where(over.any(axis=0), grid[np.maximum(first - 1, 0)], np.inf)
+    return np.where(over[0], 0.0, sizes)
+
+
+def fit_capacity(x, groups, quantile=95, predict_at=(), budget=None, confidence=0.95,
+                 n_boot=2000, seed=0):
+    """Fit every model to the quantile of groups of lag samples at sizes x.
+
+    Returns {model: result} for the models that could be fitted, with point estimates
+    and confidence intervals of the parameters, R², AIC, predictions at predict_at and,
+    given a budget in seconds, the largest size predicted to stay within it.
+    """
+    x = np.asarray(x, dtype=float)
+    y = bootstrap_quantiles(groups, quantile, n_boot, seed)
+    observed = y[:, 0]
+    total = ((observed - observed.mean()) ** 2).sum()
+
+    results = {}
+    for model in MODELS:
+        params = FITS[model](x, y)
+        if params is None:
+            continue
+        residuals = predict(model, params, x)[:, 0] - observed
+        sse = max(float((residuals ** 2).sum()), 1e-12)
+        result = {
+            'parameters': {
+                name: {'value': float(values[0]), 'ci': interval(values[1:], confidence)}
+                for name, values in params.items()
+            },
+            'r2': 1 - sse / total if total > 0 else float('nan'),
+            'aic': x.size * np.log(sse / x.size) + 2 * PARAMETER_COUNTS[model],
+            'predictions': {},
+        }
+        if len(predict_at):
+            predictions = predict(model, params, predict_at)
+            result['predictions'] = {
+                int(size): {'value': float(row[0]), 'ci': interval(row[1:], confidence)}
+                for size, row in zip(predict_at, predictions)
+            }
+        if budget is not None:
+            sizes = max_size(model, params, budget, upper=100 * x.max())
+            result['max_size'] = {'value': float(sizes[0]), 'ci': interval(sizes[1:], confidence)}
+        results[model] = result
+    return results
+
+
+def best_model(results):
+    """Return the model with the lowest AIC."""
+    return min(results, key=lambda model: results[model]['aic'])
+
+
+def format_model(model, parameters):
+    p = {name: parameter['value'] for name, parameter in parameters.items()}
+    if model == 'linear':
+        return f"{p['a']:.3f} + {p['b']:.3g}·x"
+    if model == 'power':
+        return f"{p['a']:.3g}·x^{p['b']:.3f}"
+    return f"{p['a']:.3f} + {p['b']:.3g}·x + {p['c']:.3g}·max(0, x - {p['t']:.0f})"
@@ -19,6 +19,34 @@ def main() -> None:
         from dagster_bench.analyze_core import main as analyze_main
         sys.argv = [sys.argv[0]] + sys.argv[2:]
         analyze_main()
+    elif command == "report":
+        from dagster_bench.report_core import main as report_main
+        sys.argv = [sys.argv[0]] + sys.argv[2:]
+        report_main()
+    elif command == "compare":
+        from dagster_bench.compare_core import main as compare_main
+        sys.argv = [sys.argv[0]] + sys.argv[2:]
+        compare_main()
+    elif command == "trace":
+        from dagster_bench.trace_core import main as trace_main
+        sys.argv = [sys.argv[0]] + sys.argv[2:]
+        trace_main()
+    elif command == "profile-defs":
+        from dagster_bench.profile_defs_core import main as profile_defs_main
+        sys.argv = [sys.argv[0]] + sys.argv[2:]
+        profile_defs_main()
+    elif command == "payload":
+        from dagster_bench.payload_core import main as payload_main
+        sys.argv = [sys.argv[0]] + sys.argv[2:]
+        payload_main()
+    elif command == "coldstart":
+        from dagster_bench.coldstart_core import main as coldstart_main
+        sys.argv = [sys.argv[0]] + sys.argv[2:]
+        coldstart_main()
+    elif command == "standin":
+        from dagster_bench.standin_core import main as standin_main
+        sys.argv = [sys.argv[0]] + sys.argv[2:]
+        standin_main()
     elif command in {"-h", "--help", "help"}:
         _print_help()
     elif command in {"-v", "--version", "version"}:
@@ -41,6 +69,13 @@ Usage:
 Commands:
   measure    Measure materialization lag for a single asset configuration
   analyze    Analyze and compare lag across multiple configurations
+  report     Report lag distributions from stored samples
+  compare    Compare the lag of a baseline and a candidate, failing on regressions
+  trace      Export stored samples as per-run traces (Chrome or OTLP JSON)
+  profile-defs  Profile building the code location's Definitions offline
+  payload    Measure the repository snapshot payload offline
+  coldstart  Measure a local code server's startup until it serves its snapshot
+  standin    Serve a local stand-in for the Dagster GraphQL API
 
 Options:
   -h, --help     Show this help message
@@ -53,12 +88,23 @@ Examples:
   # Compare 1 asset with 2000 partitions vs 2000 assets
   bench analyze --prefixes a1p2k 2k --runs 3
 
+  # Benchmark the client offline against a local stand-in
+  bench standin --time-scale 0.1 &
+  bench measure 2k --url http://localhost:3000 --runs 100 --concurrency 20
+
   # Use custom Dagster URL
   bench measure 10k --url https://dagster.example.com --username user --password pass
 
 For more help on a specific command:
   bench measure --help
   bench analyze --help
+  bench report --help
+  bench compare --help
+  bench trace --help
+  bench profile-defs --help
+  bench payload --help
+  bench coldstart --help
+  bench standin --help
 """)
 
 
@@ -1,41 +1,163 @@
 """GraphQL client for Dagster with authentication support."""
 
+import asyncio
 import base64
+import random
+import re
+import time
 from typing import Any
 
-import requests
+import httpx
 
+from dagster_bench.metrics import operation_name
 
-class DagsterGraphQLClient:
-    """GraphQL client for Dagster with basic auth support."""
+# Responses worth retrying: the ingress or webserver failed, the request itself was fine
+RETRYABLE_STATUS_CODES = frozenset({500, 502, 503, 504})
+
+# Failures after which the webserver may have received and acted on the request
+UNSAFE_ERRORS = (httpx.RemoteProtocolError, httpx.ReadError, httpx.WriteError)
+
+MUTATION_PATTERN = re.compile(r'^\s*mutation\b')
+
+
+def backoff_delay(attempt: int, base: float = 0.2, cap: float = 5.0) -> float:
+    """Return a full-jitter exponential backoff delay for the given retry attempt."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def _auth_headers(username: str | None, password: str | None) -> dict[str, str]:
+    """Build request headers, including basic auth when credentials are given."""
+    headers = {'Content-Type': 'application/json'}
+    if username and password:
+        credentials = f"{username}:{password}"
+        encoded = base64.b64encode(credentials.encode('utf-8')).decode('utf-8')
+        headers['Authorization'] = f'Basic {encoded}'
+    return headers
+
+
+def _payload(query: str, variables: dict[str, Any] | None) -> dict[str, Any]:
+    payload: dict[str, Any] = {'query': query}
+    if variables:
+        payload['variables'] = variables
+    return payload
+
+
+class AsyncDagsterGraphQLClient:
+    """Asyncio GraphQL client for Dagster with a bounded keep-alive connection pool.
+
+    Requests that fail with a 5xx status or a dropped connection are retried with jittered
+    exponential backoff. Read timeouts are not retried, since the webserver may already have
+    acted on the request. For the same reason, mutations (e.g. launching a run) are only
+    retried when the connection could not be opened.
+
+    Use as an async context manager, or call aclose() when done. Given metrics (see
+    metrics.ClientMetrics), the duration of every response and every failed request is
+    recorded per GraphQL operation.
+    """
 
     def __init__(
         self,
         url: str,
         username: str | None = None,
         password: str | None = None,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 30.0,
+        retries: int = 3,
+        backoff_base: float = 0.2,
+        backoff_max: float = 5.0,
+        metrics: Any = None,
     ) -> None:
-        """Initialize client with URL and optional basic auth credentials."""
+        """Initialize client with URL, optional basic auth credentials and pool limits."""
         self.url = url if url.endswith('/graphql') else f"{url}/graphql"
-        self.session = requests.Session()
-        self.session.headers.update({'Content-Type': 'application/json'})
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.metrics = metrics
+        self._client = httpx.AsyncClient(
+            headers=_auth_headers(username, password),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            timeout=timeout,
+        )
+
+    async def __aenter__(self) -> "AsyncDagsterGraphQLClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close all pooled connections."""
+        await self._client.aclose()
 
-        if username and password:
-            credentials = f"{username}:{password}"
-            encoded = base64.b64encode(credentials.encode('utf-8')).decode('utf-8')
-            self.session.headers.update({'Authorization': f'Basic {encoded}'})
+    def _count_error(self, operation: str, reason: str) -> None:
+        if self.metrics is not None:
+            self.metrics.count_error(operation, reason)
 
-    def _execute(self, query: str, variables: dict[str, Any] | None = None) -> dict[str, Any]:
-        """Execute a GraphQL query."""
-        payload: dict[str, Any] = {'query': query}
-        if variables:
-            payload['variables'] = variables
+    async def _post(self, body: Any, timeout: float | None, idempotent: bool) -> httpx.Response:
+        """POST a JSON body, retrying 5xx responses and dropped connections.
 
+        Requests that are not idempotent are only retried when they cannot have been sent.
+        """
+        operation = operation_name(body)
+        retryable_errors = (httpx.ConnectError, httpx.ConnectTimeout)
+        if idempotent:
+            retryable_errors += UNSAFE_ERRORS
+        for attempt in range(self.retries + 1):
+            start = time.perf_counter()
+            try:
+                response = await self._client.post(
+                    self.url,
+                    json=body,
+                    timeout=timeout if timeout is not None else self.timeout,
+                )
+            except retryable_errors as e:
+                self._count_error(operation, type(e).__name__)
+                if attempt < self.retries:
+                    await asyncio.sleep(
+                        backoff_delay(attempt, self.backoff_base, self.backoff_max)
+                    )
+                    continue
+                raise Exception(f"GraphQL request failed: {e}") from e
+            except httpx.HTTPError as e:
+                self._count_error(operation, type(e).__name__)
+                raise Exception(f"GraphQL request failed: {e}") from e
+
+            if self.metrics is not None:
+                self.metrics.observe_request(operation, time.perf_counter() - start)
+            if not response.is_success:
+                self._count_error(operation, f"http_{response.status_code}")
+            if (idempotent and response.status_code in RETRYABLE_STATUS_CODES
+                    and attempt < self.retries):
+                await asyncio.sleep(backoff_delay(attempt, self.backoff_base, self.backoff_max))
+                continue
+            return response
+
+    async def execute(
+        self,
+        query: str,
+        variables: dict[str, Any] | None = None,
+        timeout: float | None = None,
+        idempotent: bool | None = None,
+    ) -> dict[str, Any]:
+        """Execute a GraphQL query and return its data.
+
+        idempotent defaults to whether the query is not a mutation, see _post.
+        """
+        if idempotent is None:
+            idempotent = not MUTATION_PATTERN.match(query)
+        response = await self._post(_payload(query, variables), timeout, idempotent)
         try:
-            response = self.session.post(self.url, json=payload, timeout=30)
             response.raise_for_status()
             result = response.json()
+            if result.get('errors'):
+                self._count_error(operation_name({'query': query}), 'graphql')
             return result.get('data', {})
-        except requests.exceptions.RequestException as e:
+        except (httpx.HTTPError, ValueError) as e:
             raise Exception(f"GraphQL request failed: {e}") from e
-
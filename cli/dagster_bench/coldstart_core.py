@@ -0,0 +1,299 @@
+"""Measure how long a simple_repo code server takes from spawn to serving its snapshot."""
+
+import argparse
+import itertools
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from dagster_bench.profile_defs_core import (
+    DEFAULT_CODE_PATH,
+    add_shape_arguments,
+    build_snapshot,
+    find_code_path,
+    format_layout,
+    format_point,
+    probe_env,
+    shapes_from_args,
+    with_snapshot_cache,
+)
+from dagster_bench.results import DEFAULT_RESULTS_FILE, ResultStore, new_session_id
+
+# Points of a cold start, in order: the port accepts connections (the definitions are
+# loaded), the first Ping succeeds and the first repository snapshot is received
+MILESTONES = ("listening", "ping", "snapshot")
+
+
+def free_port(host='127.0.0.1') -> int:
+    """Return a TCP port nothing listens on right now."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind((host, 0))
+        return s.getsockname()[1]
+
+
+def read_memory(pid) -> dict | None:
+    """Return the current and peak resident set size of a process, or None without /proc."""
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            fields = dict(line.split(':', 1) for line in f if ':' in line)
+    except OSError:
+        return None
+    # Reported in kB
+    return {
+        'rss_bytes': int(fields['VmRSS'].split()[0]) * 1024,
+        'peak_rss_bytes': int(fields['VmHWM'].split()[0]) * 1024,
+    }
+
+
+def is_listening(host, port) -> bool:
+    try:
+        with socket.create_connection((host, port), timeout=0.5):
+            return True
+    except OSError:
+        return False
+
+
+def measure_coldstart(code_path, env, timeout=600, host='127.0.0.1', poll_interval=0.01):
+    """Spawn `dagster api grpc` for code_path with env and time it until it serves a snapshot.
+
+    Returns the seconds from spawn to every milestone (see MILESTONES), the resident set
+    size at each of them and the size of the snapshot. The snapshot is requested with
+    defer_snapshots=True, as the webserver and daemon do.
+    """
+    try:
+        from dagster._core.remote_origin import (
+            GrpcServerCodeLocationOrigin,
+            RemoteRepositoryOrigin,
+        )
+        from dagster._grpc.client import DagsterGrpcClient
+        from dagster._grpc.types import ListRepositoriesResponse
+        from dagster._serdes import deserialize_value
+    except ImportError as e:
+        raise Exception(f"Measuring cold starts needs dagster installed ({e})") from e
+
+    port = free_port(host)
+    client = DagsterGrpcClient(port=port, host=host)
+    milestones, memory = {}, {}
+
+    with tempfile.TemporaryFile(mode='w+') as log:
+        start = time.perf_counter()
+        process = subprocess.Popen(
+            [
+                sys.executable, '-m', 'dagster', 'api', 'grpc', '--python-file', str(code_path),
+                '--host', host, '--port', str(port),
+            ],
+            env=env,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+        )
+
+        def wait_until(milestone, check):
+            while True:
+                if process.poll() is not None:
+                    log.seek(0)
+                    lines = log.read().strip().splitlines()
+                    raise Exception(lines[-1] if lines else f"Exit code {process.returncode}")
+                if time.perf_counter() - start > timeout:
+                    raise Exception(f"No {milestone} within {timeout}s")
+                result = check()
+                if result:
+                    milestones[milestone] = time.perf_counter() - start
+                    memory[milestone] = read_memory(process.pid)
+                    return result
+                time.sleep(poll_interval)
+
+        def ping():
+            try:
+                return client.ping('coldstart')
+            except Exception:
+                return None
+
+        try:
+            wait_until('listening', lambda: is_listening(host, port))
+            wait_until('ping', ping)
+
+            response = deserialize_value(client.list_repositories(), ListRepositoriesResponse)
+            origin = RemoteRepositoryOrigin(
+                GrpcServerCodeLocationOrigin(host=host, port=port, location_name='coldstart'),
+                response.repository_symbols[0].repository_name,
+            )
+            snapshot = wait_until(
+                'snapshot', lambda: client.external_repository(origin, defer_snapshots=True)
+            )
+            # Failures to build the snapshot come back as a serialized error
+            error = deserialize_value(snapshot)
+            if type(error).__name__ == 'SerializableErrorInfo':
+                raise Exception(error.message.strip())
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+
+    listening = memory['listening']
+    return {
+        'milestones': milestones,
+        'rss_bytes': {
+            milestone: memory[milestone]['rss_bytes'] if memory[milestone] else None
+            for milestone in MILESTONES
+        },
+        'peak_rss_bytes': memory['snapshot']['peak_rss_bytes'] if memory['snapshot'] else None,
+        # Memory the server keeps after building and sending its first snapshot
+        'rss_growth_bytes': (
+            memory['snapshot']['rss_bytes'] - listening['rss_bytes'] if listening else None
+        ),
+        'snapshot_bytes': len(snapshot.encode()),
+    }
+
+
+def format_megabytes(count) -> str:
+    return f"{count / 1e6:>8.1f}" if count is not None else f"{'n/a':>8}"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Measure the cold start of a simple_repo code server',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  bench coldstart --assets 500 2k 5k 10k
+  bench coldstart --assets 2k --partitions 0 2k --repeat 5
+  bench coldstart --assets 2k 10k --layouts separate multi_asset --snapshot-cache
+
+Every start spawns `dagster api grpc` for src/simple_repo/dagster_code.py on a free local
+port and records the seconds from spawn until the port is listening (the definitions are
+loaded), the first Ping succeeds and the first repository snapshot is received, together
+with the server's resident memory at each of them.
+        """
+    )
+
+    add_shape_arguments(parser)
+    parser.add_argument('--snapshot-cache', dest='snapshot_cache', action='store_true',
+                        help='Also start every point with a precomputed repository snapshot')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Cold starts per point (default: 3)')
+    parser.add_argument('--code', help='Code file to serve '
+                                       '(default: src/simple_repo/dagster_code.py of this repo)')
+    parser.add_argument('--results', default=DEFAULT_RESULTS_FILE,
+                        help=f'JSONL file every start is appended to (default: '
+                             f'{DEFAULT_RESULTS_FILE}, empty to disable)')
+    parser.add_argument('--timeout', type=float, default=600,
+                        help='Seconds a single start may take (default: 600)')
+
+    args = parser.parse_args()
+
+    if args.repeat < 1:
+        parser.error('--repeat must be at least 1')
+    points, shapes = shapes_from_args(parser, args)
+
+    code_path = Path(args.code) if args.code else find_code_path()
+    if code_path is None or not code_path.exists():
+        print(f"Error: Code file not found: {args.code or DEFAULT_CODE_PATH}")
+        sys.exit(1)
+    code_path = code_path.resolve()
+
+    variants = [False, True] if args.snapshot_cache else [False]
+
+    print("=" * 70)
+    print("Code Server Cold Start")
+    print("=" * 70)
+    print(f"Code file:      {code_path}")
+    print(f"Points:         {len(points) * len(shapes) * len(variants)}")
+    print(f"Repeats:        {args.repeat}")
+    print("=" * 70)
+    print()
+
+    store = ResultStore(args.results) if args.results else None
+    session = new_session_id()
+    cache_dir = tempfile.TemporaryDirectory() if args.snapshot_cache else None
+    rows = []
+
+    for (assets, partitions, partition_type), (layout, topology), cached in itertools.product(
+        points, shapes, variants
+    ):
+        label = format_point(assets, partitions, partition_type)
+        layout_label = format_layout(layout, args.group_size, topology)
+        shape = dict(asset_prefix='coldstart', layout=layout, group_size=args.group_size,
+                     topology=topology, edge_density=args.edge_density)
+        env = probe_env(assets, partitions, partition_type, **shape)
+        if cached:
+            layout_label += ' cached'
+            try:
+                build_snapshot(code_path, cache_dir.name, assets, partitions, partition_type,
+                               timeout=args.timeout, **shape)
+            except Exception as e:
+                print(f"  {label} ({layout_label}): FAILED to build the snapshot ({e})")
+                continue
+            env = with_snapshot_cache(env, cache_dir.name)
+
+        records = []
+        try:
+            for _ in range(args.repeat):
+                record = measure_coldstart(code_path, env, timeout=args.timeout)
+                records.append(record)
+                milestones = record['milestones']
+                print(f"  {label} ({layout_label}): listening {milestones['listening']:.2f}s, "
+                      f"ping {milestones['ping']:.2f}s, snapshot {milestones['snapshot']:.2f}s, "
+                      f"RSS +{(record['rss_growth_bytes'] or 0) / 1e6:.1f} MB")
+        except Exception as e:
+            print(f"  {label} ({layout_label}): FAILED ({e})")
+            continue
+
+        medians = {
+            milestone: float(np.median([record['milestones'][milestone] for record in records]))
+            for milestone in MILESTONES
+        }
+        rows.append((label, layout_label, medians, records[-1]))
+
+        if store is not None:
+            store.append(
+                records,
+                kind='coldstart',
+                session=session,
+                code=str(code_path),
+                num_assets=assets,
+                num_partitions=partitions,
+                partition_type=partition_type,
+                layout=layout,
+                group_size=args.group_size,
+                topology=topology,
+                edge_density=args.edge_density,
+                snapshot_cached=cached,
+            )
+
+    if cache_dir is not None:
+        cache_dir.cleanup()
+
+    if not rows:
+        print("\nError: No successful starts")
+        sys.exit(1)
+
+    print("\n" + "=" * 112)
+    print("MEDIAN SECONDS FROM SPAWN")
+    print("=" * 112)
+    print(f"{'Point':<28} {'Shape':<24} {'listening':>9} {'ping':>8} {'snapshot':>9} "
+          f"{'RSS MB':>8} {'+MB':>8} {'peak MB':>8}")
+    print("-" * 112)
+    for label, layout_label, medians, record in rows:
+        print(f"{label:<28} {layout_label:<24} {medians['listening']:>9.2f} "
+              f"{medians['ping']:>8.2f} {medians['snapshot']:>9.2f} "
+              f"{format_megabytes(record['rss_bytes']['listening'])} "
+              f"{format_megabytes(record['rss_growth_bytes'])} "
+              f"{format_megabytes(record['peak_rss_bytes'])}")
+    print("=" * 112)
+    print("RSS MB: resident memory once listening, +MB: growth until the first snapshot "
+          "(last start)")
+
+    if store is not None:
+        print(f"\n✅ Starts appended: {args.results}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""Compare lag distributions of a baseline and a candidate result set."""
+
+import argparse
+import json
+import sys
+
+import numpy as np
+
+from dagster_bench.report_core import configuration_label, group_samples
+from dagster_bench.results import DEFAULT_RESULTS_FILE, ResultStore
+from dagster_bench.stats import bootstrap_median_change, mann_whitney_u, min_p_value
+
+COMPONENTS = ('queue', 'init', 'total')
+
+
+def lag_component(samples, component):
+    queue = np.array([sample['enqueue_to_start'] for sample in samples], dtype=float)
+    init = np.array([sample['start_to_step'] for sample in samples], dtype=float)
+    return {'queue': queue, 'init': init, 'total': queue + init}[component]
+
+
+def compare(baseline, candidate, gate=('total',), threshold=10.0, alpha=0.05,
+            confidence=0.95, n_boot=2000, seed=0):
+    """Compare the lag of every configuration measured in both baseline and candidate.
+
+    Returns one row per configuration and lag component with the Mann-Whitney test, the
+    bootstrap change of the median and whether it is a regression: a component in gate
+    whose median grew by more than threshold percent with a p-value below alpha. Rows are
+    underpowered when too few samples were taken for any p-value to get below alpha.
+    """
+    baseline_groups = group_samples(baseline)
+    candidate_groups = group_samples(candidate)
+    rows = []
+    for key, baseline_samples in baseline_groups.items():
+        if key not in candidate_groups:
+            continue
+        for component in COMPONENTS:
+            before = lag_component(baseline_samples, component)
+            after = lag_component(candidate_groups[key], component)
+            probability, p_value = mann_whitney_u(before, after)
+            change = bootstrap_median_change(before, after, confidence, n_boot, seed)
+            significant = p_value < alpha
+            underpowered = min_p_value(before.size, after.size) >= alpha
+            rows.append({
+                'configuration': configuration_label(key),
+                'component': component,
+                'baseline_count': int(before.size),
+                'candidate_count': int(after.size),
+                **change,
+                'probability_slower': probability,
+                'p_value': p_value,
+                'significant': significant,
+                'underpowered': bool(underpowered),
+                'regression': bool(
+                    component in gate and significant and change['relative'] * 100 > threshold
+                ),
+            })
+    return rows
+
+
+def format_comparison_table(rows, confidence, indent=''):
+    """Format compare(...) rows of one configuration as an aligned table."""
+    ci_label = f"{confidence:.0%} CI (change)"
+    lines = [
+        f"{indent}{'':<8}{'n base':>7} {'n cand':>7} {'p50 base':>9} {'p50 cand':>9} "
+        f"{'change':>8}   {ci_label:<20}{'p-value':>8}"
+    ]
+    for row in rows:
+        low, high = row['relative_ci']
+        verdict = ''
+        if row['regression']:
+            verdict = 'REGRESSION'
+        elif row['significant']:
+            verdict = 'slower' if row['difference'] > 0 else 'faster'
+        elif row['underpowered']:
+            verdict = 'too few samples'
+        lines.append(
+            f"{indent}{row['component'].capitalize():<8}{row['baseline_count']:>7} "
+            f"{row['candidate_count']:>7} {row['baseline_p50']:>9.3f} "
+            f"{row['candidate_p50']:>9.3f} {row['relative']:>+8.1%}   "
+            f"{f'[{low:+.1%}, {high:+.1%}]':<20}{row['p_value']:>8.3g}  {verdict}".rstrip()
+        )
+    return '\n'.join(lines)
+
+
+def load_lag(path, session, prefix):
+    filters = {'kind': 'lag'}
+    if session:
+        filters['session'] = session
+    if prefix:
+        filters['prefix'] = prefix
+    return ResultStore(path).load(**filters)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare lag distributions of a baseline and a candidate',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  bench compare results/dagster-1.11.jsonl results/dagster-1.12.jsonl
+  bench compare --baseline-session 5d319428fa97 --candidate-session 9a0e41b2c7d3
+  bench compare before.jsonl after.jsonl --prefix 2k --gate queue total --threshold 5
+        """
+    )
+
+    parser.add_argument('baseline', nargs='?', default=DEFAULT_RESULTS_FILE,
+                        help=f'Results file of the baseline (default: {DEFAULT_RESULTS_FILE})')
+    parser.add_argument('candidate', nargs='?',
+                        help='Results file of the candidate (default: the baseline file)')
+    parser.add_argument('--baseline-session', help='Only use baseline samples of this session')
+    parser.add_argument('--candidate-session',
+                        help='Only use candidate samples of this session')
+    parser.add_argument('--prefix', help='Only compare this asset prefix')
+    parser.add_argument('--gate', nargs='+', choices=COMPONENTS, default=['total'],
+                        help='Lag components that fail the comparison (default: total)')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help='Median increase in percent that fails the comparison when '
+                             'significant (default: 10)')
+    parser.add_argument('--alpha', type=float, default=0.05,
+                        help='Significance level of the Mann-Whitney test (default: 0.05)')
+    parser.add_argument('--confidence', type=float, default=0.95,
+                        help='Confidence level of the bootstrap intervals (default: 0.95)')
+    parser.add_argument('--json', action='store_true',
+                        help='Print the comparison as JSON')
+
+    args = parser.parse_args()
+
+    candidate_path = args.candidate or args.baseline
+    if candidate_path == args.baseline and args.baseline_session == args.candidate_session:
+        parser.error('Compare two files, or two sessions of one file with '
+                     '--baseline-session and --candidate-session')
+
+    baseline = load_lag(args.baseline, args.baseline_session, args.prefix)
+    candidate = load_lag(candidate_path, args.candidate_session, args.prefix)
+    for name, path, records in (('baseline', args.baseline, baseline),
+                                ('candidate', candidate_path, candidate)):
+        if not records:
+            print(f"Error: No {name} lag samples in {path}")
+            sys.exit(1)
+
+    rows = compare(baseline, candidate, args.gate, args.threshold, args.alpha,
+                   args.confidence)
+    if not rows:
+        print("Error: The baseline and the candidate have no configuration in common")
+        sys.exit(1)
+    regressions = [row for row in rows if row['regression']]
+    # A gate that cannot fail must not pass either
+    underpowered = [row for row in rows if row['component'] in args.gate and row['underpowered']]
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        unmatched = set(group_samples(baseline)) ^ set(group_samples(candidate))
+        print(f"{len(baseline)} baseline and {len(candidate)} candidate samples; "
+              f"failing on a significant (p < {args.alpha:g}) median increase over "
+              f"{args.threshold:g}% in {', '.join(args.gate)} lag")
+        if unmatched:
+            labels = sorted(configuration_label(key) for key in unmatched)
+            print(f"Skipping configurations measured on one side only: {', '.join(labels)}")
+        configurations = {}
+        for row in rows:
+            configurations.setdefault(row['configuration'], []).append(row)
+        for label, configuration_rows in configurations.items():
+            print(f"\n{label} (seconds):")
+            print(format_comparison_table(configuration_rows, args.confidence, indent='  '))
+        print()
+        if regressions:
+            print(f"❌ {len(regressions)} regression(s) over {args.threshold:g}%")
+        if underpowered:
+            labels = sorted({row['configuration'] for row in underpowered})
+            print(f"❌ Too few samples to reach p < {args.alpha:g} in "
+                  f"{', '.join(labels)}; measure more --runs")
+        if not regressions and not underpowered:
+            print("✅ No regressions")
+
+    if regressions or underpowered:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
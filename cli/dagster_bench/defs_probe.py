@@ -0,0 +1,183 @@
+"""Load a Dagster code file once and time each stage of building its definitions.
+
+Run by `bench profile-defs` in a fresh interpreter per measurement, so module caches and
+allocations of earlier points do not leak into later ones. Prints one JSON line.
+"""
+
+import argparse
+import cProfile
+import json
+import os
+import pstats
+import resource
+import runpy
+import statistics
+import time
+import tracemalloc
+import zlib
+
+STAGES = ("dagster_import", "module_import", "definitions", "resolve", "snapshot")
+
+
+def top_functions(profiler, top):
+    """Return the functions of a profile that spent the most time in their own code."""
+    stats = pstats.Stats(profiler)
+    entries = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)
+    return [
+        {
+            "function": f"{os.path.basename(filename)}:{line}({name})",
+            "ncalls": ncalls,
+            "tottime": tottime,
+            "cumtime": cumtime,
+        }
+        for (filename, line, name), (_, ncalls, tottime, cumtime, _) in entries[:top]
+    ]
+
+
+def measure_payload(snapshot, repeat=5):
+    """Measure the serialized repository snapshot a code server sends for its location.
+
+    Returns its size raw and zlib-compressed, median serialize, deserialize and compress
+    times over repeat rounds, and the bytes of each snapshot field. Asset nodes are split
+    into their partition definitions and everything else.
+    """
+    from dagster import deserialize_value, serialize_value
+
+    serialize_times, deserialize_times, compress_times = [], [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        serialized = serialize_value(snapshot)
+        serialize_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        deserialize_value(serialized, type(snapshot))
+        deserialize_times.append(time.perf_counter() - start)
+
+        payload = serialized.encode()
+        start = time.perf_counter()
+        compressed = zlib.compress(payload)
+        compress_times.append(time.perf_counter() - start)
+
+    sections = {
+        field: len(serialize_value(getattr(snapshot, field)).encode())
+        for field in snapshot._fields
+    }
+    # Every partitioned asset node carries its own copy of the partition definition
+    partitions = [node.partitions for node in snapshot.asset_nodes if node.partitions]
+    return {
+        "bytes": len(payload),
+        "compressed_bytes": len(compressed),
+        "serialize_seconds": statistics.median(serialize_times),
+        "deserialize_seconds": statistics.median(deserialize_times),
+        "compress_seconds": statistics.median(compress_times),
+        "sections": sections,
+        "asset_nodes": len(snapshot.asset_nodes),
+        "partitioned_asset_nodes": len(partitions),
+        "partition_definition_bytes": sum(
+            len(serialize_value(partition).encode()) for partition in partitions
+        ),
+    }
+
+
+def probe(code_path, mode="time", top=20, repeat=5):
+    """Import code_path and build its repository snapshot, timing every stage.
+
+    Once dagster itself is imported, mode 'memory' traces allocations to record the peak
+    and 'profile' runs the remaining stages under cProfile to keep the top functions. Both
+    slow the stages down, so timings are only meaningful in mode 'time'. Mode 'payload'
+    also measures the serialized snapshot (see measure_payload). Returns a dict.
+    """
+    timings = {}
+    start = time.perf_counter()
+    import dagster
+    timings["dagster_import"] = time.perf_counter() - start
+
+    profiler = cProfile.Profile() if mode == "profile" else None
+    if mode == "memory":
+        tracemalloc.start()
+    if profiler is not None:
+        profiler.enable()
+
+    # Time the Definitions(...) call the module makes, apart from building its assets
+    definitions_class = dagster.Definitions
+    constructed = []
+
+    def timed_definitions(*args, **kwargs):
+        start = time.perf_counter()
+        defs = definitions_class(*args, **kwargs)
+        constructed.append(time.perf_counter() - start)
+        return defs
+
+    dagster.Definitions = timed_definitions
+    try:
+        start = time.perf_counter()
+        namespace = runpy.run_path(code_path)
+        timings["module_import"] = time.perf_counter() - start
+    finally:
+        dagster.Definitions = definitions_class
+    timings["definitions"] = sum(constructed)
+
+    defs = next(
+        (value for value in namespace.values() if isinstance(value, definitions_class)), None
+    )
+    if defs is None:
+        raise Exception(f"No Definitions object found in {code_path}")
+
+    start = time.perf_counter()
+    repository_def = defs.get_repository_def()
+    timings["resolve"] = time.perf_counter() - start
+
+    snapshot = None
+    try:
+        from dagster._core.remote_representation.external_data import RepositorySnap
+    except ImportError:
+        # Private API, only available in some Dagster versions
+        timings["snapshot"] = None
+    else:
+        start = time.perf_counter()
+        snapshot = RepositorySnap.from_def(repository_def)
+        timings["snapshot"] = time.perf_counter() - start
+
+    if profiler is not None:
+        profiler.disable()
+
+    result = {
+        "mode": mode,
+        "dagster_version": dagster.__version__,
+        "asset_definitions": len(repository_def.assets_defs_by_key),
+        # Top-level definitions: fewer than assets when multi-assets group several of them
+        "definition_nodes": len({id(d) for d in repository_def.assets_defs_by_key.values()}),
+        # Whether simple_repo served its snapshot from a precomputed one (see snapshot_cache.py)
+        "snapshot_cached": bool(namespace.get("SNAPSHOT_CACHED")),
+        "timings": timings,
+        # ru_maxrss is in kilobytes on Linux
+        "max_rss_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+    }
+    if mode == "memory":
+        result["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    if profiler is not None:
+        result["top"] = top_functions(profiler, top)
+    if mode == "payload":
+        if snapshot is None:
+            raise Exception(f"Dagster {dagster.__version__} cannot build repository snapshots")
+        result["payload"] = measure_payload(snapshot, repeat)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time loading a Dagster code file once")
+    parser.add_argument("code_path", help="Python file defining a Definitions object")
+    parser.add_argument("--mode", choices=["time", "memory", "profile", "payload"],
+                        default="time")
+    parser.add_argument("--top", type=int, default=20,
+                        help="Functions kept from the profile (default: 20)")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="Rounds of payload serialization timed (default: 5)")
+    args = parser.parse_args()
+
+    print(json.dumps(probe(args.code_path, args.mode, args.top, args.repeat)))
+
+
+if __name__ == "__main__":
+    main()
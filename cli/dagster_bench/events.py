@@ -0,0 +1,519 @@
+"""Incremental tracking of Dagster run lifecycle events."""
+
+import asyncio
+import time
+
+RUN_EVENTS_QUERY = """
+query GetEvents($runId: ID!, $afterCursor: String) {
+  logsForRun(runId: $runId, afterCursor: $afterCursor) {
+    __typename
+    ... on EventConnection {
+      events {
+        ... on MessageEvent {
+          eventType
+          timestamp
+        }
+      }
+      cursor
+      hasMore
+    }
+  }
+}
+"""
+
+# Events needed for the queue and init lag
+LIFECYCLE_EVENTS = ("RUN_ENQUEUED", "RUN_START", "STEP_START")
+
+# Marks when the run worker process started: the last ENGINE_EVENT between RUN_STARTING and
+# RUN_START, which the launcher and run worker report ("Started process for run") before the
+# worker loads the code location's definitions. Not a Dagster event type.
+RUN_WORKER_STARTED = "RUN_WORKER_STARTED"
+
+# Every boundary of a single-step run, in order
+FULL_LIFECYCLE_EVENTS = (
+    "RUN_ENQUEUED",
+    "RUN_DEQUEUED",
+    "RUN_STARTING",
+    RUN_WORKER_STARTED,
+    "RUN_START",
+    "STEP_WORKER_STARTING",
+    "STEP_START",
+    "STEP_SUCCESS",
+    "RUN_SUCCESS",
+)
+
+# Boundaries only some launchers and executors report
+OPTIONAL_EVENTS = frozenset({RUN_WORKER_STARTED, "STEP_WORKER_STARTING"})
+
+# Events to wait for when measuring the whole run
+RUN_COMPLETION_EVENTS = tuple(
+    event_type for event_type in FULL_LIFECYCLE_EVENTS if event_type not in OPTIONAL_EVENTS
+)
+
+# Phase between each pair of consecutive FULL_LIFECYCLE_EVENTS
+RUN_PHASES = (
+    "Run queue",    # enqueued until the daemon dequeues it
+    "Dequeue",      # dequeued until handed to the run launcher
+    "Launch",       # launcher submits the worker, which boots up to its first event
+    "Code load",    # worker loads definitions and starts the run
+    "Plan",         # execution plan until the executor starts a step worker
+    "Step boot",    # step worker starts up until the step begins
+    "Step",         # step execution
+    "Teardown",     # last step until the run is marked successful
+)
+
+# Phases an optional boundary separates, reported as one when it was not
+MERGED_PHASES = {
+    RUN_WORKER_STARTED: "Launch + Code load",
+    "STEP_WORKER_STARTING": "Plan + Step boot",
+}
+
+# Every phase a run may be split into, in lifecycle order
+PHASES = (
+    "Run queue",
+    "Dequeue",
+    "Launch",
+    "Code load",
+    "Launch + Code load",
+    "Plan",
+    "Step boot",
+    "Plan + Step boot",
+    "Step",
+    "Teardown",
+)
+
+# Events after which the run will never reach the remaining lifecycle events
+TERMINAL_EVENTS = frozenset({"RUN_SUCCESS", "RUN_FAILURE", "RUN_CANCELED"})
+
+
+def phase_intervals(timestamps):
+    """Split a run's lifecycle timestamps into the (start, end) intervals of RUN_PHASES.
+
+    When an optional boundary was not reported, the phases on both sides of it are None
+    and their span is under the merged phase of MERGED_PHASES instead. Phases bordering
+    a missing required event are None as well.
+    """
+    intervals = {}
+    previous = timestamps.get(FULL_LIFECYCLE_EVENTS[0])
+    merged = None
+    for phase, event_type in zip(RUN_PHASES, FULL_LIFECYCLE_EVENTS[1:]):
+        timestamp = timestamps.get(event_type)
+        if timestamp is None:
+            intervals[phase] = None
+            if event_type in OPTIONAL_EVENTS:
+                merged = MERGED_PHASES[event_type]
+            else:
+                previous = merged = None
+            continue
+        interval = (previous, timestamp) if previous is not None else None
+        if merged is not None:
+            intervals[phase] = None
+            intervals[merged] = interval
+            merged = None
+        else:
+            intervals[phase] = interval
+        previous = timestamp
+    return intervals
+
+
+def phase_durations(timestamps):
+    """Split a run's lifecycle timestamps into the durations of RUN_PHASES.
+
+    Phases are None where phase_intervals cannot tell them apart, and merged phases are
+    only present where it merged them.
+    """
+    return {
+        phase: interval[1] - interval[0] if interval is not None else None
+        for phase, interval in phase_intervals(timestamps).items()
+    }
+
+
+class LifecycleTracker:
+    """Record the first timestamp of each lifecycle event of a run.
+
+    Every event of FULL_LIFECYCLE_EVENTS is recorded as it passes, but only the required
+    ones are waited for. Events are fed incrementally together with the event connection
+    cursor, so each poll only has to fetch what happened since the previous one.
+    """
+
+    def __init__(self, required=LIFECYCLE_EVENTS):
+        self.required = tuple(required)
+        self.tracked = set(FULL_LIFECYCLE_EVENTS) | set(self.required)
+        self.timestamps = {}
+        self.cursor = None
+        self.terminal_event = None
+        self.last_event = None
+        self.last_event_seen_at = time.monotonic()
+
+    @property
+    def complete(self) -> bool:
+        """Whether all required events have been seen."""
+        return all(event_type in self.timestamps for event_type in self.required)
+
+    @property
+    def done(self) -> bool:
+        """Whether there is nothing left to wait for."""
+        return self.complete or self.terminal_event is not None
+
+    def add_events(self, events, cursor=None) -> list[str]:
+        """Consume a batch of events and return the lifecycle event types seen first."""
+        if cursor is not None:
+            self.cursor = cursor
+
+        new = []
+        for event in events:
+            event_type = event.get("eventType")
+            if event_type in TERMINAL_EVENTS and self.terminal_event is None:
+                self.terminal_event = event_type
+            if (
+                event_type == "ENGINE_EVENT"
+                and "RUN_STARTING" in self.timestamps
+                and "RUN_START" not in self.timestamps
+            ):
+                # Keep the latest one, it is the worker's own
+                if RUN_WORKER_STARTED not in self.timestamps:
+                    new.append(RUN_WORKER_STARTED)
+                self.timestamps[RUN_WORKER_STARTED] = float(event.get("timestamp")) / 1000.0
+            elif event_type in self.tracked and event_type not in self.timestamps:
+                # Convert ms to seconds
+                self.timestamps[event_type] = float(event.get("timestamp")) / 1000.0
+                new.append(event_type)
+
+        if new:
+            self.last_event = new[-1]
+            self.last_event_seen_at = time.monotonic()
+        return new
+
+
+class AdaptivePollInterval:
+    """Pick the delay before the next poll of a run's event log.
+
+    Polls at min_interval right after launch and whenever the next lifecycle event is due,
+    based on how long each phase took for earlier runs. While a run waits well before or
+    long after its expected transition (e.g. a long queue wait), the delay backs off
+    exponentially up to max_interval.
+
+    Event timestamps come from Dagster, so the poll interval only affects how quickly a
+    transition is noticed, not the measured lag.
+    """
+
+    def __init__(self, min_interval=0.1, max_interval=2.0, backoff=1.5, smoothing=0.3):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.smoothing = smoothing
+        # Phase start event -> exponentially weighted mean duration of that phase
+        self.expected = {}
+
+    def observe(self, timestamps, order=FULL_LIFECYCLE_EVENTS) -> None:
+        """Update expected phase durations from a run's lifecycle timestamps.
+
+        A phase runs from each event in order to the next one that was seen.
+        """
+        seen = [event_type for event_type in order if event_type in timestamps]
+        for start_event, end_event in zip(seen, seen[1:]):
+            duration = timestamps[end_event] - timestamps[start_event]
+            previous = self.expected.get(start_event)
+            if previous is None:
+                self.expected[start_event] = duration
+            else:
+                self.expected[start_event] = (
+                    self.smoothing * duration + (1 - self.smoothing) * previous
+                )
+
+    def next_interval(self, last_event, phase_elapsed, polls_in_phase) -> float:
+        """Return seconds to sleep given the last seen event and time spent since then."""
+        if last_event is None:
+            return self.min_interval
+
+        backed_off = min(
+            self.max_interval,
+            self.min_interval * self.backoff ** polls_in_phase,
+        )
+        expected = self.expected.get(last_event)
+        if expected is None:
+            return backed_off
+
+        until_due = 0.8 * expected - phase_elapsed
+        if until_due > 0:
+            # Sleep towards the expected transition, then poll fast around it
+            return max(self.min_interval, min(until_due, self.max_interval))
+        if phase_elapsed <= 2 * expected:
+            return self.min_interval
+        return backed_off
+
+
+async def wait_for_lifecycle(
+    client,
+    run_id,
+    max_wait=300,
+    poller=None,
+    required=LIFECYCLE_EVENTS,
+    polls=None,
+):
+    """Poll the run's event log until all required lifecycle events are seen.
+
+    Each poll passes the cursor of the previous one, so only new events are downloaded, and
+    polling stops as soon as the required events are found or the run fails. Every poll is
+    appended to the polls list when given (see record_poll).
+
+    Returns a dict mapping event type to timestamp in seconds. Event types that did not
+    show up within max_wait are missing from the dict.
+    """
+    poller = poller or AdaptivePollInterval()
+    tracker = LifecycleTracker(required)
+    deadline = time.monotonic() + max_wait
+    polls_in_phase = 0
+
+    while time.monotonic() < deadline:
+        start = time.time()
+        events_result = await client.execute(
+            RUN_EVENTS_QUERY,
+            {"runId": run_id, "afterCursor": tracker.cursor},
+        )
+        logs = events_result.get("logsForRun") or {}
+        new = tracker.add_events(logs.get("events", []), logs.get("cursor"))
+        record_poll(polls, start, new)
+
+        if tracker.done:
+            break
+        if new:
+            polls_in_phase = 0
+        if logs.get("hasMore"):
+            # The server truncated the page, fetch the rest right away
+            continue
+
+        now = time.monotonic()
+        interval = poller.next_interval(
+            tracker.last_event, now - tracker.last_event_seen_at, polls_in_phase
+        )
+        await asyncio.sleep(max(0.0, min(interval, deadline - now)))
+        polls_in_phase += 1
+
+    poller.observe(tracker.timestamps)
+    return tracker.timestamps
+
+
+def record_poll(polls, start, new=(), runs=1, failed=False) -> None:
+    """Append a poll that started at wall clock time start and just ended to polls.
+
+    new holds the lifecycle event types it found first, and runs the number of runs the
+    request polled. Nothing is recorded when polls is None.
+    """
+    if polls is not None:
+        polls.append({
+            "start": start,
+            "end": time.time(),
+            "events": list(new),
+            "runs": runs,
+            "failed": failed,
+        })
+
+
+class PollingWatcher:
+    """Watch runs by polling `logsForRun`, sharing one adaptive poll interval across runs."""
+
+    def __init__(self, client, poller=None):
+        self.client = client
+        self.poller = poller or AdaptivePollInterval()
+
+    async def wait_for_lifecycle(self, run_id, max_wait=300, required=LIFECYCLE_EVENTS,
+                                 polls=None):
+        """Return the run's lifecycle timestamps, see wait_for_lifecycle."""
+        return await wait_for_lifecycle(
+            self.client, run_id, max_wait, self.poller, required, polls
+        )
+
+
+RUN_STATUS_SELECTION = """
+  runsOrError(filter: {runIds: $runIds}) {
+    __typename
+    ... on Runs {
+      results {
+        runId
+        status
+      }
+    }
+  }
+"""
+
+RUN_EVENTS_SELECTION = """
+  r{i}: logsForRun(runId: $run{i}, afterCursor: $cursor{i}) {{
+    __typename
+    ... on EventConnection {{
+      events {{
+        ... on MessageEvent {{
+          eventType
+          timestamp
+        }}
+      }}
+      cursor
+      hasMore
+    }}
+  }}
+"""
+
+# Run statuses after which no further lifecycle events will arrive
+TERMINAL_STATUSES = frozenset({"SUCCESS", "FAILURE", "CANCELED"})
+
+
+def build_watch_query(runs):
+    """Build one query fetching the status and new events of several runs.
+
+    runs is a list of (run_id, cursor) pairs. Each run's events are aliased as r0, r1, ...
+    in the order given. Returns the query and its variables.
+    """
+    definitions = ["$runIds: [String]"]
+    selections = [RUN_STATUS_SELECTION]
+    variables = {"runIds": [run_id for run_id, _ in runs]}
+
+    for i, (run_id, cursor) in enumerate(runs):
+        definitions.append(f"$run{i}: ID!, $cursor{i}: String")
+        selections.append(RUN_EVENTS_SELECTION.format(i=i))
+        variables[f"run{i}"] = run_id
+        variables[f"cursor{i}"] = cursor
+
+    query = f"query WatchRuns({', '.join(definitions)}) {{{''.join(selections)}}}"
+    return query, variables
+
+
+class _WatchedRun:
+    """Bookkeeping for one run tracked by MultiplexedRunWatcher."""
+
+    def __init__(self, run_id, required, deadline, polls=None):
+        self.run_id = run_id
+        self.polls = polls
+        self.tracker = LifecycleTracker(required)
+        self.future = asyncio.get_running_loop().create_future()
+        self.deadline = deadline
+        self.next_due = time.monotonic()
+        self.polls_in_phase = 0
+        self.status = None
+
+
+class MultiplexedRunWatcher:
+    """Watch many in-flight runs from a single poll loop.
+
+    On each tick, the status and new events of every run that is due are fetched in one
+    GraphQL request (a `runsOrError` filter plus one aliased `logsForRun` per run, each with
+    its own cursor), and results are routed back to the waiting run. Each run is due
+    according to the shared adaptive poll interval, so a long queue wait does not keep the
+    whole batch polling fast. A request that fails or returns a malformed response is counted
+    in failures and its runs are polled again after the minimum interval.
+
+    Use as an async context manager.
+    """
+
+    def __init__(self, client, poller=None, max_runs_per_query=50):
+        self.client = client
+        self.poller = poller or AdaptivePollInterval()
+        self.max_runs_per_query = max_runs_per_query
+        self.requests = 0
+        self.failures = 0
+        self._runs: dict[str, _WatchedRun] = {}
+        self._wake = asyncio.Event()
+        self._task = None
+
+    async def __aenter__(self) -> "MultiplexedRunWatcher":
+        self._task = asyncio.create_task(self._loop())
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        for watched in list(self._runs.values()):
+            self._resolve(watched)
+
+    async def wait_for_lifecycle(self, run_id, max_wait=300, required=LIFECYCLE_EVENTS,
+                                 polls=None):
+        """Return the run's lifecycle timestamps once all required events are seen.
+
+        Event types that did not show up within max_wait are missing from the dict. Every
+        request that polled the run is appended to polls when given (see record_poll).
+        """
+        watched = _WatchedRun(run_id, required, time.monotonic() + max_wait, polls)
+        self._runs[run_id] = watched
+        self._wake.set()
+        return await watched.future
+
+    def _resolve(self, watched) -> None:
+        self._runs.pop(watched.run_id, None)
+        if watched.tracker.complete:
+            self.poller.observe(watched.tracker.timestamps)
+        if not watched.future.done():
+            watched.future.set_result(watched.tracker.timestamps)
+
+    async def _loop(self) -> None:
+        while True:
+            now = time.monotonic()
+            for watched in list(self._runs.values()):
+                if now >= watched.deadline:
+                    self._resolve(watched)
+
+            due = [watched for watched in self._runs.values() if watched.next_due <= now]
+            for start in range(0, len(due), self.max_runs_per_query):
+                batch = due[start:start + self.max_runs_per_query]
+                started = time.time()
+                try:
+                    await self._tick(batch)
+                except Exception:
+                    # The client already retried, or the response could not be parsed;
+                    # either way keep polling instead of leaving every waiter hanging
+                    self.failures += 1
+                    retry_at = time.monotonic() + self.poller.min_interval
+                    for watched in batch:
+                        if watched.run_id in self._runs:
+                            record_poll(watched.polls, started, runs=len(batch), failed=True)
+                            watched.next_due = retry_at
+
+            if self._runs:
+                timeout = max(0.0, min(
+                    min(watched.next_due for watched in self._runs.values()),
+                    min(watched.deadline for watched in self._runs.values()),
+                ) - time.monotonic())
+            else:
+                timeout = None
+
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _tick(self, batch) -> None:
+        """Fetch status and new events for a batch of runs in one request."""
+        query, variables = build_watch_query(
+            [(watched.run_id, watched.tracker.cursor) for watched in batch]
+        )
+        self.requests += 1
+        start = time.time()
+        result = await self.client.execute(query, variables)
+
+        runs = (result.get("runsOrError") or {}).get("results") or []
+        statuses = {run.get("runId"): run.get("status") for run in runs}
+
+        now = time.monotonic()
+        for i, watched in enumerate(batch):
+            logs = result.get(f"r{i}") or {}
+            tracker = watched.tracker
+            new = tracker.add_events(logs.get("events", []), logs.get("cursor"))
+            record_poll(watched.polls, start, new, runs=len(batch))
+            previous_status = watched.status
+            watched.status = statuses.get(watched.run_id, watched.status)
+
+            # A run that was already finished at the previous tick has all of its events in
+            # the log, so stop once they are drained
+            finished = previous_status in TERMINAL_STATUSES and not logs.get("hasMore")
+            if tracker.done or finished:
+                self._resolve(watched)
+                continue
+
+            if new:
+                watched.polls_in_phase = 0
+            if logs.get("hasMore") or watched.status in TERMINAL_STATUSES:
+                watched.next_due = now
+            else:
+                watched.next_due = now + self.poller.next_interval(
+                    tracker.last_event, now - tracker.last_event_seen_at, watched.polls_in_phase
+                )
+                watched.polls_in_phase += 1
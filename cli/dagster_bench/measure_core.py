@@ -1,197 +1,282 @@
 """Measure Dagster materialization lag."""
 
 import argparse
+import asyncio
 import json
 import random
 import sys
 import time
 from datetime import datetime
 
-from dagster_bench.client import DagsterGraphQLClient
-from dagster_bench.utils import get_latest_partition
+from dagster_bench.client import AsyncDagsterGraphQLClient
+from dagster_bench.events import (
+    LIFECYCLE_EVENTS,
+    RUN_COMPLETION_EVENTS,
+    AdaptivePollInterval,
+    MultiplexedRunWatcher,
+    PollingWatcher,
+    phase_durations,
+)
+from dagster_bench.metrics import BenchMetrics
+from dagster_bench.results import DEFAULT_RESULTS_FILE, ResultStore, new_session_id
+from dagster_bench.stats import format_summary_table, summarize_phases, summarize_samples
+from dagster_bench.subscription import RunEventSubscriber
+from dagster_bench.traces import FORMATS as TRACE_FORMATS
+from dagster_bench.traces import write_trace
+from dagster_bench.utils import (
+    AssetGraphCache,
+    PartitionCache,
+    get_latest_partition,
+    location_names,
+    route_asset,
+)
 from dagster_bench.utils import parse_asset_count as parse_num_assets
 
+# Events each run is watched until: the whole run, or only until its step starts
+LIFECYCLES = {
+    'full': RUN_COMPLETION_EVENTS,
+    'start': LIFECYCLE_EVENTS,
+}
+
+LAUNCH_RUN_MUTATION = """
+mutation LaunchAssetRun($repoLocation: String!, $assetKeys: [AssetKeyInput!]!) {
+  launchPipelineExecution(
+    executionParams: {
+      selector: {
+        repositoryLocationName: $repoLocation
+        repositoryName: "__repository__"
+        pipelineName: "__ASSET_JOB"
+        assetSelection: $assetKeys
+      }
+    }
+  ) {
+    __typename
+    ... on LaunchRunSuccess {
+      run { id status }
+    }
+    ... on PipelineNotFoundError { message }
+    ... on InvalidSubsetError { message }
+    ... on PythonError { message }
+  }
+}
+"""
+
+LAUNCH_PARTITIONED_RUN_MUTATION = """
+mutation LaunchAssetRun(
+    $repoLocation: String!,
+    $assetKeys: [AssetKeyInput!]!,
+    $partition: String!
+) {
+  launchPipelineExecution(
+    executionParams: {
+      selector: {
+        repositoryLocationName: $repoLocation
+        repositoryName: "__repository__"
+        pipelineName: "__ASSET_JOB"
+        assetSelection: $assetKeys
+      }
+      mode: "default"
+      executionMetadata: {
+        tags: [
+          { key: "dagster/partition", value: $partition }
+        ]
+      }
+    }
+  ) {
+    __typename
+    ... on LaunchRunSuccess {
+      run { id status }
+    }
+    ... on PipelineNotFoundError { message }
+    ... on InvalidSubsetError { message }
+    ... on PythonError { message }
+  }
+}
+"""
+
+
+async def launch_asset_run(client, repo_location, asset_key, partition=None):
+    """Launch a run materializing an asset, or a list of assets, and return its run ID.
+
+    Raises an Exception carrying the GraphQL error message if the launch is rejected.
+    """
+    asset_keys = [asset_key] if isinstance(asset_key, str) else asset_key
+    variables = {
+        "repoLocation": repo_location,
+        "assetKeys": [{"path": [key]} for key in asset_keys],
+    }
+    if partition:
+        query = LAUNCH_PARTITIONED_RUN_MUTATION
+        variables["partition"] = partition
+    else:
+        query = LAUNCH_RUN_MUTATION
+
+    result = await client.execute(query, variables)
+    launch_result = result.get("launchPipelineExecution", {})
+
+    if launch_result.get("__typename") != "LaunchRunSuccess":
+        error_msg = launch_result.get(
+            'message',
+            launch_result.get('__typename', 'Unknown error'),
+        )
+        raise Exception(error_msg)
 
-def measure_lag(client, asset_prefix, num_assets, repo_location, num_runs=3, verbose=False):
+    return launch_result["run"]["id"]
+
+
+async def select_assets(client, asset_key, repo_location, asset_graph=None):
+    """Return the asset keys a run launches: asset_key, plus its upstream closure."""
+    if asset_graph is None:
+        return [asset_key]
+    return await asset_graph.selection(client, asset_key, repo_location)
+
+
+def make_sample(run_id, asset_key, partition, submit_time, launch_latency, timestamps, **extra):
+    """Build the raw record of one measured run.
+
+    timestamps maps lifecycle event types to their Dagster timestamps in seconds and must
+    include RUN_ENQUEUED, RUN_START and STEP_START. The durations of all run phases that
+    could be told apart are stored under 'phases' (see events.phase_durations). extra
+    fields include request_time, when the bench started preparing the run, and, when
+    tracing, polls: the requests that polled its events (see events.record_poll), which
+    traces.py exports.
+    """
+    return {
+        'run_id': run_id,
+        'asset_key': asset_key,
+        'partition': partition,
+        'submit_time': submit_time,
+        'launch_latency': launch_latency,
+        'timestamps': timestamps,
+        'enqueue_to_start': timestamps["RUN_START"] - timestamps["RUN_ENQUEUED"],
+        'start_to_step': timestamps["STEP_START"] - timestamps["RUN_START"],
+        'phases': phase_durations(timestamps),
+        **extra,
+    }
+
+
+async def measure_lag(
+    client,
+    asset_prefix,
+    num_assets,
+    repo_location,
+    num_runs=3,
+    verbose=False,
+    watcher=None,
+    partition_cache=None,
+    quiet=False,
+    required=RUN_COMPLETION_EVENTS,
+    asset_graph=None,
+    metrics=None,
+    keep_polls=False,
+    max_wait=300,
+):
     """Measure lag for asset materialization.
 
-    For each run, randomly selects an asset from 0 to num_assets-1.
+    For each run, randomly selects an asset from 0 to num_assets-1, launched together with
+    its upstream closure when asset_graph (an AssetGraphCache) is given. Run events are
+    collected by watcher (e.g. a MultiplexedRunWatcher or RunEventSubscriber), polling
+    each run on its own by default, until the required events are seen or max_wait seconds
+    passed. Latest partition keys are looked up through partition_cache. quiet suppresses
+    the per-run lines. Launches, lags and failed runs are recorded in metrics (a
+    metrics.BenchMetrics) when given.
+    keep_polls adds the event polls of every run to its sample, for traces.
 
-    Returns a dict with two lag components:
+    Returns a dict with two lag components and the raw record of each run:
     - enqueue_to_start: Time from RUN_ENQUEUED to RUN_START (queueing)
     - start_to_step: Time from RUN_START to STEP_START (initialization)
+    - samples: see make_sample
     """
+    watcher = watcher or PollingWatcher(client)
+    partition_cache = partition_cache or PartitionCache()
     enqueue_to_start_lags = []
     start_to_step_lags = []
+    samples = []
 
     for run_num in range(1, num_runs + 1):
         # Randomly select an asset for this run
         asset_num = random.randint(0, num_assets - 1)
         asset_key = f"{asset_prefix}_dummy_asset_{asset_num}"
+        location = route_asset(asset_num, repo_location)
 
         if verbose:
             print(f"\n  Run {run_num}/{num_runs}:")
-            print(f"    Asset: {asset_key}")
+            print(f"    Asset: {asset_key} ({location})")
 
         # Check if asset is partitioned and get latest partition
-        latest_partition = get_latest_partition(client, asset_key, repo_location, verbose)
+        request_time = time.time()
+        latest_partition = await get_latest_partition(
+            client, asset_key, location, verbose, partition_cache
+        )
 
         if verbose:
             print(f"    Request: {datetime.now().strftime('%H:%M:%S.%f')[:-3]}")
 
-        # Submit run with partition if available
-        if latest_partition:
-            query = """
-            mutation LaunchAssetRun(
-                $repoLocation: String!,
-                $assetKeys: [AssetKeyInput!]!,
-                $partition: String!
-            ) {
-              launchPipelineExecution(
-                executionParams: {
-                  selector: {
-                    repositoryLocationName: $repoLocation
-                    repositoryName: "__repository__"
-                    pipelineName: "__ASSET_JOB"
-                    assetSelection: $assetKeys
-                  }
-                  mode: "default"
-                  executionMetadata: {
-                    tags: [
-                      { key: "dagster/partition", value: $partition }
-                    ]
-                  }
-                }
-              ) {
-                __typename
-                ... on LaunchRunSuccess {
-                  run { id status }
-                }
-                ... on PipelineNotFoundError { message }
-                ... on InvalidSubsetError { message }
-                ... on PythonError { message }
-              }
-            }
-            """
-
-            variables = {
-                "repoLocation": repo_location,
-                "assetKeys": [{"path": [asset_key]}],
-                "partition": latest_partition
-            }
-        else:
-            query = """
-            mutation LaunchAssetRun($repoLocation: String!, $assetKeys: [AssetKeyInput!]!) {
-              launchPipelineExecution(
-                executionParams: {
-                  selector: {
-                    repositoryLocationName: $repoLocation
-                    repositoryName: "__repository__"
-                    pipelineName: "__ASSET_JOB"
-                    assetSelection: $assetKeys
-                  }
-                }
-              ) {
-                __typename
-                ... on LaunchRunSuccess {
-                  run { id status }
-                }
-                ... on PipelineNotFoundError { message }
-                ... on InvalidSubsetError { message }
-                ... on PythonError { message }
-              }
-            }
-            """
-
-            variables = {
-                "repoLocation": repo_location,
-                "assetKeys": [{"path": [asset_key]}]
-            }
-
         try:
-            result = client._execute(query, variables)
-            launch_result = result.get("launchPipelineExecution", {})
-
-            if launch_result.get("__typename") != "LaunchRunSuccess":
-                error_msg = launch_result.get(
-                    'message',
-                    launch_result.get('__typename', 'Unknown error'),
+            try:
+                selection = await select_assets(client, asset_key, location, asset_graph)
+                if verbose and len(selection) > 1:
+                    print(f"    Upstream: {len(selection) - 1} assets")
+                submit_time = time.time()
+                run_id = await launch_asset_run(
+                    client, location, selection, latest_partition
                 )
+                launch_latency = time.time() - submit_time
+            except Exception as e:
                 if verbose:
-                    print(f"    Failed: {error_msg}")
+                    print(f"    Failed: {e}")
+                if metrics is not None:
+                    metrics.count_failed_run(location, asset_prefix)
                 continue
-
-            run_id = launch_result["run"]["id"]
+            if metrics is not None:
+                metrics.observe_launch(location, asset_prefix, launch_latency)
 
             # Poll for events to measure both lag components
-            max_wait = 300
-            poll_interval = 0.1  # 100ms polling
-            elapsed = 0
-
-            enqueue_time = None
-            start_time = None
-            step_time = None
-
-            while elapsed < max_wait:
-                events_query = """
-                query GetEvents($runId: ID!) {
-                  logsForRun(runId: $runId) {
-                    ... on EventConnection {
-                      events {
-                        ... on MessageEvent {
-                          eventType
-                          timestamp
-                        }
-                      }
-                    }
-                  }
-                }
-                """
-
-                events_result = client._execute(events_query, {"runId": run_id})
-                logs = events_result.get("logsForRun", {})
-                events = logs.get("events", [])
-
-                # Find timestamps for each event type
-                for event in events:
-                    event_type = event.get("eventType")
-                    timestamp = event.get("timestamp")
-
-                    if event_type == "RUN_ENQUEUED" and not enqueue_time:
-                        enqueue_time = float(timestamp) / 1000.0  # Convert ms to seconds
-                    elif event_type == "RUN_START" and not start_time:
-                        start_time = float(timestamp) / 1000.0
-                    elif event_type == "STEP_START" and not step_time:
-                        step_time = float(timestamp) / 1000.0
-
-                # Break when we have all three events
-                if enqueue_time and start_time and step_time:
-                    enqueue_to_start = start_time - enqueue_time
-                    start_to_step = step_time - start_time
-
-                    enqueue_to_start_lags.append(enqueue_to_start)
-                    start_to_step_lags.append(start_to_step)
-
-                    total = enqueue_to_start + start_to_step
-
-                    if verbose:
-                        print(f"    Enqueued→Start: {enqueue_to_start:.3f}s")
-                        print(f"    Start→Step:     {start_to_step:.3f}s")
-                        print(f"    Total:          {total:.3f}s")
-                    else:
-                        msg = (
-                            f"  {run_num}. Asset_{asset_num} | "
-                            f"Queue: {enqueue_to_start:.3f}s | "
-                            f"Init: {start_to_step:.3f}s | "
-                            f"Total: {total:.3f}s"
-                        )
-                        print(msg)
-                    break
+            polls = [] if keep_polls else None
+            timestamps = await watcher.wait_for_lifecycle(run_id, max_wait, required, polls)
+
+            enqueue_time = timestamps.get("RUN_ENQUEUED")
+            start_time = timestamps.get("RUN_START")
+            step_time = timestamps.get("STEP_START")
+
+            if enqueue_time and start_time and step_time:
+                enqueue_to_start = start_time - enqueue_time
+                start_to_step = step_time - start_time
+
+                enqueue_to_start_lags.append(enqueue_to_start)
+                start_to_step_lags.append(start_to_step)
+                sample = make_sample(
+                    run_id, asset_key, latest_partition, submit_time, launch_latency, timestamps,
+                    repo_location=location,
+                    selected_assets=len(selection),
+                    request_time=request_time,
+                    **({'polls': polls} if keep_polls else {}),
+                )
+                samples.append(sample)
+                if metrics is not None:
+                    metrics.observe_sample(asset_prefix, sample)
 
-                time.sleep(poll_interval)
-                elapsed += poll_interval
+                total = enqueue_to_start + start_to_step
 
-            if elapsed >= max_wait:
+                if verbose:
+                    print(f"    Enqueued→Start: {enqueue_to_start:.3f}s")
+                    print(f"    Start→Step:     {start_to_step:.3f}s")
+                    print(f"    Total:          {total:.3f}s")
+                    for phase, duration in sample['phases'].items():
+                        if duration is not None:
+                            print(f"      {phase + ':':<14}{duration:.3f}s")
+                else:
+                    msg = (
+                        f"  {run_num}. Asset_{asset_num} | "
+                        f"Queue: {enqueue_to_start:.3f}s | "
+                        f"Init: {start_to_step:.3f}s | "
+                        f"Total: {total:.3f}s"
+                    )
+                    if not quiet:
+                        print(msg)
+            else:
+                if metrics is not None:
+                    metrics.count_failed_run(location, asset_prefix)
                 if verbose:
                     print(f"    Timeout after {max_wait}s")
                     got_enq = enqueue_time is not None
@@ -202,16 +287,341 @@ def measure_lag(client, asset_prefix, num_assets, repo_location, num_runs=3, ver
         except Exception as e:
             if verbose:
                 print(f"    Error: {e}")
+            if metrics is not None:
+                metrics.count_failed_run(location, asset_prefix)
             continue
 
-        time.sleep(1)
+        await asyncio.sleep(1)
 
     return {
         'enqueue_to_start': enqueue_to_start_lags,
-        'start_to_step': start_to_step_lags
+        'start_to_step': start_to_step_lags,
+        'samples': samples,
     }
 
 
+async def measure_load(
+    client,
+    asset_prefix,
+    num_assets,
+    repo_location,
+    num_runs=3,
+    concurrency=None,
+    rate=None,
+    arrival='fixed',
+    max_wait=300,
+    seed=None,
+    verbose=False,
+    watcher=None,
+    partition_cache=None,
+    quiet=False,
+    required=RUN_COMPLETION_EVENTS,
+    asset_graph=None,
+    metrics=None,
+    keep_polls=False,
+):
+    """Measure lag while keeping the daemon under load.
+
+    Exactly one of the two load shapes must be given:
+    - concurrency: closed loop, keeps that many runs in flight until num_runs are launched
+    - rate: open loop, submits runs at that many runs/s regardless of completions, with
+      either evenly spaced ('fixed') or exponentially distributed ('poisson') gaps
+
+    Each run materializes a randomly chosen asset of the location, with its upstream
+    closure when asset_graph is given, and is watched until the required events are seen.
+    Launches, lags and failed runs are recorded in metrics, and the event polls of every
+    run in its sample with keep_polls, as measure_lag does.
+
+    Returns a dict with the per-run lag components (as measure_lag does), the per-run
+    samples and the load that was actually offered.
+    """
+    if (concurrency is None) == (rate is None):
+        raise ValueError("Exactly one of concurrency or rate must be set")
+
+    watcher = watcher or PollingWatcher(client)
+    partition_cache = partition_cache or PartitionCache()
+    rng = random.Random(seed)
+    arrival_rng = random.Random(seed)
+    samples = []
+    state = {'in_flight': 0, 'launched': 0, 'failed': 0}
+
+    async def run_one(run_num):
+        asset_num = rng.randint(0, num_assets - 1)
+        asset_key = f"{asset_prefix}_dummy_asset_{asset_num}"
+        location = route_asset(asset_num, repo_location)
+        state['in_flight'] += 1
+        in_flight = state['in_flight']
+
+        try:
+            request_time = time.time()
+            latest_partition = await get_latest_partition(
+                client, asset_key, location, verbose, partition_cache
+            )
+            selection = await select_assets(client, asset_key, location, asset_graph)
+            submit_time = time.time()
+            run_id = await launch_asset_run(client, location, selection, latest_partition)
+            launch_latency = time.time() - submit_time
+            state['launched'] += 1
+            if metrics is not None:
+                metrics.observe_launch(location, asset_prefix, launch_latency)
+
+            polls = [] if keep_polls else None
+            timestamps = await watcher.wait_for_lifecycle(run_id, max_wait, required, polls)
+            if not all(event_type in timestamps for event_type in LIFECYCLE_EVENTS):
+                raise Exception(f"Timeout after {max_wait}s for run {run_id}")
+
+            sample = make_sample(
+                run_id,
+                asset_key,
+                latest_partition,
+                submit_time,
+                launch_latency,
+                timestamps,
+                repo_location=location,
+                selected_assets=len(selection),
+                in_flight=in_flight,
+                request_time=request_time,
+                **({'polls': polls} if keep_polls else {}),
+            )
+            samples.append(sample)
+            if metrics is not None:
+                metrics.observe_sample(asset_prefix, sample)
+
+            total = sample['enqueue_to_start'] + sample['start_to_step']
+            if not quiet:
+                print(
+                    f"  {run_num}. Asset_{asset_num} | "
+                    f"In flight: {in_flight} | "
+                    f"Queue: {sample['enqueue_to_start']:.3f}s | "
+                    f"Init: {sample['start_to_step']:.3f}s | "
+                    f"Total: {total:.3f}s"
+                )
+        except Exception as e:
+            state['failed'] += 1
+            if metrics is not None:
+                metrics.count_failed_run(location, asset_prefix)
+            if verbose:
+                print(f"  {run_num}. {asset_key} failed: {e}")
+        finally:
+            state['in_flight'] -= 1
+
+    start = time.time()
+
+    if concurrency is not None:
+        run_nums = iter(range(1, num_runs + 1))
+
+        async def worker():
+            for run_num in run_nums:
+                await run_one(run_num)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    else:
+        # Open loop: arrivals never wait for earlier runs to finish
+        tasks = []
+        next_arrival = start
+        for run_num in range(1, num_runs + 1):
+            delay = next_arrival - time.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(run_one(run_num)))
+            if arrival == 'poisson':
+                next_arrival += arrival_rng.expovariate(rate)
+            else:
+                next_arrival += 1.0 / rate
+        await asyncio.gather(*tasks)
+
+    elapsed = time.time() - start
+    samples.sort(key=lambda s: s['submit_time'])
+
+    submit_times = [s['submit_time'] for s in samples]
+    if len(submit_times) > 1 and submit_times[-1] > submit_times[0]:
+        achieved_rate = (len(submit_times) - 1) / (submit_times[-1] - submit_times[0])
+    else:
+        achieved_rate = 0.0
+
+    return {
+        'enqueue_to_start': [s['enqueue_to_start'] for s in samples],
+        'start_to_step': [s['start_to_step'] for s in samples],
+        'samples': samples,
+        'load': {
+            'mode': 'closed' if concurrency is not None else 'open',
+            'concurrency': concurrency,
+            'target_rate': rate,
+            'arrival': arrival if rate is not None else None,
+            'achieved_rate': achieved_rate,
+            'throughput': len(samples) / elapsed if elapsed > 0 else 0.0,
+            'launched': state['launched'],
+            'failed': state['failed'],
+            'duration': elapsed,
+        },
+    }
+
+
+async def run_measurement(
+    url,
+    asset_prefix,
+    runs=3,
+    repo_location=None,
+    username=None,
+    password=None,
+    concurrency=None,
+    rate=None,
+    arrival='fixed',
+    max_wait=300,
+    seed=None,
+    transport='auto',
+    lifecycle='full',
+    poll_interval=0.1,
+    max_poll_interval=2.0,
+    partition_cache_ttl=300.0,
+    timeout=30.0,
+    retries=3,
+    max_connections=100,
+    upstream=False,
+    upstream_depth=None,
+    verbose=False,
+    quiet=False,
+    metrics=None,
+    keep_polls=False,
+):
+    """Connect to Dagster and measure lag for one asset prefix.
+
+    Runs sequentially (measure_lag) unless concurrency or rate selects load mode
+    (measure_load). Run events are collected over the websocket subscription or by
+    multiplexed polling, according to transport ('auto', 'subscribe' or 'poll'), until the
+    run succeeds (lifecycle 'full') or its step starts ('start'). With upstream, every
+    asset is launched with its upstream closure, up to upstream_depth levels up. Runs and
+    GraphQL requests are recorded in metrics (a metrics.BenchMetrics) when given, and the
+    event polls of every run in its sample with keep_polls (see traces.run_spans).
+
+    repo_location is a location name, or the shard locations of a sharded prefix in
+    SHARD_INDEX order (see route_asset), and defaults to the locations of asset_prefix.
+
+    Returns a dict with the prefix, repository location(s) and asset count next to the
+    measurement result (per-run 'enqueue_to_start' and 'start_to_step' lags, plus 'samples'
+    and 'load' in load mode). Raises an Exception if Dagster cannot be reached.
+    """
+    num_assets = parse_num_assets(asset_prefix)
+    repo_location = default_repo_location(asset_prefix, repo_location)
+    load_mode = concurrency is not None or rate is not None
+    required = LIFECYCLES[lifecycle]
+
+    # Connect with basic auth
+    async with AsyncDagsterGraphQLClient(
+        url,
+        username,
+        password,
+        max_connections=max_connections,
+        timeout=timeout,
+        retries=retries,
+        metrics=metrics.client(repo_location, asset_prefix) if metrics is not None else None,
+    ) as client:
+        try:
+            # Test connection
+            await client.execute("query { __typename }")
+        except Exception as e:
+            raise Exception(f"Failed to connect to {url}: {e}") from e
+
+        poller = AdaptivePollInterval(poll_interval, max_poll_interval)
+        partition_cache = PartitionCache(ttl=partition_cache_ttl)
+        asset_graph = AssetGraphCache(upstream_depth) if upstream else None
+        async with MultiplexedRunWatcher(client, poller) as polling:
+            watcher = polling
+            subscriber = None
+            if transport != 'poll':
+                subscriber = RunEventSubscriber(
+                    url,
+                    username,
+                    password,
+                    fallback=polling if transport == 'auto' else None,
+                )
+                try:
+                    await subscriber.connect()
+                    watcher = subscriber
+                except Exception as e:
+                    if transport == 'subscribe':
+                        raise Exception(
+                            f"Failed to subscribe to run events at {subscriber.url}: {e}"
+                        ) from e
+                    if verbose:
+                        print(f"Event subscription unavailable, polling instead: {e}")
+                    subscriber = None
+
+            try:
+                if load_mode:
+                    result = await measure_load(
+                        client,
+                        asset_prefix,
+                        num_assets,
+                        repo_location,
+                        runs,
+                        concurrency=concurrency,
+                        rate=rate,
+                        arrival=arrival,
+                        max_wait=max_wait,
+                        seed=seed,
+                        verbose=verbose,
+                        watcher=watcher,
+                        partition_cache=partition_cache,
+                        quiet=quiet,
+                        required=required,
+                        asset_graph=asset_graph,
+                        metrics=metrics,
+                        keep_polls=keep_polls,
+                    )
+                else:
+                    result = await measure_lag(
+                        client,
+                        asset_prefix,
+                        num_assets,
+                        repo_location,
+                        runs,
+                        verbose,
+                        watcher,
+                        partition_cache,
+                        quiet,
+                        required,
+                        asset_graph,
+                        metrics,
+                        keep_polls,
+                        max_wait=max_wait,
+                    )
+            finally:
+                if subscriber is not None:
+                    await subscriber.close()
+
+    return {
+        'prefix': asset_prefix,
+        'repo_location': repo_location,
+        'asset_count': num_assets,
+        **result,
+    }
+
+
+def default_repo_location(asset_prefix, repo_location=None):
+    """Return the given location(s), or those of asset_prefix; a single location as a str."""
+    locations = repo_location or location_names(asset_prefix)
+    if not isinstance(locations, str) and len(locations) == 1:
+        return locations[0]
+    return locations
+
+
+def format_locations(repo_location) -> str:
+    if isinstance(repo_location, str):
+        return repo_location
+    return ', '.join(repo_location)
+
+
+def start_metrics(port, addr='0.0.0.0'):
+    """Serve a new BenchMetrics on port, or return None without a port."""
+    if port is None:
+        return None
+    metrics = BenchMetrics()
+    metrics.serve(port, addr)
+    print(f"Serving metrics on http://{addr}:{port}/metrics")
+    return metrics
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Measure Dagster materialization lag',
@@ -221,11 +631,16 @@ Examples:
   bench measure 10k
   bench measure 2k --runs 5
   bench measure a1p2k --runs 3  # 1 asset with 2000 partitions
+  bench measure s4x10k --runs 20  # 10k assets sharded over 4 locations
+  bench measure random2k --upstream --upstream-depth 3  # assets with their upstream
+  bench measure 2k --runs 50 --concurrency 10  # keep 10 runs in flight
+  bench measure 2k --runs 100 --rate 2 --arrival poisson  # bursty arrivals, 2 runs/s
   bench measure prod --url https://dagster.example.com --username user --password pass
         """
     )
 
-    parser.add_argument('asset_prefix', help='Asset prefix (e.g., 10k, a1p2k, test, prod)')
+    parser.add_argument('asset_prefix',
+                        help='Asset prefix (e.g., 10k, a1p2k, s4x10k, test, prod)')
     parser.add_argument('--url', default='http://localhost:80',
                         help='Dagster URL (default: http://localhost:80)')
     parser.add_argument('--username', default='admin',
@@ -234,45 +649,103 @@ Examples:
                         help='Basic auth password (default: admin)')
     parser.add_argument('--runs', type=int, default=3,
                         help='Number of test runs (default: 3)')
-    parser.add_argument('--repo-location', dest='repo_location',
-                        help='Repository location name (default: simple-asset-{prefix})')
+    parser.add_argument('--repo-location', dest='repo_location', nargs='+',
+                        help='Repository location name, or the shard locations in '
+                             'SHARD_INDEX order (default: simple-asset-{prefix}, or '
+                             'simple-asset-{prefix}-{index} for a sharded prefix)')
+    parser.add_argument('--concurrency', type=int,
+                        help='Load mode: keep this many runs in flight (closed loop)')
+    parser.add_argument('--rate', type=float,
+                        help='Load mode: submit runs at this many runs/s (open loop)')
+    parser.add_argument('--arrival', choices=['fixed', 'poisson'], default='fixed',
+                        help='Arrival process for --rate (default: fixed)')
+    parser.add_argument('--max-wait', dest='max_wait', type=float, default=300,
+                        help='Seconds to wait for a run to finish (default: 300)')
+    parser.add_argument('--lifecycle', choices=sorted(LIFECYCLES), default='full',
+                        help='Watch each run until it succeeds, breaking down every phase, '
+                             'or only until its step starts (default: full)')
+    parser.add_argument('--upstream', action='store_true',
+                        help='Launch every asset together with its upstream closure')
+    parser.add_argument('--upstream-depth', dest='upstream_depth', type=int,
+                        help='Levels of upstream assets launched with --upstream '
+                             '(default: all)')
+    parser.add_argument('--seed', type=int,
+                        help='Random seed for asset selection and arrivals')
+    parser.add_argument('--transport', choices=['auto', 'subscribe', 'poll'], default='auto',
+                        help='How run events are collected: websocket subscription, '
+                             'polling, or subscription with polling fallback (default: auto)')
+    parser.add_argument('--poll-interval', dest='poll_interval', type=float, default=0.1,
+                        help='Fastest event poll interval in seconds (default: 0.1)')
+    parser.add_argument('--max-poll-interval', dest='max_poll_interval', type=float,
+                        default=2.0,
+                        help='Slowest event poll interval during long waits (default: 2.0)')
+    parser.add_argument('--partition-cache-ttl', dest='partition_cache_ttl', type=float,
+                        default=300.0,
+                        help='Seconds to reuse an asset\'s latest partition key; entries are '
+                             'also dropped when the location reloads (default: 300)')
+    parser.add_argument('--results', default=DEFAULT_RESULTS_FILE,
+                        help=f'JSONL file every sample is appended to (default: '
+                             f'{DEFAULT_RESULTS_FILE}, empty to disable)')
+    parser.add_argument('--trace', help='Also export every measured run as a trace to this file')
+    parser.add_argument('--trace-format', dest='trace_format', choices=TRACE_FORMATS,
+                        default='chrome',
+                        help='Chrome trace events or OTLP JSON (default: chrome)')
+    parser.add_argument('--timeout', type=float, default=30.0,
+                        help='Per-request GraphQL timeout in seconds (default: 30)')
+    parser.add_argument('--retries', type=int, default=3,
+                        help='Retries for 5xx responses and dropped connections (default: 3)')
+    parser.add_argument('--max-connections', dest='max_connections', type=int, default=100,
+                        help='Size of the HTTP connection pool (default: 100)')
+    parser.add_argument('--metrics-port', dest='metrics_port', type=int,
+                        help='Serve Prometheus metrics on this port while measuring '
+                             '(needs prometheus_client)')
+    parser.add_argument('--metrics-addr', dest='metrics_addr', default='0.0.0.0',
+                        help='Address to serve metrics on (default: 0.0.0.0)')
     parser.add_argument('--verbose', '-v', action='store_true',
                         help='Verbose output')
 
     args = parser.parse_args()
 
+    if args.concurrency is not None and args.rate is not None:
+        parser.error('--concurrency and --rate are mutually exclusive')
+    if args.concurrency is not None and args.concurrency < 1:
+        parser.error('--concurrency must be at least 1')
+    if args.rate is not None and args.rate <= 0:
+        parser.error('--rate must be positive')
+    if args.upstream_depth is not None and args.upstream_depth < 0:
+        parser.error('--upstream-depth must not be negative')
+    load_mode = args.concurrency is not None or args.rate is not None
+
     # Parse number of assets from prefix
     num_assets = parse_num_assets(args.asset_prefix)
 
-    # Infer repo location if not provided
-    if not args.repo_location:
-        args.repo_location = f"simple-asset-{args.asset_prefix}"
+    # Infer repo location(s) if not provided
+    args.repo_location = default_repo_location(args.asset_prefix, args.repo_location)
 
     # Normalize URL
     url = args.url.rstrip('/').replace('/graphql', '')
 
-    # Connect with basic auth
-    try:
-        client = DagsterGraphQLClient(url, args.username, args.password)
-        # Test connection
-        client._execute("query { __typename }")
-    except Exception as e:
-        print(f"Error: Failed to connect to {url}")
-        print(f"Details: {e}")
-        sys.exit(1)
-
     # Print header
     if not args.verbose:
         print(f"\nMeasuring lag: {args.asset_prefix} @ {url}")
-        print(f"Runs: {args.runs} | Location: {args.repo_location}\n")
+        print(f"Runs: {args.runs} | Location: {format_locations(args.repo_location)}")
+        if args.concurrency is not None:
+            print(f"Load: {args.concurrency} in flight")
+        elif args.rate is not None:
+            print(f"Load: {args.rate:g} runs/s ({args.arrival} arrivals)")
+        print()
     else:
         print(f"\n{'='*70}")
         print("Dagster Materialization Lag Measurement")
         print(f"{'='*70}")
         print(f"Asset prefix:        {args.asset_prefix}")
-        print(f"Repository location: {args.repo_location}")
+        print(f"Repository location: {format_locations(args.repo_location)}")
         print(f"Dagster URL:         {url}")
         print(f"Test runs:           {args.runs}")
+        if args.concurrency is not None:
+            print(f"Concurrency:         {args.concurrency}")
+        elif args.rate is not None:
+            print(f"Arrival rate:        {args.rate:g} runs/s ({args.arrival})")
         print(f"{'='*70}")
 
     # Measure
@@ -280,14 +753,38 @@ Examples:
         print(f"Number of assets:    {num_assets}")
         print(f"{'='*70}")
 
-    result = measure_lag(
-        client,
-        args.asset_prefix,
-        num_assets,
-        args.repo_location,
-        args.runs,
-        args.verbose,
-    )
+    try:
+        metrics = start_metrics(args.metrics_port, args.metrics_addr)
+        result = asyncio.run(run_measurement(
+            url,
+            args.asset_prefix,
+            args.runs,
+            args.repo_location,
+            args.username,
+            args.password,
+            concurrency=args.concurrency,
+            rate=args.rate,
+            arrival=args.arrival,
+            max_wait=args.max_wait,
+            seed=args.seed,
+            transport=args.transport,
+            lifecycle=args.lifecycle,
+            poll_interval=args.poll_interval,
+            max_poll_interval=args.max_poll_interval,
+            partition_cache_ttl=args.partition_cache_ttl,
+            timeout=args.timeout,
+            retries=args.retries,
+            max_connections=args.max_connections,
+            upstream=args.upstream,
+            upstream_depth=args.upstream_depth,
+            verbose=args.verbose,
+            metrics=metrics,
+            # Polls only feed the trace, so they don't grow the results file otherwise
+            keep_polls=args.trace is not None,
+        ))
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
 
     # Results
     enqueue_lags = result['enqueue_to_start']
@@ -314,11 +811,69 @@ Examples:
     print(f"Init time (Start→Step):       {avg_step:.3f}s ({avg_step*1000:.0f}ms)")
     print(f"Total lag:                    {avg_total:.3f}s ({avg_total*1000:.0f}ms)")
 
+    if load_mode:
+        load = result['load']
+        if load['mode'] == 'closed':
+            offered = f"{load['concurrency']} in flight"
+        else:
+            offered = f"{load['target_rate']:g} runs/s ({load['arrival']})"
+        print()
+        print(f"Offered load:                 {offered}")
+        print(f"Achieved submit rate:         {load['achieved_rate']:.2f} runs/s")
+        print(f"Completed throughput:         {load['throughput']:.2f} runs/s")
+
+    print()
+    print("Distribution (seconds):")
+    print(format_summary_table(summarize_samples(result['samples']), indent='  '))
+
+    phase_summaries = summarize_phases(result['samples'])
+    print()
+    print("Phases (seconds):")
+    print(format_summary_table(phase_summaries, indent='  '))
+
+    if args.results:
+        if load_mode:
+            mode = result['load']['mode']
+        else:
+            mode = 'sequential'
+        written = ResultStore(args.results).append(
+            result['samples'],
+            kind='lag',
+            session=new_session_id(),
+            prefix=args.asset_prefix,
+            repo_location=args.repo_location,
+            asset_count=num_assets,
+            url=url,
+            mode=mode,
+            concurrency=args.concurrency,
+            rate=args.rate,
+            upstream=args.upstream,
+            upstream_depth=args.upstream_depth,
+        )
+        print(f"\n{written} samples appended to {args.results}")
+
+    if args.trace:
+        write_trace(
+            args.trace,
+            [{**sample, 'prefix': args.asset_prefix} for sample in result['samples']],
+            args.trace_format,
+        )
+        print(f"{len(result['samples'])} runs exported as traces to {args.trace}")
+
     if avg_total > 5:
         print(f"\n⚠️  Significant lag detected ({avg_total:.1f}s average)")
 
     # Return averages for use by other scripts
-    print(f"\n{json.dumps({'enqueue_to_start': avg_enqueue, 'start_to_step': avg_step})}")
+    summary = {
+        'enqueue_to_start': avg_enqueue,
+        'start_to_step': avg_step,
+        'phases': {
+            phase: phase_summary.get('mean') for phase, phase_summary in phase_summaries.items()
+        },
+    }
+    if load_mode:
+        summary['load'] = result['load']
+    print(f"\n{json.dumps(summary)}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,119 @@
+"""Prometheus metrics of a running bench process.
+
+Lag samples, launch latencies and every GraphQL request are recorded as they happen and
+served on /metrics, so a long `bench measure` (e.g. an open loop at a low rate) can run
+as a canary against a deployment. prometheus_client is optional and only imported here.
+"""
+
+import re
+
+try:
+    import prometheus_client
+except ImportError:
+    prometheus_client = None
+
+# Lags span from sub-second (warm, idle) to minutes (a cold worker under load)
+LAG_BUCKETS = (0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 7.5, 10.0, 15.0, 20.0, 30.0, 45.0, 60.0,
+               90.0, 120.0, 180.0, 300.0)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+OPERATION_PATTERN = re.compile(r'^\s*(?:query|mutation|subscription)\s+(\w+)')
+
+
+def operation_name(body) -> str:
+    """Return the GraphQL operation name of a request body."""
+    match = OPERATION_PATTERN.match(body.get('query', ''))
+    return match.group(1) if match else 'anonymous'
+
+
+def location_label(repo_location) -> str:
+    """Return a location label: the location, or the shard locations joined by commas."""
+    if isinstance(repo_location, str):
+        return repo_location
+    return ','.join(repo_location)
+
+
+class ClientMetrics:
+    """GraphQL request metrics of one client, bound to its location and prefix labels."""
+
+    def __init__(self, metrics, location, prefix):
+        self.metrics = metrics
+        self.labels = {'location': location, 'prefix': prefix}
+
+    def observe_request(self, operation, seconds):
+        self.metrics.graphql_latency.labels(**self.labels, operation=operation).observe(seconds)
+
+    def count_error(self, operation, reason):
+        self.metrics.graphql_errors.labels(**self.labels, operation=operation,
+                                           reason=reason).inc()
+
+
+class BenchMetrics:
+    """Histograms and counters of measured runs, labeled by location and prefix.
+
+    Each instance has its own registry, served by serve().
+    """
+
+    def __init__(self):
+        if prometheus_client is None:
+            raise Exception(
+                "Metrics need prometheus_client installed: "
+                "uv pip install 'dagster-bench[metrics]'"
+            )
+        self.registry = prometheus_client.CollectorRegistry()
+        labels = ('location', 'prefix')
+
+        def histogram(name, documentation, buckets, labelnames=labels):
+            return prometheus_client.Histogram(
+                name, documentation, labelnames, buckets=buckets, registry=self.registry
+            )
+
+        self.queue_lag = histogram(
+            'bench_queue_lag_seconds', 'Time from RUN_ENQUEUED to RUN_START', LAG_BUCKETS
+        )
+        self.init_lag = histogram(
+            'bench_init_lag_seconds', 'Time from RUN_START to STEP_START', LAG_BUCKETS
+        )
+        self.total_lag = histogram(
+            'bench_total_lag_seconds', 'Time from RUN_ENQUEUED to STEP_START', LAG_BUCKETS
+        )
+        self.launch_latency = histogram(
+            'bench_launch_latency_seconds', 'Duration of the launch run mutation',
+            LATENCY_BUCKETS,
+        )
+        self.graphql_latency = histogram(
+            'bench_graphql_request_duration_seconds',
+            'Duration of GraphQL requests that got a response, retries counted apart',
+            LATENCY_BUCKETS, labels + ('operation',),
+        )
+        self.graphql_errors = prometheus_client.Counter(
+            'bench_graphql_errors', 'Failed GraphQL requests, retried ones included',
+            labels + ('operation', 'reason'), registry=self.registry,
+        )
+        self.runs = prometheus_client.Counter(
+            'bench_runs', 'Launched runs by outcome: measured, or failed (launch rejected '
+            'or timed out)', labels + ('outcome',), registry=self.registry,
+        )
+
+    def client(self, repo_location, prefix) -> ClientMetrics:
+        return ClientMetrics(self, location_label(repo_location), prefix)
+
+    def observe_launch(self, repo_location, prefix, seconds):
+        self.launch_latency.labels(location_label(repo_location), prefix).observe(seconds)
+
+    def observe_sample(self, prefix, sample):
+        """Record the lags of a sample (see measure_core.make_sample)."""
+        labels = (location_label(sample['repo_location']), prefix)
+        self.queue_lag.labels(*labels).observe(sample['enqueue_to_start'])
+        self.init_lag.labels(*labels).observe(sample['start_to_step'])
+        self.total_lag.labels(*labels).observe(
+            sample['enqueue_to_start'] + sample['start_to_step']
+        )
+        self.runs.labels(*labels, 'measured').inc()
+
+    def count_failed_run(self, repo_location, prefix):
+        self.runs.labels(location_label(repo_location), prefix, 'failed').inc()
+
+    def serve(self, port, addr='0.0.0.0'):
+        """Serve /metrics on a background thread for as long as the process runs."""
+        prometheus_client.start_http_server(port, addr, registry=self.registry)
@@ -0,0 +1,143 @@
+"""Measure the repository snapshot payload of simple_repo across asset and partition counts."""
+
+import argparse
+import itertools
+import sys
+from pathlib import Path
+
+from dagster_bench.profile_defs_core import (
+    DEFAULT_CODE_PATH,
+    add_shape_arguments,
+    find_code_path,
+    format_layout,
+    format_point,
+    run_probe,
+    shapes_from_args,
+)
+from dagster_bench.results import DEFAULT_RESULTS_FILE, ResultStore, new_session_id
+
+
+def format_bytes(count) -> str:
+    """Format a byte count with a binary unit."""
+    for unit in ('B', 'KiB', 'MiB'):
+        if count < 1024:
+            return f"{count:.0f} {unit}" if unit == 'B' else f"{count:.1f} {unit}"
+        count /= 1024
+    return f"{count:.1f} GiB"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Measure the repository snapshot payload of the simple_repo code location',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  bench payload --assets 250 500 2k 5k 10k
+  bench payload --assets 1 2k --partitions 0 2k  # 2k assets vs 1 asset x 2k partitions
+  bench payload --assets 10k --layouts separate multi_asset graph_asset
+  bench payload --assets 10k --topologies none chain random
+
+The snapshot is what a code server sends to the webserver and daemon for its location.
+        """
+    )
+
+    add_shape_arguments(parser)
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='Serialization rounds timed per point (default: 5)')
+    parser.add_argument('--code', help='Code file to load '
+                                       '(default: src/simple_repo/dagster_code.py of this repo)')
+    parser.add_argument('--results', default=DEFAULT_RESULTS_FILE,
+                        help=f'JSONL file every point is appended to (default: '
+                             f'{DEFAULT_RESULTS_FILE}, empty to disable)')
+    parser.add_argument('--timeout', type=float, default=600,
+                        help='Seconds a single point may take (default: 600)')
+    parser.add_argument('--verbose', '-v', action='store_true',
+                        help='Print the size of every snapshot field')
+
+    args = parser.parse_args()
+
+    if args.repeat < 1:
+        parser.error('--repeat must be at least 1')
+    points, shapes = shapes_from_args(parser, args)
+
+    code_path = Path(args.code) if args.code else find_code_path()
+    if code_path is None or not code_path.exists():
+        print(f"Error: Code file not found: {args.code or DEFAULT_CODE_PATH}")
+        sys.exit(1)
+
+    print("=" * 70)
+    print("Repository Snapshot Payload")
+    print("=" * 70)
+    print(f"Code file:      {code_path}")
+    print(f"Points:         {len(points) * len(shapes)}")
+    print("=" * 70)
+    print()
+
+    store = ResultStore(args.results) if args.results else None
+    session = new_session_id()
+    rows = []
+
+    for (assets, partitions, partition_type), (layout, topology) in itertools.product(
+        points, shapes
+    ):
+        label = format_point(assets, partitions, partition_type)
+        layout_label = format_layout(layout, args.group_size, topology)
+        try:
+            record = run_probe(
+                code_path, assets, partitions, partition_type, 'payload',
+                timeout=args.timeout, repeat=args.repeat, layout=layout,
+                group_size=args.group_size, topology=topology, edge_density=args.edge_density,
+            )
+        except Exception as e:
+            print(f"  {label} ({layout_label}): FAILED ({e})")
+            continue
+
+        payload = record['payload']
+        rows.append((label, layout_label, payload))
+        print(f"  {label} ({layout_label}): {format_bytes(payload['bytes'])} "
+              f"({format_bytes(payload['compressed_bytes'])} compressed)")
+        if args.verbose:
+            for field, size in sorted(payload['sections'].items(), key=lambda item: -item[1]):
+                print(f"    {field:<22} {format_bytes(size):>12}")
+
+        if store is not None:
+            store.append(
+                [record],
+                kind='snapshot_payload',
+                session=session,
+                code=str(code_path),
+                num_assets=assets,
+                num_partitions=partitions,
+                partition_type=partition_type,
+                layout=layout,
+                group_size=args.group_size,
+                topology=topology,
+                edge_density=args.edge_density,
+            )
+
+    if not rows:
+        print("\nError: No successful points")
+        sys.exit(1)
+
+    print("\n" + "=" * 113)
+    print("SNAPSHOT PAYLOAD")
+    print("=" * 113)
+    print(f"{'Point':<26} {'Shape':<24} {'size':>10} {'zlib':>10} {'ser ms':>8} {'deser ms':>9} "
+          f"{'assets':>10} {'partitions':>11}")
+    print("-" * 113)
+    for label, layout_label, payload in rows:
+        print(f"{label:<26} {layout_label:<24} {format_bytes(payload['bytes']):>10} "
+              f"{format_bytes(payload['compressed_bytes']):>10} "
+              f"{payload['serialize_seconds'] * 1000:>8.1f} "
+              f"{payload['deserialize_seconds'] * 1000:>9.1f} "
+              f"{format_bytes(payload['sections']['asset_nodes']):>10} "
+              f"{format_bytes(payload['partition_definition_bytes']):>11}")
+    print("=" * 113)
+    print("assets: serialized asset nodes, partitions: the partition definitions inside them")
+
+    if store is not None:
+        print(f"\n✅ Points appended: {args.results}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,355 @@
+"""Profile building the simple_repo definitions across asset and partition counts."""
+
+import argparse
+import itertools
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from dagster_bench.defs_probe import STAGES
+from dagster_bench.results import DEFAULT_RESULTS_FILE, ResultStore, new_session_id
+from dagster_bench.utils import parse_asset_count
+
+DEFAULT_CODE_PATH = Path("src") / "simple_repo" / "dagster_code.py"
+
+# simple_repo's ASSET_LAYOUT and ASSET_TOPOLOGY values
+LAYOUTS = ("separate", "multi_asset", "graph_asset")
+TOPOLOGIES = ("none", "chain", "fan_in", "fan_out", "layered", "random")
+
+
+def find_code_path(start=None) -> Path | None:
+    """Find src/simple_repo/dagster_code.py in the working directory or one of its parents."""
+    start = Path(start or os.getcwd()).resolve()
+    for directory in (start, *start.parents):
+        candidate = directory / DEFAULT_CODE_PATH
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def sweep_points(asset_counts, partition_counts, partition_types):
+    """Return (assets, partitions, partition type) points; type is None when unpartitioned."""
+    points = []
+    for assets, partitions, partition_type in itertools.product(
+        asset_counts, partition_counts, partition_types
+    ):
+        point = (assets, partitions, partition_type if partitions else None)
+        if point not in points:
+            points.append(point)
+    return points
+
+
+def add_shape_arguments(parser):
+    """Add the arguments sweeping simple_repo's size and shape, shared by profile-defs,
+    payload and coldstart (see shapes_from_args)."""
+    parser.add_argument('--assets', nargs='+', default=['100', '1k', '5k'],
+                        help='NUM_ASSETS values to sweep (default: 100 1k 5k)')
+    parser.add_argument('--partitions', nargs='+', default=['0'],
+                        help='NUM_PARTITIONS values to sweep (default: 0)')
+    parser.add_argument('--partition-types', dest='partition_types', nargs='+',
+                        choices=['daily', 'hourly'], default=['daily'],
+                        help='PARTITION_TYPE values to sweep (default: daily)')
+    parser.add_argument('--layouts', nargs='+', choices=LAYOUTS, default=['separate'],
+                        help='ASSET_LAYOUT values to sweep (default: separate)')
+    parser.add_argument('--group-size', dest='group_size', type=int, default=100,
+                        help='Assets per multi_asset or graph_asset (default: 100)')
+    parser.add_argument('--topologies', nargs='+', choices=TOPOLOGIES, default=['none'],
+                        help='ASSET_TOPOLOGY values to sweep (default: none)')
+    parser.add_argument('--edge-density', dest='edge_density', type=float, default=0.001,
+                        help='EDGE_DENSITY of the layered and random topologies '
+                             '(default: 0.001)')
+
+
+def shapes_from_args(parser, args):
+    """Return the points (see sweep_points) and (layout, topology) shapes to sweep.
+
+    Exits through parser.error when the arguments of add_shape_arguments are invalid.
+    """
+    if args.group_size < 1:
+        parser.error('--group-size must be at least 1')
+    if not 0 <= args.edge_density <= 1:
+        parser.error('--edge-density must be between 0 and 1')
+
+    points = sweep_points(
+        [parse_asset_count(value) for value in args.assets],
+        [parse_asset_count(value) for value in args.partitions],
+        args.partition_types,
+    )
+    shapes = [
+        (layout, topology)
+        for layout, topology in itertools.product(args.layouts, args.topologies)
+        # simple_repo cannot add dependencies to graph assets
+        if topology == 'none' or layout != 'graph_asset'
+    ]
+    return points, shapes
+
+
+def probe_env(assets, partitions, partition_type, asset_prefix='profile', layout='separate',
+              group_size=100, topology='none', edge_density=0.001) -> dict:
+    """Return the environment loading simple_repo with the given settings."""
+    env = {name: value for name, value in os.environ.items() if name != 'SNAPSHOT_CACHE_DIR'}
+    env.update({
+        'ASSET_PREFIX': asset_prefix,
+        'NUM_ASSETS': str(assets),
+        'NUM_PARTITIONS': str(partitions),
+        'ASSET_LAYOUT': layout,
+        'ASSET_GROUP_SIZE': str(group_size),
+        'ASSET_TOPOLOGY': topology,
+        'EDGE_DENSITY': str(edge_density),
+    })
+    if partition_type is not None:
+        env['PARTITION_TYPE'] = partition_type
+    return env
+
+
+def with_snapshot_cache(env, directory) -> dict:
+    """Point env at a snapshot cache directory (see snapshot_cache.py)."""
+    return {**env, 'SNAPSHOT_CACHE_DIR': str(directory)}
+
+
+def run_subprocess(command, env, timeout):
+    try:
+        completed = subprocess.run(
+            command, env=env, capture_output=True, text=True, timeout=timeout,
+        )
+    except subprocess.TimeoutExpired as e:
+        raise Exception(f"Loading took longer than {timeout}s") from e
+
+    if completed.returncode != 0:
+        lines = completed.stderr.strip().splitlines()
+        raise Exception(lines[-1] if lines else f"Exit code {completed.returncode}")
+    return completed.stdout
+
+
+def build_snapshot(code_path, directory, assets, partitions, partition_type, timeout=600,
+                   **settings):
+    """Precompute the repository snapshot of a point with the snapshot_cache.py next to
+    code_path, as the image build does. settings are passed on to probe_env."""
+    env = probe_env(assets, partitions, partition_type, **settings)
+    script = Path(code_path).resolve().parent / 'snapshot_cache.py'
+    if not script.exists():
+        raise Exception(f"No snapshot_cache.py next to {code_path}")
+    run_subprocess(
+        [sys.executable, str(script), 'write', '--directory', str(directory),
+         '--code', str(code_path)],
+        env, timeout,
+    )
+
+
+def run_probe(code_path, assets, partitions, partition_type, mode='time', top=20,
+              asset_prefix='profile', timeout=600, repeat=5, layout='separate',
+              group_size=100, topology='none', edge_density=0.001, snapshot_cache=None):
+    """Load the code file once in a fresh interpreter and return the probe result.
+
+    layout, group_size, topology and edge_density set simple_repo's ASSET_LAYOUT,
+    ASSET_GROUP_SIZE, ASSET_TOPOLOGY and EDGE_DENSITY. snapshot_cache is a directory of
+    precomputed snapshots (see build_snapshot) to load the code with.
+    """
+    env = probe_env(assets, partitions, partition_type, asset_prefix, layout, group_size,
+                    topology, edge_density)
+    if snapshot_cache is not None:
+        env = with_snapshot_cache(env, snapshot_cache)
+
+    stdout = run_subprocess(
+        [
+            sys.executable, '-m', 'dagster_bench.defs_probe', str(code_path),
+            '--mode', mode, '--top', str(top), '--repeat', str(repeat),
+        ],
+        env, timeout,
+    )
+    result = json.loads(stdout.strip().splitlines()[-1])
+    if snapshot_cache is not None and not result['snapshot_cached']:
+        raise Exception(f"No matching precomputed snapshot in {snapshot_cache}")
+    return result
+
+
+def format_point(assets, partitions, partition_type):
+    if not partitions:
+        return f"{assets} assets"
+    return f"{assets} assets x {partitions} {partition_type}"
+
+
+def format_layout(layout, group_size, topology='none'):
+    label = layout if layout == 'separate' else f"{layout}/{group_size}"
+    if topology != 'none':
+        label += f" {topology}"
+    return label
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Profile building Definitions of the simple_repo code location',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  bench profile-defs --assets 250 500 2k 5k 10k
+  bench profile-defs --assets 1 --partitions 2k 10k --partition-types daily hourly
+  bench profile-defs --assets 2k --repeat 5 --top 30 -v
+  bench profile-defs --assets 10k --layouts separate multi_asset graph_asset --group-size 100
+  bench profile-defs --assets 10k --topologies none chain layered random --edge-density 0.001
+  bench profile-defs --assets 2k 10k --snapshot-cache --top 0 --no-memory
+
+Each point is loaded in a fresh Python process: --repeat times for timings, once under
+tracemalloc for peak memory and once under cProfile for the top functions. With
+--snapshot-cache every point is also loaded with its repository snapshot precomputed by
+src/simple_repo/snapshot_cache.py, as the image build does with SNAPSHOT_CONFIGS.
+        """
+    )
+
+    add_shape_arguments(parser)
+    parser.add_argument('--snapshot-cache', dest='snapshot_cache', action='store_true',
+                        help='Also load every point with a precomputed repository snapshot')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Timed loads per point (default: 3)')
+    parser.add_argument('--top', type=int, default=20,
+                        help='Functions kept from the profile, 0 to skip profiling '
+                             '(default: 20)')
+    parser.add_argument('--no-memory', dest='memory', action='store_false',
+                        help='Skip the tracemalloc load')
+    parser.add_argument('--code', help='Code file to load '
+                                       '(default: src/simple_repo/dagster_code.py of this repo)')
+    parser.add_argument('--results', default=DEFAULT_RESULTS_FILE,
+                        help=f'JSONL file every load is appended to (default: '
+                             f'{DEFAULT_RESULTS_FILE}, empty to disable)')
+    parser.add_argument('--timeout', type=float, default=600,
+                        help='Seconds a single load may take (default: 600)')
+    parser.add_argument('--verbose', '-v', action='store_true',
+                        help='Print the top functions of every point')
+
+    args = parser.parse_args()
+
+    if args.repeat < 1:
+        parser.error('--repeat must be at least 1')
+    points, shapes = shapes_from_args(parser, args)
+
+    code_path = Path(args.code) if args.code else find_code_path()
+    if code_path is None or not code_path.exists():
+        print(f"Error: Code file not found: {args.code or DEFAULT_CODE_PATH}")
+        sys.exit(1)
+
+    print("=" * 70)
+    print("Dagster Definitions Profile")
+    print("=" * 70)
+    print(f"Code file:      {code_path}")
+    print(f"Points:         {len(points) * len(shapes)}")
+    print(f"Repeats:        {args.repeat}")
+    print("=" * 70)
+    print()
+
+    store = ResultStore(args.results) if args.results else None
+    session = new_session_id()
+    rows = []
+
+    cache_dir = tempfile.TemporaryDirectory() if args.snapshot_cache else None
+    variants = [False, True] if args.snapshot_cache else [False]
+
+    for (assets, partitions, partition_type), (layout, topology), cached in itertools.product(
+        points, shapes, variants
+    ):
+        label = format_point(assets, partitions, partition_type)
+        layout_label = format_layout(layout, args.group_size, topology)
+        shape = dict(layout=layout, group_size=args.group_size, topology=topology,
+                     edge_density=args.edge_density)
+        snapshot_cache = None
+        if cached:
+            layout_label += ' cached'
+            snapshot_cache = cache_dir.name
+            try:
+                start = time.perf_counter()
+                build_snapshot(code_path, snapshot_cache, assets, partitions, partition_type,
+                               timeout=args.timeout, **shape)
+            except Exception as e:
+                print(f"  {label} ({layout_label}): FAILED to build the snapshot ({e})")
+                continue
+            print(f"  {label} ({layout_label}): snapshot built in "
+                  f"{time.perf_counter() - start:.2f}s")
+
+        modes = ['time'] * args.repeat
+        if args.memory:
+            modes.append('memory')
+        if args.top > 0:
+            modes.append('profile')
+
+        records = []
+        try:
+            for mode in modes:
+                records.append(run_probe(
+                    code_path, assets, partitions, partition_type, mode, args.top,
+                    timeout=args.timeout, snapshot_cache=snapshot_cache, **shape,
+                ))
+        except Exception as e:
+            print(f"  {label} ({layout_label}): FAILED ({e})")
+            continue
+
+        timed = [record for record in records if record['mode'] == 'time']
+        medians = {
+            stage: (
+                float(np.median([record['timings'][stage] for record in timed]))
+                if timed[0]['timings'].get(stage) is not None else None
+            )
+            for stage in STAGES
+        }
+        peak = next((r['peak_memory_bytes'] for r in records if r['mode'] == 'memory'), None)
+        profile = next((r['top'] for r in records if r['mode'] == 'profile'), [])
+        rows.append((label, layout_label, medians, peak))
+
+        total = sum(value for value in medians.values() if value is not None)
+        print(f"  {label} ({layout_label}, {timed[0]['definition_nodes']} definitions): "
+              f"{total:.2f}s (module {medians['module_import']:.2f}s, "
+              f"resolve {medians['resolve']:.2f}s)")
+        if args.verbose and profile:
+            print(f"    {'tottime':>8} {'cumtime':>8} {'ncalls':>9}  function")
+            for entry in profile:
+                print(f"    {entry['tottime']:>8.3f} {entry['cumtime']:>8.3f} "
+                      f"{entry['ncalls']:>9}  {entry['function']}")
+
+        if store is not None:
+            store.append(
+                records,
+                kind='defs_profile',
+                session=session,
+                code=str(code_path),
+                num_assets=assets,
+                num_partitions=partitions,
+                partition_type=partition_type,
+                layout=layout,
+                group_size=args.group_size,
+                topology=topology,
+                edge_density=args.edge_density,
+                snapshot_cached=cached,
+            )
+
+    if cache_dir is not None:
+        cache_dir.cleanup()
+
+    if not rows:
+        print("\nError: No successful loads")
+        sys.exit(1)
+
+    print("\n" + "=" * 108)
+    print("MEDIAN SECONDS PER STAGE")
+    print("=" * 108)
+    print(f"{'Point':<28} {'Shape':<24} {'dagster':>8} {'module':>8} {'Defs()':>8} "
+          f"{'resolve':>8} {'snapshot':>9} {'peak MB':>8}")
+    print("-" * 108)
+    for label, layout_label, medians, peak in rows:
+        values = [
+            f"{medians[stage]:>8.3f}" if medians[stage] is not None else f"{'n/a':>8}"
+            for stage in STAGES
+        ]
+        peak_mb = f"{peak / 1e6:>8.1f}" if peak is not None else f"{'n/a':>8}"
+        print(f"{label:<28} {layout_label:<24} {' '.join(values[:4])} {values[4]:>9} {peak_mb}")
+    print("=" * 108)
+
+    if store is not None:
+        print(f"\n✅ Loads appended: {args.results}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Report lag distributions from stored raw samples."""
+
+import argparse
+import json
+import sys
+
+from dagster_bench.results import DEFAULT_RESULTS_FILE, ResultStore
+from dagster_bench.stats import format_summary_table, summarize_phases, summarize_samples
+
+
+def configuration_key(record):
+    """Return the configuration a lag sample belongs to: prefix, offered load and selection.
+
+    Samples of bench analyze measured with other locations at the same time (mode
+    'parallel') are kept apart by their number of workers.
+    """
+    mode = record.get('mode', 'sequential')
+    return (
+        record.get('prefix'),
+        mode,
+        record.get('concurrency'),
+        record.get('rate'),
+        record.get('upstream', False),
+        record.get('upstream_depth'),
+        record.get('workers') if mode == 'parallel' else None,
+    )
+
+
+def configuration_label(key):
+    """Return a readable label for a configuration_key."""
+    prefix, mode, concurrency, rate, upstream, upstream_depth, workers = key
+    if upstream:
+        depth = f" (depth {upstream_depth})" if upstream_depth is not None else ""
+        prefix = f"{prefix} + upstream{depth}"
+    if mode == 'closed':
+        return f"{prefix} @ {concurrency} in flight"
+    if mode == 'open':
+        return f"{prefix} @ {rate:g} runs/s"
+    if mode == 'parallel':
+        return f"{prefix} ({workers} locations in parallel)"
+    return f"{prefix}"
+
+
+def group_samples(records):
+    """Group lag samples by configuration, in order of first appearance."""
+    groups = {}
+    for record in records:
+        groups.setdefault(configuration_key(record), []).append(record)
+    return groups
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Report lag distributions from stored samples',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  bench report
+  bench report results/baseline.jsonl --prefix 2k
+  bench report --session 5d319428fa97 --json
+        """
+    )
+
+    parser.add_argument('results', nargs='?', default=DEFAULT_RESULTS_FILE,
+                        help=f'Results file (default: {DEFAULT_RESULTS_FILE})')
+    parser.add_argument('--prefix', help='Only report this asset prefix')
+    parser.add_argument('--session', help='Only report samples of this session')
+    parser.add_argument('--confidence', type=float, default=0.95,
+                        help='Confidence level of the bootstrap intervals (default: 0.95)')
+    parser.add_argument('--json', action='store_true',
+                        help='Print the statistics as JSON')
+
+    args = parser.parse_args()
+
+    filters = {'kind': 'lag'}
+    if args.prefix:
+        filters['prefix'] = args.prefix
+    if args.session:
+        filters['session'] = args.session
+
+    records = ResultStore(args.results).load(**filters)
+    if not records:
+        print(f"Error: No lag samples in {args.results}")
+        sys.exit(1)
+
+    groups = group_samples(records)
+    summaries = {
+        configuration_label(key): {
+            **summarize_samples(samples, args.confidence),
+            'phases': summarize_phases(samples, args.confidence),
+        }
+        for key, samples in groups.items()
+    }
+
+    if args.json:
+        print(json.dumps(summaries, indent=2))
+        return
+
+    sessions = {record.get('session') for record in records}
+    print(f"{len(records)} samples from {len(sessions)} session(s) in {args.results}")
+    for label, summary in summaries.items():
+        phases = summary.pop('phases')
+        print(f"\n{label} (seconds):")
+        print(format_summary_table(summary, indent='  '))
+        print()
+        print(format_summary_table(phases, indent='  '))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Append-only store of raw benchmark samples."""
+
+import json
+import os
+import time
+import uuid
+
+DEFAULT_RESULTS_FILE = 'bench_results.jsonl'
+
+
+def new_session_id() -> str:
+    """Return an identifier grouping the records written by one bench invocation."""
+    return uuid.uuid4().hex[:12]
+
+
+class ResultStore:
+    """JSONL file holding one record per measured sample.
+
+    Records are only ever appended, so several sessions (and several kinds of benchmark,
+    told apart by the 'kind' field) can share one file. Each record carries the session
+    it was written by and the time it was recorded.
+    """
+
+    def __init__(self, path: str = DEFAULT_RESULTS_FILE) -> None:
+        self.path = path
+
+    def append(self, records, **common) -> int:
+        """Append records, each extended with the common fields. Returns the count written."""
+        recorded_at = time.time()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        count = 0
+        with open(self.path, 'a') as f:
+            for record in records:
+                f.write(json.dumps({'recorded_at': recorded_at, **common, **record}) + '\n')
+                count += 1
+        return count
+
+    def load(self, **filters) -> list[dict]:
+        """Read all records whose fields equal the given filter values."""
+        if not os.path.exists(self.path):
+            return []
+
+        records = []
+        with open(self.path) as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                record = json.loads(line)
+                if all(record.get(key) == value for key, value in filters.items()):
+                    records.append(record)
+        return records
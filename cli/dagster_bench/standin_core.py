@@ -0,0 +1,635 @@
+"""Local stand-in for the Dagster GraphQL API, for benchmarking without a cluster."""
+
+import argparse
+import heapq
+import json
+import math
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from dagster_bench.topology import upstream_assets
+from dagster_bench.utils import (
+    parse_asset_count,
+    parse_layout,
+    parse_partition_count,
+    parse_shards,
+    parse_topology,
+)
+
+LOCATION_PREFIX = "simple-asset-"
+
+# simple_repo counts its daily partitions back from this date
+PARTITIONS_START_FROM = datetime(2025, 11, 1, tzinfo=timezone.utc)
+
+# Matches both `logsForRun(runId: $runId, ...)` and aliased `r0: logsForRun(...)` fields
+LOGS_FOR_RUN_PATTERN = re.compile(
+    r"(?:(\w+)\s*:\s*)?logsForRun\(\s*runId:\s*\$(\w+)"
+    r"(?:\s*,\s*afterCursor:\s*\$(\w+))?(?:\s*,\s*limit:\s*(\$?\w+))?\s*\)"
+)
+
+
+def parse_location(location: str) -> tuple[str, int, int, tuple[int, int]] | None:
+    """Parse a 'simple-asset-{prefix}' or 'simple-asset-{prefix}-{index}' shard location.
+
+    Returns (prefix, asset count, partition count, (shard index, shard count)); the asset
+    count is that of the whole prefix, the location holds those in its shard (see shard_size).
+    """
+    if not location or not location.startswith(LOCATION_PREFIX):
+        return None
+    prefix = location[len(LOCATION_PREFIX):]
+    shard = (0, 1)
+    base, _, index = prefix.rpartition("-")
+    if base and index.isdigit():
+        count = parse_shards(base)[0]
+        if int(index) >= count or base == parse_shards(base)[1]:
+            return None
+        prefix, shard = base, (int(index), count)
+    elif parse_shards(prefix)[1] != prefix:
+        # A sharded prefix has no location of its own, only its shards do
+        return None
+    return prefix, parse_asset_count(prefix), parse_partition_count(prefix), shard
+
+
+def shard_size(num_assets: int, shard: tuple[int, int]) -> int:
+    """Return how many of num_assets assets the shard holds (asset i is in shard i % count)."""
+    index, count = shard
+    return len(range(index, num_assets, count))
+
+
+class LatencyModel:
+    """Synthetic durations of the phases of a run, scaled by the size of its code location.
+
+    Like a real deployment, the daemon fetches the job from the code location before
+    dequeuing a run, and both the run worker and the step worker load the location's
+    definitions, so these phases grow with the asset and partition counts. Loading costs
+    load_per_definition for every top-level asset definition on top of load_per_asset, so
+    collapsed layouts (multi_asset, graph_asset) load faster than separate assets, and
+    load_per_edge and plan_per_edge for every dependency. The step takes step seconds per
+    asset the run selects. Every duration is multiplied by time_scale and by lognormal
+    jitter.
+    """
+
+    def __init__(
+        self,
+        time_scale: float = 1.0,
+        jitter: float = 0.1,
+        dequeue_interval: float = 1.0,
+        dequeue_per_asset: float = 0.0002,
+        launch: float = 2.0,
+        load_base: float = 1.0,
+        load_per_asset: float = 0.0003,
+        load_per_definition: float = 0.0005,
+        load_per_partition: float = 0.00002,
+        load_per_edge: float = 0.0001,
+        plan_base: float = 0.05,
+        plan_per_asset: float = 0.0001,
+        plan_per_edge: float = 0.00005,
+        step: float = 0.1,
+        teardown: float = 0.05,
+        mutation_base: float = 0.02,
+        mutation_per_asset: float = 0.00005,
+        seed: int | None = None,
+    ) -> None:
+        self.time_scale = time_scale
+        self.jitter = jitter
+        self.dequeue_interval = dequeue_interval
+        self.dequeue_per_asset = dequeue_per_asset
+        self.launch = launch
+        self.load_base = load_base
+        self.load_per_asset = load_per_asset
+        self.load_per_definition = load_per_definition
+        self.load_per_partition = load_per_partition
+        self.load_per_edge = load_per_edge
+        self.plan_base = plan_base
+        self.plan_per_asset = plan_per_asset
+        self.plan_per_edge = plan_per_edge
+        self.step = step
+        self.teardown = teardown
+        self.mutation_base = mutation_base
+        self.mutation_per_asset = mutation_per_asset
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _scaled(self, seconds: float) -> float:
+        with self._lock:
+            noise = self._rng.lognormvariate(0.0, self.jitter) if self.jitter > 0 else 1.0
+        return seconds * self.time_scale * noise
+
+    def load_time(
+        self,
+        num_assets: int,
+        num_partitions: int,
+        num_definitions: int | None = None,
+        num_edges: int = 0,
+    ) -> float:
+        """Seconds to load a location's definitions, one per asset unless num_definitions."""
+        if num_definitions is None:
+            num_definitions = num_assets
+        return self._scaled(
+            self.load_base
+            + self.load_per_asset * num_assets
+            + self.load_per_definition * num_definitions
+            + self.load_per_partition * num_partitions
+            + self.load_per_edge * num_edges
+        )
+
+    def dequeue_time(self, num_assets: int) -> float:
+        """Seconds the daemon spends on a run before reporting it dequeued."""
+        return self._scaled(self.dequeue_per_asset * num_assets)
+
+    def mutation_time(self, num_assets: int) -> float:
+        """Seconds the webserver takes to answer a launch mutation."""
+        return self._scaled(self.mutation_base + self.mutation_per_asset * num_assets)
+
+    def run_events(
+        self,
+        num_assets: int,
+        num_partitions: int,
+        started: float,
+        num_definitions: int | None = None,
+        num_edges: int = 0,
+        num_selected: int = 1,
+    ):
+        """Return [(timestamp, event type, message)] of a run dequeued at started.
+
+        The location has num_edges dependencies and the run selects num_selected assets.
+        """
+        events = []
+        offset = 0.0
+
+        def add(delay, event_type, message):
+            nonlocal offset
+            offset += delay
+            events.append((offset, event_type, message))
+
+        add(self._scaled(0.01), "RUN_STARTING", "Starting run.")
+        add(self._scaled(0.01), "ENGINE_EVENT", "Creating Kubernetes run worker job")
+        add(self._scaled(self.launch), "ENGINE_EVENT", "Started process for run.")
+        load = (num_assets, num_partitions, num_definitions, num_edges)
+        add(self.load_time(*load), "RUN_START", "Started execution of run.")
+        add(self._scaled(0.01), "ENGINE_EVENT", "Executing steps using multiprocess executor")
+        add(
+            self._scaled(
+                self.plan_base + self.plan_per_asset * num_assets + self.plan_per_edge * num_edges
+            ),
+            "STEP_WORKER_STARTING",
+            "Launching subprocess for step.",
+        )
+        # The step worker loads the definitions again
+        add(self.load_time(*load), "STEP_WORKER_STARTED", "")
+        add(self._scaled(0.005), "STEP_START", "Started execution of step.")
+        add(self._scaled(self.step * num_selected), "STEP_OUTPUT", "Yielded output.")
+        add(self._scaled(0.005), "ASSET_MATERIALIZATION", "Materialized value.")
+        add(self._scaled(0.005), "STEP_SUCCESS", "Finished execution of step.")
+        add(self._scaled(self.teardown), "RUN_SUCCESS", "Finished execution of run.")
+        return [(started + delay, event_type, message) for delay, event_type, message in events]
+
+
+class _Run:
+    """A synthetic run with its whole event log scheduled up front."""
+
+    def __init__(self, run_id, events):
+        self.run_id = run_id
+        # (timestamp in seconds, event type, message), in order
+        self.events = events
+
+    def visible_events(self, now):
+        """Return the events that have happened by now."""
+        return [event for event in self.events if event[0] <= now]
+
+    def status(self, now):
+        happened = {event_type for _, event_type, _ in self.visible_events(now)}
+        if "RUN_SUCCESS" in happened:
+            return "SUCCESS"
+        if "RUN_START" in happened:
+            return "STARTED"
+        if "RUN_DEQUEUED" in happened:
+            return "STARTING"
+        return "QUEUED"
+
+
+class StandInServer:
+    """HTTP server answering the GraphQL operations dagster_bench sends.
+
+    Runs go through a simulated QueuedRunCoordinator: the daemon dequeues every
+    dequeue_interval while fewer than max_concurrent_runs runs are in progress, and
+    each run then reports the events of the latency model at wall clock time. Only the
+    selections the bench client uses are understood, not GraphQL in general.
+
+    A fraction error_rate of requests fail with HTTP 503, and page_size limits how many
+    events one logsForRun field returns. Prefixes with a topology (e.g. random2k) have the
+    dependencies simple_repo generates from edge_density, num_layers and topology_seed.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 3000,
+        model: LatencyModel | None = None,
+        max_concurrent_runs: int = 10,
+        error_rate: float = 0.0,
+        page_size: int | None = None,
+        edge_density: float = 0.001,
+        num_layers: int = 10,
+        topology_seed: int = 0,
+        seed: int | None = None,
+    ) -> None:
+        self.model = model or LatencyModel(seed=seed)
+        self.edge_density = edge_density
+        self.num_layers = num_layers
+        self.topology_seed = topology_seed
+        self._graphs: dict[str, dict[int, list[int]]] = {}
+        self.max_concurrent_runs = max_concurrent_runs
+        self.error_rate = error_rate
+        self.page_size = page_size
+        self.requests = Counter()
+        self.started_at = time.time()
+        self._runs: dict[str, _Run] = {}
+        # End times of the runs holding a concurrency slot
+        self._slots: list[float] = []
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+        self._thread = None
+
+        handler = type("StandInHandler", (_StandInHandler,), {"standin": self})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "StandInServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        """Serve from a background thread."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def handle(self, body) -> tuple[int, dict]:
+        """Answer one request body, returning the HTTP status and JSON response."""
+        if isinstance(body, list):
+            # The Dagster webserver fails on batched (array) bodies with a server error
+            return 500, {"errors": [{"message": "Batched queries are not supported"}]}
+        with self._lock:
+            fail = self.error_rate > 0 and self._rng.random() < self.error_rate
+        if fail:
+            self.requests["failed"] += 1
+            return 503, {"errors": [{"message": "Service unavailable"}]}
+
+        query = body.get("query") or ""
+        variables = body.get("variables") or {}
+        now = time.time()
+
+        if "launchPipelineExecution" in query:
+            self.requests["launch"] += 1
+            return 200, {"data": {"launchPipelineExecution": self._launch(variables)}}
+
+        data = {}
+        if "runsOrError" in query:
+            self.requests["runs"] += 1
+            data["runsOrError"] = self._runs_or_error(variables.get("runIds") or [], now)
+        for match in LOGS_FOR_RUN_PATTERN.finditer(query):
+            self.requests["logs"] += 1
+            alias, run_variable, cursor_variable, limit = match.groups()
+            if limit is not None:
+                limit = variables.get(limit[1:]) if limit.startswith("$") else int(limit)
+            data[alias or "logsForRun"] = self._logs_for_run(
+                variables.get(run_variable),
+                variables.get(cursor_variable) if cursor_variable else None,
+                limit,
+                now,
+            )
+        if "repositoryOrError" in query:
+            self.requests["graph"] += 1
+            data["repositoryOrError"] = self._repository(variables.get("repoLocation"))
+        if "assetNodeOrError" in query:
+            self.requests["asset"] += 1
+            data["assetNodeOrError"] = self._asset_node(
+                ((variables.get("assetKey") or {}).get("path") or [""])[-1], query, now
+            )
+        if "workspaceLocationEntryOrError" in query:
+            self.requests["location"] += 1
+            data["workspaceLocationEntryOrError"] = {
+                "__typename": "WorkspaceLocationEntry",
+                "updatedTimestamp": self.started_at,
+            }
+
+        if not data:
+            if "__typename" not in query:
+                return 200, {"errors": [{"message": "Operation not supported by the stand-in"}]}
+            self.requests["ping"] += 1
+            data["__typename"] = "Query"
+        return 200, {"data": data}
+
+    def _launch(self, variables):
+        parsed = parse_location(variables.get("repoLocation"))
+        if parsed is None:
+            return {
+                "__typename": "PythonError",
+                "message": f"Location {variables.get('repoLocation')} not found in workspace",
+            }
+        prefix, num_assets, num_partitions, shard = parsed
+
+        for asset_key in variables.get("assetKeys") or []:
+            name = (asset_key.get("path") or [""])[-1]
+            index = self._asset_index(name, prefix, num_assets)
+            if index is None or index % shard[1] != shard[0]:
+                return {
+                    "__typename": "InvalidSubsetError",
+                    "message": f"Asset {name} does not exist in {variables['repoLocation']}",
+                }
+
+        upstream = self._upstream(prefix, num_assets)
+        num_edges = sum(
+            len(parents) for i, parents in upstream.items() if i % shard[1] == shard[0]
+        )
+        # Each shard loads and snapshots only its own assets
+        num_assets = shard_size(num_assets, shard)
+        _, group_size, _ = parse_layout(prefix)
+        num_definitions = math.ceil(num_assets / group_size) if group_size else num_assets
+        time.sleep(self.model.mutation_time(num_assets))
+        run_id = str(uuid.uuid4())
+        self._enqueue(
+            run_id,
+            num_assets,
+            num_partitions,
+            num_definitions=num_definitions,
+            num_edges=num_edges,
+            num_selected=len(variables.get("assetKeys") or []),
+        )
+        return {"__typename": "LaunchRunSuccess", "run": {"id": run_id, "status": "QUEUED"}}
+
+    def _upstream(self, prefix, num_assets) -> dict[int, list[int]]:
+        """Return the dependencies of the prefix's assets, generated once per prefix."""
+        with self._lock:
+            if prefix not in self._graphs:
+                self._graphs[prefix] = upstream_assets(
+                    num_assets,
+                    parse_topology(prefix)[0],
+                    self.edge_density,
+                    self.num_layers,
+                    self.topology_seed,
+                )
+            return self._graphs[prefix]
+
+    def _repository(self, location):
+        """Return the asset nodes of a location with their dependency keys."""
+        parsed = parse_location(location)
+        if parsed is None:
+            return {
+                "__typename": "RepositoryNotFoundError",
+                "message": f"Location {location} not found in workspace",
+            }
+        prefix, num_assets, _, (index, count) = parsed
+        upstream = self._upstream(prefix, num_assets)
+        return {
+            "__typename": "Repository",
+            "assetNodes": [
+                {
+                    "assetKey": {"path": [f"{prefix}_dummy_asset_{i}"]},
+                    "isMaterializable": True,
+                    "dependencyKeys": [
+                        {"path": [f"{prefix}_dummy_asset_{j}"]} for j in upstream.get(i, [])
+                    ],
+                }
+                for i in range(index, num_assets, count)
+            ],
+        }
+
+    def _enqueue(self, run_id, num_assets, num_partitions, **shape) -> None:
+        """Schedule a run through the simulated run queue and record its events.
+
+        shape holds the keyword arguments of LatencyModel.run_events after started.
+        """
+        interval = self.model.dequeue_interval * self.model.time_scale
+        enqueued = time.time()
+
+        with self._lock:
+            # Dequeue at the first daemon iteration after enqueueing with a free slot
+            ready = enqueued
+            if len(self._slots) >= self.max_concurrent_runs:
+                ready = max(ready, heapq.heappop(self._slots))
+            if interval > 0:
+                ticks = math.ceil((ready - self.started_at) / interval)
+                ready = self.started_at + ticks * interval
+            dequeued = ready + self.model.dequeue_time(num_assets)
+            run_events = self.model.run_events(num_assets, num_partitions, dequeued, **shape)
+            heapq.heappush(self._slots, run_events[-1][0])
+
+            events = [
+                (enqueued, "RUN_ENQUEUED", "Run enqueued."),
+                (dequeued, "RUN_DEQUEUED", "Run dequeued."),
+                *run_events,
+            ]
+            self._runs[run_id] = _Run(run_id, events)
+
+    def _runs_or_error(self, run_ids, now):
+        with self._lock:
+            runs = [self._runs[run_id] for run_id in run_ids if run_id in self._runs]
+        return {
+            "__typename": "Runs",
+            "results": [{"runId": run.run_id, "status": run.status(now)} for run in runs],
+        }
+
+    def _logs_for_run(self, run_id, cursor, limit, now):
+        with self._lock:
+            run = self._runs.get(run_id)
+        if run is None:
+            return {"__typename": "RunNotFoundError", "message": f"Run {run_id} not found"}
+
+        events = run.visible_events(now)
+        start = int(cursor) if cursor else 0
+        limit = limit or self.page_size
+        if self.page_size:
+            limit = min(limit, self.page_size)
+        page = events[start:start + limit] if limit else events[start:]
+        end = start + len(page)
+        return {
+            "__typename": "EventConnection",
+            "events": [
+                {
+                    "__typename": "MessageEvent",
+                    "eventType": event_type,
+                    "message": message,
+                    "timestamp": str(int(timestamp * 1000)),
+                }
+                for timestamp, event_type, message in page
+            ],
+            "cursor": str(end),
+            "hasMore": end < len(events),
+        }
+
+    @staticmethod
+    def _asset_index(name, prefix, num_assets):
+        """Return the index of a '{prefix}_dummy_asset_{i}' asset, or None if it is unknown."""
+        asset_prefix, _, index = name.rpartition("_dummy_asset_")
+        if asset_prefix != prefix or not index.isdigit() or int(index) >= num_assets:
+            return None
+        return int(index)
+
+    def _asset_node(self, name, query, now):
+        prefix = name.rpartition("_dummy_asset_")[0]
+        num_assets = parse_asset_count(prefix)
+        num_partitions = parse_partition_count(prefix)
+        if not prefix or self._asset_index(name, prefix, num_assets) is None:
+            return {"__typename": "AssetNotFoundError", "message": f"Asset {name} not found"}
+
+        node = {"__typename": "AssetNode"}
+        keys = partition_keys(num_partitions, now) if num_partitions else []
+        if "partitionDefinition" in query:
+            node["partitionDefinition"] = {"type": "TIME_WINDOW"} if num_partitions else None
+        if "partitionKeyConnection" in query:
+            node["partitionKeyConnection"] = {
+                "results": keys[-1:],
+                "cursor": keys[-1] if keys else None,
+                "hasMore": len(keys) > 1,
+            }
+        if "partitionKeys" in query:
+            node["partitionKeys"] = keys
+        return node
+
+
+def partition_keys(num_partitions, now):
+    """Return the daily partition keys simple_repo defines for num_partitions, oldest first.
+
+    Like its DailyPartitionsDefinition, the keys start num_partitions days before
+    PARTITIONS_START_FROM and run up to the last complete day.
+    """
+    first = PARTITIONS_START_FROM - timedelta(days=num_partitions)
+    last = datetime.fromtimestamp(now, tz=timezone.utc) - timedelta(days=1)
+    days = (last.date() - first.date()).days + 1
+    return [(first + timedelta(days=day)).strftime("%Y-%m-%d") for day in range(max(days, 0))]
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    standin: StandInServer = None
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._respond(400, {"errors": [{"message": "Invalid JSON"}]})
+            return
+        status, payload = self.standin.handle(body)
+        self._respond(status, payload)
+
+    def do_GET(self):
+        # No websocket support, so clients fall back to polling
+        self._respond(404, {"errors": [{"message": "Subscriptions are not supported"}]})
+
+    def _respond(self, status, payload):
+        out = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(out)))
+        self.end_headers()
+        self.wfile.write(out)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Serve a local stand-in for the Dagster GraphQL API',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  bench standin
+  bench standin --port 3001 --time-scale 0.01 --max-concurrent-runs 50
+  bench measure 10k --url http://localhost:3000 --runs 200 --rate 20
+
+Locations named 'simple-asset-{prefix}' exist for every prefix, with the asset and
+partition counts the prefix describes. Sharded prefixes like s4x10k have the locations
+'simple-asset-s4x10k-{index}' instead, each holding every 4th asset. Prefixes like
+random2k or chain2k have the dependencies simple_repo generates for that topology.
+        """
+    )
+
+    parser.add_argument('--host', default='127.0.0.1',
+                        help='Interface to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=3000,
+                        help='Port to listen on (default: 3000)')
+    parser.add_argument('--time-scale', dest='time_scale', type=float, default=1.0,
+                        help='Multiplier for every simulated duration (default: 1.0)')
+    parser.add_argument('--jitter', type=float, default=0.1,
+                        help='Sigma of the lognormal noise on durations (default: 0.1)')
+    parser.add_argument('--max-concurrent-runs', dest='max_concurrent_runs', type=int,
+                        default=10,
+                        help='Runs the simulated daemon keeps in progress (default: 10)')
+    parser.add_argument('--dequeue-interval', dest='dequeue_interval', type=float, default=1.0,
+                        help='Seconds between daemon dequeue iterations (default: 1.0)')
+    parser.add_argument('--error-rate', dest='error_rate', type=float, default=0.0,
+                        help='Fraction of requests answered with HTTP 503 (default: 0)')
+    parser.add_argument('--page-size', dest='page_size', type=int,
+                        help='Most events returned per logsForRun field (default: all)')
+    parser.add_argument('--edge-density', dest='edge_density', type=float, default=0.001,
+                        help='EDGE_DENSITY of prefixes with a topology (default: 0.001)')
+    parser.add_argument('--num-layers', dest='num_layers', type=int, default=10,
+                        help='NUM_LAYERS of layered prefixes (default: 10)')
+    parser.add_argument('--topology-seed', dest='topology_seed', type=int, default=0,
+                        help='TOPOLOGY_SEED of prefixes with a topology (default: 0)')
+    parser.add_argument('--seed', type=int,
+                        help='Random seed for jitter and injected errors')
+
+    args = parser.parse_args()
+
+    model = LatencyModel(
+        time_scale=args.time_scale,
+        jitter=args.jitter,
+        dequeue_interval=args.dequeue_interval,
+        seed=args.seed,
+    )
+    try:
+        server = StandInServer(
+            args.host,
+            args.port,
+            model,
+            max_concurrent_runs=args.max_concurrent_runs,
+            error_rate=args.error_rate,
+            page_size=args.page_size,
+            edge_density=args.edge_density,
+            num_layers=args.num_layers,
+            topology_seed=args.topology_seed,
+            seed=args.seed,
+        )
+    except OSError as e:
+        print(f"Error: Cannot listen on {args.host}:{args.port}: {e}")
+        sys.exit(1)
+
+    print(f"Dagster stand-in listening on {server.url}")
+    print(f"Try: bench measure 2k --url {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        counts = ", ".join(f"{name}: {count}" for name, count in sorted(server.requests.items()))
+        print(f"\nServed {sum(server.requests.values())} requests ({counts or 'none'})")
+
+
+if __name__ == "__main__":
+    main()
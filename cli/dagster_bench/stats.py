@@ -0,0 +1,216 @@
+"""Distribution statistics for lag samples."""
+
+import math
+
+import numpy as np
+
+from dagster_bench.events import PHASES, RUN_PHASES
+
+PERCENTILES = (50, 90, 99)
+
+
+def bootstrap_ci(values, statistic, confidence=0.95, n_boot=2000, seed=0):
+    """Return a percentile bootstrap confidence interval (low, high) for a statistic.
+
+    statistic is called once on an (n_boot, n) array of resamples and must reduce along
+    axis 1, e.g. `lambda x: np.median(x, axis=1)`.
+    """
+    values = np.asarray(values, dtype=float)
+    if values.size < 2:
+        value = float(values[0]) if values.size else float('nan')
+        return value, value
+
+    rng = np.random.default_rng(seed)
+    resamples = values[rng.integers(0, values.size, size=(n_boot, values.size))]
+    estimates = statistic(resamples)
+    alpha = (1 - confidence) / 2
+    low, high = np.quantile(estimates, [alpha, 1 - alpha])
+    return float(low), float(high)
+
+
+def summarize(values, confidence=0.95, n_boot=2000, seed=0):
+    """Summarize a lag distribution.
+
+    Returns count, mean, std, min, max, p50/p90/p99 and bootstrap confidence intervals for
+    the mean and the median.
+    """
+    values = np.asarray(values, dtype=float)
+    if values.size == 0:
+        return {'count': 0}
+
+    p50, p90, p99 = np.percentile(values, PERCENTILES)
+    return {
+        'count': int(values.size),
+        'confidence': confidence,
+        'mean': float(values.mean()),
+        'std': float(values.std(ddof=1)) if values.size > 1 else 0.0,
+        'min': float(values.min()),
+        'max': float(values.max()),
+        'p50': float(p50),
+        'p90': float(p90),
+        'p99': float(p99),
+        'mean_ci': bootstrap_ci(
+            values, lambda x: x.mean(axis=1), confidence, n_boot, seed
+        ),
+        'p50_ci': bootstrap_ci(
+            values, lambda x: np.median(x, axis=1), confidence, n_boot, seed
+        ),
+    }
+
+
+def format_summary_table(summaries, indent=''):
+    """Format {label: summarize(...)} as an aligned table of seconds."""
+    confidence = next(
+        (summary['confidence'] for summary in summaries.values() if summary.get('count')),
+        0.95,
+    )
+    ci_label = f"{confidence:.0%} CI (median)"
+    header = (
+        f"{indent}{'':<12}{'n':>5} {'mean':>8} {'std':>8} {'min':>8} {'p50':>8} "
+        f"{'p90':>8} {'p99':>8} {'max':>8}   {ci_label}"
+    )
+    lines = [header]
+    for label, summary in summaries.items():
+        if not summary.get('count'):
+            lines.append(f"{indent}{label:<12}{0:>5}")
+            continue
+        low, high = summary['p50_ci']
+        lines.append(
+            f"{indent}{label:<12}{summary['count']:>5} {summary['mean']:>8.3f} "
+            f"{summary['std']:>8.3f} {summary['min']:>8.3f} {summary['p50']:>8.3f} "
+            f"{summary['p90']:>8.3f} {summary['p99']:>8.3f} {summary['max']:>8.3f}   "
+            f"[{low:.3f}, {high:.3f}]"
+        )
+    return '\n'.join(lines)
+
+
+def summarize_samples(samples, confidence=0.95, n_boot=2000, seed=0):
+    """Summarize queue, init and total lag of raw samples, keyed by component label."""
+    queue = np.array([sample['enqueue_to_start'] for sample in samples], dtype=float)
+    init = np.array([sample['start_to_step'] for sample in samples], dtype=float)
+    return {
+        label: summarize(values, confidence, n_boot, seed)
+        for label, values in (('Queue', queue), ('Init', init), ('Total', queue + init))
+    }
+
+
+def summarize_phases(samples, confidence=0.95, n_boot=2000, seed=0):
+    """Summarize each run phase of raw samples, keyed by phase in lifecycle order.
+
+    Samples whose phase could not be told apart (None or missing) are left out of it.
+    Merged phases (see events.MERGED_PHASES) are only summarized when a sample has them.
+    """
+    return {
+        phase: summarize(
+            [
+                sample['phases'][phase]
+                for sample in samples
+                if sample.get('phases', {}).get(phase) is not None
+            ],
+            confidence,
+            n_boot,
+            seed,
+        )
+        for phase in PHASES
+        if phase in RUN_PHASES
+        or any(sample.get('phases', {}).get(phase) is not None for sample in samples)
+    }
+
+
+# Largest n1 * n2 for which mann_whitney_u computes the exact p-value
+EXACT_MAX_PAIRS = 2500
+
+
+def exact_rank_sum_p_value(ranks, n2):
+    """Two-sided p-value of the rank sum of the last n2 ranks among all equally likely
+    ways to pick n2 of the ranks, ties (half ranks) included."""
+    doubled = np.rint(2 * ranks).astype(int)
+    # counts[k, s]: subsets of k ranks whose doubled ranks sum to s
+    counts = np.zeros((n2 + 1, doubled.sum() + 1))
+    counts[0, 0] = 1.0
+    for rank in doubled:
+        counts[1:, rank:] = counts[1:, rank:] + counts[:-1, :counts.shape[1] - rank]
+
+    sums = np.arange(counts.shape[1])
+    expected = n2 * (ranks.size + 1)
+    observed = abs(doubled[-n2:].sum() - expected)
+    extreme = counts[n2, np.abs(sums - expected) >= observed].sum()
+    return float(min(1.0, extreme / counts[n2].sum()))
+
+
+def min_p_value(n1, n2):
+    """Return the smallest two-sided p-value mann_whitney_u can give n1 and n2 values."""
+    if not n1 or not n2:
+        return 1.0
+    if n1 * n2 <= EXACT_MAX_PAIRS:
+        return min(1.0, 2 / math.comb(n1 + n2, n1))
+    return 0.0
+
+
+def mann_whitney_u(baseline, candidate):
+    """Two-sided Mann-Whitney U test of whether candidate values tend to differ from baseline.
+
+    The p-value is exact, ties included, up to EXACT_MAX_PAIRS pairs of values, and uses the
+    normal approximation with tie and continuity corrections beyond. Small samples cannot
+    reach every significance level (see min_p_value): 3 values per side give at least 0.1.
+    Returns (probability that a candidate value exceeds a baseline value, counting ties as
+    half, p-value).
+    """
+    baseline = np.asarray(baseline, dtype=float)
+    candidate = np.asarray(candidate, dtype=float)
+    n1, n2 = baseline.size, candidate.size
+    if not n1 or not n2:
+        return float('nan'), float('nan')
+
+    values, inverse, counts = np.unique(
+        np.concatenate([baseline, candidate]), return_inverse=True, return_counts=True
+    )
+    # Tied values share the average of their ranks
+    ranks = (np.cumsum(counts) - (counts - 1) / 2)[inverse]
+    u = ranks[n1:].sum() - n2 * (n2 + 1) / 2
+    if n1 * n2 <= EXACT_MAX_PAIRS:
+        return float(u / (n1 * n2)), exact_rank_sum_p_value(ranks, n2)
+
+    n = n1 + n2
+    ties = (counts ** 3 - counts).sum() / (n * (n - 1)) if n > 1 else 0.0
+    sigma = np.sqrt(n1 * n2 / 12 * ((n + 1) - ties))
+    if sigma == 0:
+        return 0.5, 1.0
+    z = max(abs(u - n1 * n2 / 2) - 0.5, 0) / sigma
+    return float(u / (n1 * n2)), float(min(1.0, math.erfc(z / np.sqrt(2))))
+
+
+def bootstrap_median_change(baseline, candidate, confidence=0.95, n_boot=2000, seed=0):
+    """Compare the medians of two samples with independent bootstrap resamples of each.
+
+    Returns the difference (candidate - baseline) and the relative change (difference /
+    baseline median) of the medians, each with a percentile bootstrap confidence interval.
+    """
+    baseline = np.asarray(baseline, dtype=float)
+    candidate = np.asarray(candidate, dtype=float)
+    rng = np.random.default_rng(seed)
+    medians = [
+        np.median(values[rng.integers(0, values.size, size=(n_boot, values.size))], axis=1)
+        for values in (baseline, candidate)
+    ]
+    differences = medians[1] - medians[0]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        relatives = differences / medians[0]
+        base = np.median(baseline)
+        difference = np.median(candidate) - base
+        relative = difference / base if base else float('nan')
+
+    alpha = (1 - confidence) / 2
+    low, high = np.quantile(differences, [alpha, 1 - alpha])
+    # Without interpolation, as a resampled baseline median of 0 gives infinite changes
+    relative_low, relative_high = np.nanquantile(
+        relatives, [alpha, 1 - alpha], method='inverted_cdf'
+    )
+    return {
+        'baseline_p50': float(base),
+        'candidate_p50': float(np.median(candidate)),
+        'difference': float(difference),
+        'difference_ci': (float(low), float(high)),
+        'relative': float(relative),
+        'relative_ci': (float(relative_low), float(relative_high)),
+    }
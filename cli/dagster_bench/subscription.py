@@ -0,0 +1,200 @@
+"""Push-based run event transport over the webserver's GraphQL websocket."""
+
+import asyncio
+import itertools
+import json
+import time
+
+from websockets.asyncio.client import connect
+
+from dagster_bench.client import _auth_headers
+from dagster_bench.events import LIFECYCLE_EVENTS, LifecycleTracker
+
+# Dagster's webserver speaks the legacy subscriptions-transport-ws protocol
+GRAPHQL_WS_PROTOCOL = "graphql-ws"
+
+RUN_EVENTS_SUBSCRIPTION = """
+subscription RunEvents($runId: ID!, $cursor: String) {
+  pipelineRunLogs(runId: $runId, cursor: $cursor) {
+    __typename
+    ... on PipelineRunLogsSubscriptionSuccess {
+      messages {
+        ... on MessageEvent {
+          eventType
+          timestamp
+        }
+      }
+      cursor
+    }
+    ... on PipelineRunLogsSubscriptionFailure {
+      message
+      missingRunId
+    }
+  }
+}
+"""
+
+
+class RunEventSubscriber:
+    """Watch runs by subscribing to `pipelineRunLogs` instead of polling `logsForRun`.
+
+    All subscriptions share one websocket. Lifecycle timestamps are recorded as events are
+    pushed, and each run is unsubscribed as soon as its required events have arrived. If a
+    subscription fails and a fallback watcher (e.g. a PollingWatcher) is given, the run is
+    handed over to it.
+
+    Use as an async context manager.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        username: str | None = None,
+        password: str | None = None,
+        open_timeout: float = 10.0,
+        fallback=None,
+    ) -> None:
+        """Initialize subscriber with the Dagster URL and optional basic auth credentials."""
+        url = url if url.endswith('/graphql') else f"{url}/graphql"
+        self.url = url.replace('https://', 'wss://', 1).replace('http://', 'ws://', 1)
+        self.headers = {
+            key: value
+            for key, value in _auth_headers(username, password).items()
+            if key == 'Authorization'
+        }
+        self.open_timeout = open_timeout
+        self.fallback = fallback
+        self._operation_ids = itertools.count(1)
+        self._queues: dict[str, asyncio.Queue] = {}
+        self._websocket = None
+        self._reader = None
+
+    async def __aenter__(self) -> "RunEventSubscriber":
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def connect(self) -> None:
+        """Open the websocket and complete the graphql-ws handshake."""
+        self._websocket = await connect(
+            self.url,
+            subprotocols=[GRAPHQL_WS_PROTOCOL],
+            additional_headers=self.headers,
+            open_timeout=self.open_timeout,
+        )
+        try:
+            await self._send({"type": "connection_init", "payload": {}})
+            while True:
+                message = json.loads(
+                    await asyncio.wait_for(self._websocket.recv(), self.open_timeout)
+                )
+                if message.get("type") == "connection_ack":
+                    break
+                if message.get("type") == "connection_error":
+                    raise Exception(f"Subscription rejected: {message.get('payload')}")
+        except BaseException:
+            await self._websocket.close()
+            self._websocket = None
+            raise
+        self._reader = asyncio.create_task(self._read())
+
+    async def close(self) -> None:
+        """Terminate the connection and fail any runs still being watched."""
+        if self._websocket is not None:
+            try:
+                await self._send({"type": "connection_terminate"})
+            except Exception:
+                pass
+            await self._websocket.close()
+        if self._reader is not None:
+            await asyncio.gather(self._reader, return_exceptions=True)
+
+    async def _send(self, message) -> None:
+        await self._websocket.send(json.dumps(message))
+
+    async def _read(self) -> None:
+        """Route incoming messages to the queue of their operation."""
+        try:
+            async for raw in self._websocket:
+                message = json.loads(raw)
+                queue = self._queues.get(message.get("id"))
+                if queue is not None:
+                    queue.put_nowait(message)
+        finally:
+            # Wake up every waiting run so it can fall back or give up
+            for queue in self._queues.values():
+                queue.put_nowait({"type": "connection_closed"})
+
+    async def wait_for_lifecycle(self, run_id, max_wait=300, required=LIFECYCLE_EVENTS,
+                                 polls=None):
+        """Subscribe to a run's events until all required lifecycle events are pushed.
+
+        Returns a dict mapping event type to timestamp in seconds. Event types that did not
+        arrive within max_wait are missing from the dict. polls collects the polls of the
+        fallback watcher, if the run is handed over to it.
+        """
+        deadline = time.monotonic() + max_wait
+        try:
+            return await self._subscribe(run_id, deadline, required)
+        except Exception:
+            if self.fallback is None:
+                raise
+            remaining = max(0.0, deadline - time.monotonic())
+            if polls is None:
+                return await self.fallback.wait_for_lifecycle(run_id, remaining, required)
+            return await self.fallback.wait_for_lifecycle(run_id, remaining, required, polls)
+
+    async def _subscribe(self, run_id, deadline, required):
+        """Stream a run's events until the tracker is done or the deadline passes."""
+        if self._reader is None or self._reader.done():
+            raise Exception("Subscription connection is closed")
+
+        operation_id = str(next(self._operation_ids))
+        queue = asyncio.Queue()
+        self._queues[operation_id] = queue
+        tracker = LifecycleTracker(required)
+
+        try:
+            await self._send({
+                "id": operation_id,
+                "type": "start",
+                "payload": {
+                    "query": RUN_EVENTS_SUBSCRIPTION,
+                    "variables": {"runId": run_id, "cursor": None},
+                },
+            })
+
+            while not tracker.done:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    message = await asyncio.wait_for(queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+
+                message_type = message.get("type")
+                if message_type == "data":
+                    payload = message.get("payload") or {}
+                    if payload.get("errors"):
+                        raise Exception(f"Subscription failed: {payload['errors']}")
+                    logs = (payload.get("data") or {}).get("pipelineRunLogs") or {}
+                    if logs.get("__typename") == "PipelineRunLogsSubscriptionFailure":
+                        raise Exception(f"Subscription failed: {logs.get('message')}")
+                    tracker.add_events(logs.get("messages", []), logs.get("cursor"))
+                elif message_type == "error":
+                    raise Exception(f"Subscription failed: {message.get('payload')}")
+                elif message_type in {"complete", "connection_closed"}:
+                    if not tracker.done:
+                        raise Exception(f"Subscription for run {run_id} ended early")
+        finally:
+            del self._queues[operation_id]
+            if not self._reader.done():
+                try:
+                    await self._send({"id": operation_id, "type": "stop"})
+                except Exception:
+                    pass
+
+        return tracker.timestamps
@@ -0,0 +1,60 @@
+"""Dependency topologies of the simple_repo assets.
+
+Mirrors upstream_assets of src/simple_repo/dagster_code.py, so the stand-in server serves
+the same asset graphs as a deployed location with the same ASSET_TOPOLOGY, EDGE_DENSITY,
+NUM_LAYERS and TOPOLOGY_SEED.
+"""
+
+import math
+import random
+
+
+def sample_range(rng, start, stop, probability):
+    """Pick every number in [start, stop) with the given probability, in O(picked) time."""
+    if probability <= 0:
+        return []
+    if probability >= 1:
+        return list(range(start, stop))
+    picked = []
+    log_skip = math.log(1.0 - probability)
+    i = start - 1
+    while True:
+        # Geometric gaps between picks, as in Batagelj & Brandes' G(n, p) generator
+        i += 1 + int(math.log(1.0 - rng.random()) / log_skip)
+        if i >= stop:
+            return picked
+        picked.append(i)
+
+
+def upstream_assets(num_assets, topology, density, num_layers, seed):
+    """Return {asset number: [numbers of the assets it depends on]} for a topology.
+
+    topology is one of none, chain, fan_in, fan_out, layered and random; asset i only
+    depends on assets with smaller numbers. Kept identical to the simple_repo copy, which
+    test_topology_mirror_matches_simple_repo checks.
+    """
+    rng = random.Random(seed)
+    if topology == "chain":
+        return {i: [i - 1] for i in range(1, num_assets)}
+    if topology == "fan_in":
+        return {num_assets - 1: list(range(num_assets - 1))} if num_assets > 1 else {}
+    if topology == "fan_out":
+        return {i: [0] for i in range(1, num_assets)}
+    if topology == "layered":
+        layers = min(num_layers, num_assets)
+        starts = [layer * num_assets // layers for layer in range(layers + 1)]
+        upstream = {}
+        for layer in range(1, layers):
+            previous = (starts[layer - 1], starts[layer])
+            for i in range(starts[layer], starts[layer + 1]):
+                parents = sample_range(rng, *previous, density)
+                upstream[i] = parents or [rng.randrange(*previous)]
+        return upstream
+    if topology == "random":
+        upstream = {}
+        for i in range(1, num_assets):
+            parents = sample_range(rng, 0, i, density)
+            if parents:
+                upstream[i] = parents
+        return upstream
+    return {}
@@ -0,0 +1,53 @@
+"""Export stored samples as per-run traces."""
+
+import argparse
+import sys
+
+from dagster_bench.results import DEFAULT_RESULTS_FILE, ResultStore
+from dagster_bench.traces import FORMATS, write_trace
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Export stored samples as per-run traces',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  bench trace --session 5d319428fa97  # open bench_trace.json in Perfetto
+  bench trace results/baseline.jsonl --prefix 2k --format otlp --output 2k.otlp.json
+  bench trace --run-id 0f6d3c5e-8a1b-4c2d-9e7f-123456789abc
+        """
+    )
+
+    parser.add_argument('results', nargs='?', default=DEFAULT_RESULTS_FILE,
+                        help=f'Results file (default: {DEFAULT_RESULTS_FILE})')
+    parser.add_argument('--prefix', help='Only export this asset prefix')
+    parser.add_argument('--session', help='Only export samples of this session')
+    parser.add_argument('--run-id', dest='run_ids', nargs='+',
+                        help='Only export these runs')
+    parser.add_argument('--format', dest='trace_format', choices=FORMATS, default='chrome',
+                        help='Chrome trace events or OTLP JSON (default: chrome)')
+    parser.add_argument('--output', default='bench_trace.json',
+                        help='Trace file (default: bench_trace.json)')
+
+    args = parser.parse_args()
+
+    filters = {'kind': 'lag'}
+    if args.prefix:
+        filters['prefix'] = args.prefix
+    if args.session:
+        filters['session'] = args.session
+
+    records = ResultStore(args.results).load(**filters)
+    if args.run_ids:
+        records = [record for record in records if record['run_id'] in args.run_ids]
+    if not records:
+        print(f"Error: No matching lag samples in {args.results}")
+        sys.exit(1)
+
+    write_trace(args.output, records, args.trace_format)
+    print(f"✅ {len(records)} runs exported: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""Export measured runs as traces.
+
+Every sample becomes one trace whose root span covers the run from the moment the bench
+started preparing it (partition lookup, upstream selection) until its STEP_START, with
+child spans for:
+- prepare: partition lookup and upstream selection
+- launch: the launch mutation
+- queue: RUN_ENQUEUED to RUN_START, and init: RUN_START to STEP_START, each holding the
+  run phases within it (see events.RUN_PHASES)
+- poll: every request that polled the run's events, up to the one that found STEP_START
+
+Traces are written as OTLP JSON (as exported by OpenTelemetry SDKs and read by e.g. the
+collector's otlpjsonfile receiver) or as Chrome trace events (chrome://tracing, Perfetto).
+Lifecycle spans are timed by Dagster's event timestamps, on the cluster's clock, while
+prepare, launch and polls are timed on the bench's clock.
+"""
+
+import hashlib
+import json
+
+from dagster_bench import __version__
+from dagster_bench.events import phase_intervals
+
+FORMATS = ('chrome', 'otlp')
+
+# OTLP span kinds
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_CLIENT = 3
+
+
+def run_spans(sample):
+    """Return the spans of a sample (see measure_core.make_sample), the root first.
+
+    Each span is a dict with name, start and end (in seconds), parent (the index of its
+    parent span, None for the root), kind ('internal' or 'client'), track ('lifecycle'
+    or 'polls') and attributes.
+    """
+    timestamps = sample['timestamps']
+    enqueued = timestamps['RUN_ENQUEUED']
+    started = timestamps['RUN_START']
+    step = timestamps['STEP_START']
+    submitted = sample['submit_time']
+    # Samples recorded before request times were kept start at the launch
+    requested = sample.get('request_time', submitted)
+    spans = []
+
+    def add(name, start, end, parent=0, kind='internal', track='lifecycle', **attributes):
+        spans.append({
+            'name': name,
+            'start': start,
+            'end': end,
+            'parent': parent,
+            'kind': kind,
+            'track': track,
+            'attributes': {key: value for key, value in attributes.items() if value is not None},
+        })
+        return len(spans) - 1
+
+    location = sample.get('repo_location')
+    if isinstance(location, list):
+        location = ','.join(location)
+    add(
+        f"run {sample['asset_key']}", min(requested, enqueued), step, parent=None,
+        run_id=sample['run_id'], asset_key=sample['asset_key'], partition=sample['partition'],
+        prefix=sample.get('prefix'), location=location,
+        selected_assets=sample.get('selected_assets'), in_flight=sample.get('in_flight'),
+        enqueue_to_start=sample['enqueue_to_start'], start_to_step=sample['start_to_step'],
+    )
+    if requested < submitted:
+        add('prepare', requested, submitted)
+    add('launch', submitted, submitted + sample['launch_latency'], kind='client')
+    queue = add('queue', enqueued, started)
+    init = add('init', started, step)
+    for phase, interval in phase_intervals(timestamps).items():
+        if interval is None or interval[1] > step:
+            continue
+        add(phase, *interval, parent=queue if interval[1] <= started else init)
+
+    for poll in sample.get('polls') or []:
+        if poll['start'] > step and 'STEP_START' not in poll['events']:
+            break
+        add('poll', poll['start'], poll['end'], kind='client', track='polls',
+            events=','.join(poll['events']), runs=poll['runs'], failed=poll['failed'])
+        if 'STEP_START' in poll['events']:
+            break
+    return spans
+
+
+def sample_label(sample):
+    return f"{sample.get('prefix') or ''} {sample['asset_key']} ({sample['run_id'][:8]})".strip()
+
+
+def to_chrome(samples):
+    """Return the samples as a Chrome trace, one process per run with a track per kind."""
+    events = []
+    tracks = {'lifecycle': 1, 'polls': 2}
+    for pid, sample in enumerate(samples, 1):
+        events.append({
+            'name': 'process_name', 'ph': 'M', 'pid': pid,
+            'args': {'name': sample_label(sample)},
+        })
+        for track, tid in tracks.items():
+            events.append({
+                'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid,
+                'args': {'name': track},
+            })
+        for span in run_spans(sample):
+            events.append({
+                'name': span['name'],
+                'cat': span['kind'],
+                'ph': 'X',
+                'ts': span['start'] * 1e6,
+                'dur': max(0.0, span['end'] - span['start']) * 1e6,
+                'pid': pid,
+                'tid': tracks[span['track']],
+                'args': span['attributes'],
+            })
+    return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+
+def otlp_value(value):
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+
+def span_id(run_id, index):
+    return hashlib.sha256(f"{run_id}/{index}".encode()).hexdigest()[:16]
+
+
+def to_otlp(samples, service_name='dagster-bench'):
+    """Return the samples as an OTLP JSON trace export, one trace per run.
+
+    Trace and span IDs are derived from the run ID, so exporting a run twice gives the
+    same IDs.
+    """
+    otlp_spans = []
+    for sample in samples:
+        run_id = sample['run_id']
+        trace_id = hashlib.sha256(run_id.encode()).hexdigest()[:32]
+        for index, span in enumerate(run_spans(sample)):
+            otlp_span = {
+                'traceId': trace_id,
+                'spanId': span_id(run_id, index),
+                'name': span['name'],
+                'kind': SPAN_KIND_CLIENT if span['kind'] == 'client' else SPAN_KIND_INTERNAL,
+                'startTimeUnixNano': str(int(span['start'] * 1e9)),
+                'endTimeUnixNano': str(int(span['end'] * 1e9)),
+                'attributes': [
+                    {'key': key, 'value': otlp_value(value)}
+                    for key, value in span['attributes'].items()
+                ],
+            }
+            if span['parent'] is not None:
+                otlp_span['parentSpanId'] = span_id(run_id, span['parent'])
+            if span['attributes'].get('failed'):
+                otlp_span['status'] = {'code': 2}
+            otlp_spans.append(otlp_span)
+
+    return {
+        'resourceSpans': [{
+            'resource': {
+                'attributes': [{'key': 'service.name', 'value': {'stringValue': service_name}}],
+            },
+            'scopeSpans': [{
+                'scope': {'name': 'dagster_bench', 'version': __version__},
+                'spans': otlp_spans,
+            }],
+        }],
+    }
+
+
+def write_trace(path, samples, trace_format='chrome'):
+    """Write the samples to path as a trace in trace_format ('chrome' or 'otlp')."""
+    trace = to_otlp(samples) if trace_format == 'otlp' else to_chrome(samples)
+    with open(path, 'w') as f:
+        json.dump(trace, f)
@@ -1,13 +1,102 @@
 """Utility functions for Dagster benchmarking."""
 
+import asyncio
+import re
+import time
+
+# Sharded prefixes: s{shards}x{prefix}, e.g. s4x10k is 10k assets over 4 locations
+SHARDED_PREFIX_PATTERN = re.compile(r'^s(\d+)x(.+)$')
+
+# Collapsed layouts: m{size}x{prefix} for @multi_asset and g{size}x{prefix} for
+# @graph_multi_asset groups of size assets, e.g. m100x10k (simple_repo's ASSET_LAYOUT)
+LAYOUT_PREFIX_PATTERN = re.compile(r'^([mg])(\d+)x(.+)$')
+LAYOUTS = {'m': 'multi_asset', 'g': 'graph_asset'}
+
+# Dependency topologies: {topology}{prefix}, e.g. random2k (simple_repo's ASSET_TOPOLOGY)
+TOPOLOGY_PREFIX_PATTERN = re.compile(r'^(chain|fanin|fanout|layered|random)(\d.*)$')
+TOPOLOGIES = {
+    'chain': 'chain',
+    'fanin': 'fan_in',
+    'fanout': 'fan_out',
+    'layered': 'layered',
+    'random': 'random',
+}
+
+
+def parse_shards(prefix: str) -> tuple[int, str]:
+    """Split a prefix into its shard count and the prefix describing all of its assets.
+
+    Examples:
+        's4x10k' -> (4, '10k'), '10k' -> (1, '10k')
+    """
+    match = SHARDED_PREFIX_PATTERN.match(prefix.lower())
+    if match is None or int(match.group(1)) < 1:
+        return 1, prefix
+    return int(match.group(1)), match.group(2)
+
+
+def parse_layout(prefix: str) -> tuple[str, int | None, str]:
+    """Split a prefix into its asset layout, group size and the prefix without them.
+
+    A sharded prefix keeps its shard part, which comes first.
+
+    Examples:
+        'm100x10k' -> ('multi_asset', 100, '10k'), 's4xg50x10k' -> ('graph_asset', 50, '10k'),
+        '10k' -> ('separate', None, '10k')
+    """
+    prefix = parse_shards(prefix)[1]
+    match = LAYOUT_PREFIX_PATTERN.match(prefix.lower())
+    if match is None or int(match.group(2)) < 1:
+        return 'separate', None, prefix
+    return LAYOUTS[match.group(1)], int(match.group(2)), match.group(3)
+
+
+def parse_topology(prefix: str) -> tuple[str, str]:
+    """Split a prefix into its dependency topology and the prefix without it.
+
+    Shard and layout parts come first and are dropped.
+
+    Examples:
+        'random2k' -> ('random', '2k'), 'm100xchain10k' -> ('chain', '10k'), '2k' -> ('none', '2k')
+    """
+    prefix = parse_layout(prefix)[2]
+    match = TOPOLOGY_PREFIX_PATTERN.match(prefix.lower())
+    if match is None:
+        return 'none', prefix
+    return TOPOLOGIES[match.group(1)], match.group(2)
+
+
+def location_names(prefix: str) -> list[str]:
+    """Return the repository locations of a prefix, in SHARD_INDEX order.
+
+    Examples:
+        '2k' -> ['simple-asset-2k'], 's2x10k' -> ['simple-asset-s2x10k-0', 'simple-asset-s2x10k-1']
+    """
+    shards, _ = parse_shards(prefix)
+    if shards == 1 and not SHARDED_PREFIX_PATTERN.match(prefix.lower()):
+        return [f"simple-asset-{prefix}"]
+    return [f"simple-asset-{prefix}-{index}" for index in range(shards)]
+
+
+def route_asset(asset_num: int, locations) -> str:
+    """Return the location holding asset number asset_num.
+
+    locations is a single location name or the shard locations in SHARD_INDEX order; shard
+    i holds the assets whose number modulo the shard count is i (see simple_repo).
+    """
+    if isinstance(locations, str):
+        return locations
+    return locations[asset_num % len(locations)]
+
 
 def parse_asset_count(prefix: str) -> int:
     """Parse asset count from prefix.
 
     Examples:
-        '10k' -> 10000, '2k' -> 2000, 'a1p2k' -> 1, '500' -> 500
+        '10k' -> 10000, '2k' -> 2000, 'a1p2k' -> 1, '500' -> 500, 's4x10k' -> 10000,
+        'm100x10k' -> 10000, 'random2k' -> 2000
     """
-    prefix = prefix.lower()
+    prefix = parse_topology(prefix)[1].lower()
 
     # Handle partition format: a{assets}p{partitions}k
     if prefix.startswith('a') and 'p' in prefix:
@@ -28,36 +117,270 @@ def parse_asset_count(prefix: str) -> int:
         return 1
 
 
-def get_latest_partition(
-    client,
-    asset_key: str,
-    repo_location: str,
-    verbose: bool = False,
-) -> str | None:
-    """Get the latest partition key for a partitioned asset."""
-    query = """
-    query GetAssetPartitions($assetKey: AssetKeyInput!) {
-      assetNodeOrError(assetKey: $assetKey) {
-        ... on AssetNode {
-          partitionKeys
-        }
+def parse_partition_count(prefix: str) -> int:
+    """Parse partition count per asset from prefix, 0 for unpartitioned assets.
+
+    Examples:
+        'a1p2k' -> 2000, 'a10p500' -> 500, '2k' -> 0
+    """
+    prefix = parse_topology(prefix)[1].lower()
+    if not (prefix.startswith('a') and 'p' in prefix):
+        return 0
+
+    partition_part = prefix[prefix.index('p') + 1:]
+    try:
+        if partition_part.endswith('k'):
+            return int(partition_part[:-1]) * 1000
+        return int(partition_part)
+    except ValueError:
+        return 0
+
+
+LATEST_PARTITION_QUERY = """
+query GetLatestPartition($assetKey: AssetKeyInput!) {
+  assetNodeOrError(assetKey: $assetKey) {
+    __typename
+    ... on AssetNode {
+      partitionDefinition {
+        type
+      }
+      partitionKeyConnection(limit: 1, ascending: false) {
+        results
       }
     }
-    """
+  }
+}
+"""
+
+# Fallback for webservers without partitionKeyConnection: downloads every partition key
+ALL_PARTITIONS_QUERY = """
+query GetAssetPartitions($assetKey: AssetKeyInput!) {
+  assetNodeOrError(assetKey: $assetKey) {
+    ... on AssetNode {
+      partitionKeys
+    }
+  }
+}
+"""
+
+ASSET_GRAPH_QUERY = """
+query GetAssetGraph($repoLocation: String!) {
+  repositoryOrError(
+    repositorySelector: {repositoryLocationName: $repoLocation, repositoryName: "__repository__"}
+  ) {
+    __typename
+    ... on Repository {
+      assetNodes {
+        assetKey { path }
+        isMaterializable
+        dependencyKeys { path }
+      }
+    }
+    ... on PythonError { message }
+    ... on RepositoryNotFoundError { message }
+  }
+}
+"""
+
+LOCATION_VERSION_QUERY = """
+query GetLocationVersion($name: String!) {
+  workspaceLocationEntryOrError(name: $name) {
+    ... on WorkspaceLocationEntry {
+      updatedTimestamp
+    }
+  }
+}
+"""
 
+
+async def _fetch_latest_partition(client, asset_key: str, verbose: bool = False) -> str | None:
+    """Look up the newest partition key of an asset without listing all of its partitions."""
     try:
-        result = client._execute(query, {"assetKey": {"path": [asset_key]}})
-        asset_node = result.get("assetNodeOrError", {})
-        partition_keys = asset_node.get("partitionKeys", [])
+        result = await client.execute(LATEST_PARTITION_QUERY, {"assetKey": {"path": [asset_key]}})
+    except Exception as e:
+        # Webservers without partitionKeyConnection reject the query with a 400
+        if verbose:
+            print(f"    Latest partition query failed, listing all keys: {e}")
+        result = {}
+    asset_node = result.get("assetNodeOrError")
 
-        if partition_keys:
-            latest = partition_keys[-1]
+    if asset_node is not None:
+        if asset_node.get("__typename") != "AssetNode" or not asset_node.get("partitionDefinition"):
+            return None
+        keys = (asset_node.get("partitionKeyConnection") or {}).get("results") or []
+        if keys:
             if verbose:
-                print(f"    Found {len(partition_keys)} partitions, using latest: {latest}")
-            return latest
+                print(f"    Partitioned asset, using latest: {keys[0]}")
+            return keys[0]
         return None
+
+    # Older webservers reject or don't answer the query above, so list every key instead
+    result = await client.execute(ALL_PARTITIONS_QUERY, {"assetKey": {"path": [asset_key]}})
+    asset_node = result.get("assetNodeOrError", {})
+    partition_keys = asset_node.get("partitionKeys", [])
+
+    if partition_keys:
+        latest = partition_keys[-1]
+        if verbose:
+            print(f"    Found {len(partition_keys)} partitions, using latest: {latest}")
+        return latest
+    return None
+
+
+class PartitionCache:
+    """Cache of the latest partition key per (location, asset key).
+
+    Entries expire after ttl seconds. The location's update timestamp is checked at most
+    every version_check_interval seconds, and all entries of a location are dropped when it
+    has been reloaded. Concurrent lookups of the same asset share a single request.
+    """
+
+    def __init__(self, ttl: float = 300.0, version_check_interval: float = 10.0) -> None:
+        self.ttl = ttl
+        self.version_check_interval = version_check_interval
+        self.hits = 0
+        self.misses = 0
+        self._entries: dict[tuple[str, str], tuple[float, str | None]] = {}
+        self._versions: dict[str, tuple[float, float | None]] = {}
+        self._pending: dict[tuple[str, str], asyncio.Future] = {}
+
+    def invalidate(self, repo_location: str | None = None, asset_key: str | None = None) -> None:
+        """Drop cached entries of one asset, one location, or everything."""
+        if repo_location is None:
+            self._entries.clear()
+            self._versions.clear()
+            return
+        for key in list(self._entries):
+            if key[0] == repo_location and asset_key in (None, key[1]):
+                del self._entries[key]
+
+    async def _check_location_version(self, client, repo_location: str) -> None:
+        """Invalidate the location's entries if it was reloaded since the last check."""
+        now = time.monotonic()
+        checked_at, version = self._versions.get(repo_location, (None, None))
+        if checked_at is not None and now - checked_at < self.version_check_interval:
+            return
+        # Claim this check so concurrent lookups don't repeat it
+        self._versions[repo_location] = (now, version)
+
+        try:
+            result = await client.execute(LOCATION_VERSION_QUERY, {"name": repo_location})
+            entry = result.get("workspaceLocationEntryOrError") or {}
+            current = entry.get("updatedTimestamp")
+        except Exception:
+            current = version
+
+        if checked_at is not None and current != version:
+            self.invalidate(repo_location)
+        self._versions[repo_location] = (now, current)
+
+    async def get(self, client, asset_key: str, repo_location: str, verbose: bool = False):
+        """Return the latest partition key of an asset, from the cache when fresh."""
+        key = (repo_location, asset_key)
+        await self._check_location_version(client, repo_location)
+
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[0] < self.ttl:
+            self.hits += 1
+            return entry[1]
+
+        pending = self._pending.get(key)
+        if pending is not None:
+            self.hits += 1
+            return await asyncio.shield(pending)
+
+        self.misses += 1
+        pending = asyncio.get_running_loop().create_future()
+        self._pending[key] = pending
+        try:
+            latest = await _fetch_latest_partition(client, asset_key, verbose)
+        except BaseException as e:
+            pending.set_exception(e)
+            # Retrieve the exception so an unawaited future doesn't log a warning
+            pending.exception()
+            raise
+        else:
+            self._entries[key] = (time.monotonic(), latest)
+            pending.set_result(latest)
+            return latest
+        finally:
+            del self._pending[key]
+
+
+async def get_latest_partition(
+    client,
+    asset_key: str,
+    repo_location: str,
+    verbose: bool = False,
+    cache: PartitionCache | None = None,
+) -> str | None:
+    """Get the latest partition key for a partitioned asset.
+
+    Uses cache when given, so repeated samples of the same asset skip the lookup.
+    """
+    try:
+        if cache is not None:
+            return await cache.get(client, asset_key, repo_location, verbose)
+        return await _fetch_latest_partition(client, asset_key, verbose)
     except Exception as e:
         if verbose:
             print(f"    Could not get partitions: {e}")
         return None
 
+
+class AssetGraphCache:
+    """Cache of the asset dependency graph of each location, to select upstream closures.
+
+    The graph of a location is fetched once with a single query; concurrent lookups wait
+    for the same request.
+    """
+
+    def __init__(self, depth: int | None = None) -> None:
+        self.depth = depth
+        self._graphs: dict[str, dict[str, list[str]]] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    async def graph(self, client, repo_location: str) -> dict[str, list[str]]:
+        """Return {asset key: upstream asset keys} of the location's materializable assets.
+
+        Upstream keys of other locations, e.g. other shards, are left out since a run can
+        only materialize assets of its own location.
+        """
+        lock = self._locks.setdefault(repo_location, asyncio.Lock())
+        async with lock:
+            if repo_location not in self._graphs:
+                result = await client.execute(ASSET_GRAPH_QUERY, {"repoLocation": repo_location})
+                repository = result.get("repositoryOrError") or {}
+                if repository.get("__typename") != "Repository":
+                    raise Exception(
+                        repository.get("message") or f"No repository in {repo_location}"
+                    )
+                nodes = [node for node in repository["assetNodes"] if node["isMaterializable"]]
+                keys = {node["assetKey"]["path"][-1] for node in nodes}
+                self._graphs[repo_location] = {
+                    node["assetKey"]["path"][-1]: [
+                        key["path"][-1] for key in node["dependencyKeys"]
+                        if key["path"][-1] in keys
+                    ]
+                    for node in nodes
+                }
+        return self._graphs[repo_location]
+
+    async def selection(self, client, asset_key: str, repo_location: str) -> list[str]:
+        """Return asset_key followed by its upstream closure, up to depth levels up."""
+        graph = await self.graph(client, repo_location)
+        selected = [asset_key]
+        seen = {asset_key}
+        frontier = [asset_key]
+        level = 0
+        while frontier and (self.depth is None or level < self.depth):
+            level += 1
+            parents = []
+            for key in frontier:
+                for parent in graph.get(key, []):
+                    if parent not in seen:
+                        seen.add(parent)
+                        parents.append(parent)
+            selected.extend(parents)
+            frontier = parents
+        return selected
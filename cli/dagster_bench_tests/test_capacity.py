@@ -0,0 +1,65 @@
+import numpy as np
+
+from dagster_bench.analyze_core import capacity_points
+from dagster_bench.capacity import best_model, fit_capacity
+
+SIZES = np.array([250, 500, 1000, 2000, 3000, 5000, 7500, 10000])
+
+
+def samples(lag, runs=30, noise=0.05, seed=0):
+    rng = np.random.default_rng(seed)
+    return [lag(size) * (1 + noise * rng.standard_normal(runs)) for size in SIZES]
+
+
+def test_piecewise_fit_finds_the_breakpoint():
+    def lag(x):
+        return 1 + 0.0002 * x + 0.002 * max(0, x - 2000)
+
+    results = fit_capacity(SIZES, samples(lag), predict_at=[20000], n_boot=500)
+
+    assert best_model(results) == "piecewise"
+    low, high = results["piecewise"]["parameters"]["t"]["ci"]
+    assert low <= 2000 <= high
+    assert results["piecewise"]["r2"] > 0.99
+    # p95 of normal noise is 1.645 standard deviations above the mean
+    prediction = results["piecewise"]["predictions"][20000]
+    assert abs(prediction["value"] / (lag(20000) * (1 + 0.05 * 1.645)) - 1) < 0.05
+    assert prediction["ci"][0] < prediction["value"] < prediction["ci"][1]
+
+
+def test_power_law_fit_recovers_the_exponent():
+    results = fit_capacity(SIZES, samples(lambda x: 0.01 * x ** 0.8, noise=0.01), n_boot=200)
+
+    exponent = results["power"]["parameters"]["b"]
+    assert abs(exponent["value"] - 0.8) < 0.02
+    assert exponent["ci"][0] < exponent["value"] < exponent["ci"][1]
+
+
+def test_max_size_within_a_lag_budget():
+    results = fit_capacity(SIZES, samples(lambda x: 1 + 0.001 * x, noise=0.0), budget=6.0,
+                           n_boot=50)
+
+    assert abs(results["linear"]["max_size"]["value"] - 5000) < 100
+
+
+def test_capacity_points_use_sequential_samples_per_location_without_parallel_ones():
+    def record(prefix, queue, **fields):
+        return {"prefix": prefix, "enqueue_to_start": queue, "start_to_step": 1.0, **fields}
+
+    records = [
+        record("10k", 4.0),
+        record("2k", 2.0),
+        record("s4x10k", 1.5),
+        record("m100x10k", 1.0),
+        record("2k", 9.0, mode="closed", concurrency=10),
+        record("2k", 9.0, upstream=True),
+        record("2k", 9.0, mode="parallel", workers=4),
+        record("10k", 9.0, mode="sequential", workers=1),
+    ]
+
+    prefixes, sizes, lags = capacity_points(records)
+
+    assert prefixes == ["2k", "s4x10k", "10k"]
+    assert sizes.tolist() == [2000, 2500, 10000]
+    assert lags["queue"] == [[2.0], [1.5], [4.0, 9.0]]
+    assert lags["total"] == [[3.0], [2.5], [5.0, 10.0]]
@@ -0,0 +1,73 @@
+import asyncio
+
+import httpx
+import pytest
+
+from dagster_bench.client import AsyncDagsterGraphQLClient
+
+
+class Responses:
+    """Answer requests with the given statuses in turn, repeating the last one.
+
+    A status may be an httpx exception class, which is raised instead.
+    """
+
+    def __init__(self, *statuses):
+        self.statuses = statuses
+        self.attempts = []
+
+    def __call__(self, request):
+        status = self.statuses[min(len(self.attempts), len(self.statuses) - 1)]
+        self.attempts.append(status)
+        if isinstance(status, type):
+            raise status("failed", request=request)
+        return httpx.Response(status, json={"data": {"__typename": "Query"}})
+
+    def query(self, query="query { __typename }"):
+        async def run():
+            async with AsyncDagsterGraphQLClient(
+                "http://dagster", retries=3, backoff_base=0.0, backoff_max=0.0
+            ) as client:
+                await client._client.aclose()
+                client._client = httpx.AsyncClient(transport=httpx.MockTransport(self))
+                return await client.execute(query)
+
+        return asyncio.run(run())
+
+
+def test_retries_transient_server_errors():
+    responses = Responses(503, 502, 200)
+    assert responses.query() == {"__typename": "Query"}
+    assert responses.attempts == [503, 502, 200]
+
+
+def test_gives_up_after_retries_and_does_not_retry_client_errors():
+    unavailable = Responses(503)
+    with pytest.raises(Exception, match="GraphQL request failed"):
+        unavailable.query()
+    assert len(unavailable.attempts) == 4
+
+    rejected = Responses(400, 200)
+    with pytest.raises(Exception, match="GraphQL request failed"):
+        rejected.query()
+    assert rejected.attempts == [400]
+
+
+def test_launch_mutation_is_only_retried_when_it_was_not_sent():
+    launch = "\nmutation LaunchAssetRun { launchPipelineExecution { __typename } }"
+
+    unavailable = Responses(503, 200)
+    with pytest.raises(Exception, match="GraphQL request failed"):
+        unavailable.query(launch)
+    assert unavailable.attempts == [503]
+
+    dropped = Responses(httpx.RemoteProtocolError, 200)
+    with pytest.raises(Exception, match="GraphQL request failed"):
+        dropped.query(launch)
+    assert len(dropped.attempts) == 1
+
+    refused = Responses(httpx.ConnectError, 200)
+    assert refused.query(launch) == {"__typename": "Query"}
+    assert refused.attempts == [httpx.ConnectError, 200]
+    # Queries are retried after a dropped connection
+    assert Responses(httpx.ReadError, 200).query() == {"__typename": "Query"}
@@ -0,0 +1,23 @@
+import pytest
+
+from dagster_bench.coldstart_core import MILESTONES, measure_coldstart, read_memory
+from dagster_bench.profile_defs_core import find_code_path, probe_env
+
+
+def test_read_memory_of_this_process():
+    memory = read_memory("self")
+    if memory is None:
+        pytest.skip("/proc is not available")
+    assert 0 < memory["rss_bytes"] <= memory["peak_rss_bytes"]
+
+
+def test_code_server_reaches_every_milestone_in_order():
+    pytest.importorskip("dagster")
+    code_path = find_code_path()
+
+    result = measure_coldstart(code_path, probe_env(5, 30, "daily", asset_prefix="t"),
+                               timeout=120)
+
+    times = [result["milestones"][milestone] for milestone in MILESTONES]
+    assert times == sorted(times) and times[0] > 0
+    assert result["snapshot_bytes"] > 0
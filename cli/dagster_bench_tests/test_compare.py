@@ -0,0 +1,85 @@
+import sys
+
+import numpy as np
+import pytest
+
+from dagster_bench.compare_core import compare, main
+from dagster_bench.results import ResultStore
+
+
+def lag_samples(seed, init_scale, count=40):
+    rng = np.random.default_rng(seed)
+    return [
+        {"enqueue_to_start": float(queue), "start_to_step": float(init)}
+        for queue, init in zip(rng.gamma(4, 0.5, count), rng.gamma(4, init_scale, count))
+    ]
+
+
+def test_compare_flags_only_significant_regressions_over_the_threshold():
+    baseline = [{**s, "prefix": "2k"} for s in lag_samples(0, 1.0)] + [
+        {**s, "prefix": "10k"} for s in lag_samples(1, 1.0)
+    ]
+    candidate = [{**s, "prefix": "2k"} for s in lag_samples(2, 2.0)] + [
+        {**s, "prefix": "10k"} for s in lag_samples(3, 1.0)
+    ] + [{**s, "prefix": "a1p2k"} for s in lag_samples(4, 1.0)]
+
+    rows = compare(baseline, candidate, gate=("total",), threshold=10)
+    assert {row["configuration"] for row in rows} == {"2k", "10k"}
+    regressions = [(row["configuration"], row["component"]) for row in rows if row["regression"]]
+    assert regressions == [("2k", "total")]
+
+    init = next(row for row in rows if row["configuration"] == "2k" and row["component"] == "init")
+    assert init["significant"] and init["relative_ci"][0] > 0.2
+    # A change within the threshold passes even when significant
+    assert not any(row["regression"] for row in compare(baseline, candidate, threshold=500))
+
+
+def test_compare_keeps_parallel_and_sequential_samples_apart():
+    sequential = [{**s, "prefix": "2k", "mode": "sequential", "workers": 1}
+                  for s in lag_samples(0, 1.0)]
+    parallel = [{**s, "prefix": "2k", "mode": "parallel", "workers": 4}
+                for s in lag_samples(1, 1.0)]
+
+    rows = compare(sequential + parallel, parallel)
+    assert {row["configuration"] for row in rows} == {"2k (4 locations in parallel)"}
+    assert {row["baseline_count"] for row in rows} == {40}
+    # Sequential samples of bench measure carry no workers
+    measured = [{key: value for key, value in s.items() if key != "workers"} for s in sequential]
+    assert {row["configuration"] for row in compare(sequential, measured)} == {"2k"}
+
+
+def test_compare_exits_non_zero_on_a_regression(tmp_path, monkeypatch, capsys):
+    store = ResultStore(str(tmp_path / "bench.jsonl"))
+    store.append(lag_samples(0, 1.0), kind="lag", session="base", prefix="2k")
+    store.append(lag_samples(1, 2.0), kind="lag", session="cand", prefix="2k")
+
+    argv = ["bench", store.path, "--baseline-session", "base", "--candidate-session", "cand"]
+    monkeypatch.setattr(sys, "argv", argv)
+    with pytest.raises(SystemExit) as exit_info:
+        main()
+    assert exit_info.value.code == 1
+    assert "REGRESSION" in capsys.readouterr().out
+
+    monkeypatch.setattr(sys, "argv", argv + ["--gate", "queue"])
+    main()
+    assert "No regressions" in capsys.readouterr().out
+
+
+def test_compare_fails_when_too_few_samples_could_show_a_regression(tmp_path, monkeypatch,
+                                                                     capsys):
+    samples = [{"enqueue_to_start": 1.0, "start_to_step": lag} for lag in (1.0, 2.0, 3.0)]
+    slower = [{"enqueue_to_start": 1.0, "start_to_step": lag} for lag in (4.0, 5.0, 6.0)]
+
+    row = next(row for row in compare(samples, slower) if row["component"] == "total")
+    assert row["p_value"] == 0.1
+    assert row["underpowered"] and not row["regression"]
+
+    store = ResultStore(str(tmp_path / "bench.jsonl"))
+    store.append(samples, kind="lag", session="base", prefix="2k")
+    store.append(slower, kind="lag", session="cand", prefix="2k")
+    monkeypatch.setattr(sys, "argv", ["bench", store.path, "--baseline-session", "base",
+                                      "--candidate-session", "cand"])
+    with pytest.raises(SystemExit) as exit_info:
+        main()
+    assert exit_info.value.code == 1
+    assert "Too few samples" in capsys.readouterr().out
@@ -0,0 +1,185 @@
+import asyncio
+
+from dagster_bench.events import (
+    RUN_COMPLETION_EVENTS,
+    LifecycleTracker,
+    MultiplexedRunWatcher,
+    build_watch_query,
+    phase_durations,
+    phase_intervals,
+)
+from dagster_bench.stats import summarize_phases
+
+
+class EventLogClient:
+    """Fake client answering multiplexed watch queries from a per-run event list."""
+
+    def __init__(self, events_by_run):
+        self.events_by_run = events_by_run
+        self.queries = 0
+
+    async def execute(self, query, variables=None):
+        self.queries += 1
+        result = {
+            "runsOrError": {
+                "results": [
+                    {"runId": run_id, "status": "STARTED"} for run_id in variables["runIds"]
+                ]
+            }
+        }
+        for i, run_id in enumerate(variables["runIds"]):
+            start = int(variables[f"cursor{i}"] or 0)
+            # Reveal one new event per poll
+            events = self.events_by_run[run_id][start:start + 1]
+            result[f"r{i}"] = {
+                "events": events,
+                "cursor": str(start + len(events)),
+                "hasMore": False,
+            }
+        return result
+
+
+def _events(offset_ms):
+    return [
+        {"eventType": "RUN_ENQUEUED", "timestamp": str(offset_ms)},
+        {"eventType": "ENGINE_EVENT", "timestamp": str(offset_ms + 100)},
+        {"eventType": "RUN_START", "timestamp": str(offset_ms + 2000)},
+        {"eventType": "STEP_START", "timestamp": str(offset_ms + 3000)},
+    ]
+
+
+def test_build_watch_query_aliases_each_run():
+    query, variables = build_watch_query([("a", None), ("b", "7")])
+
+    assert "runsOrError(filter: {runIds: $runIds})" in query
+    assert "r0: logsForRun(runId: $run0, afterCursor: $cursor0)" in query
+    assert "r1: logsForRun(runId: $run1, afterCursor: $cursor1)" in query
+    assert variables == {
+        "runIds": ["a", "b"],
+        "run0": "a",
+        "cursor0": None,
+        "run1": "b",
+        "cursor1": "7",
+    }
+
+
+def test_tracker_keeps_first_timestamps_and_cursor():
+    tracker = LifecycleTracker()
+
+    assert tracker.add_events(_events(0)[:2], "2") == ["RUN_ENQUEUED"]
+    assert tracker.add_events(_events(5000), "4") == ["RUN_START", "STEP_START"]
+
+    assert tracker.cursor == "4"
+    assert tracker.complete
+    assert tracker.timestamps == {"RUN_ENQUEUED": 0.0, "RUN_START": 7.0, "STEP_START": 8.0}
+
+
+def test_multiplexed_watcher_shares_one_request_per_tick():
+    client = EventLogClient({f"run-{i}": _events(i * 1000) for i in range(5)})
+
+    async def watch():
+        async with MultiplexedRunWatcher(client) as watcher:
+            return await asyncio.gather(*(
+                watcher.wait_for_lifecycle(f"run-{i}", max_wait=10) for i in range(5)
+            ))
+
+    results = asyncio.run(watch())
+
+    for i, timestamps in enumerate(results):
+        assert timestamps == {
+            "RUN_ENQUEUED": float(i),
+            "RUN_START": i + 2.0,
+            "STEP_START": i + 3.0,
+        }
+    # Four events revealed one per poll: four requests for all five runs, not twenty
+    assert client.queries == 4
+
+
+class MalformedOnceClient(EventLogClient):
+    """Fake client whose first answer cannot be parsed."""
+
+    async def execute(self, query, variables=None):
+        if self.queries == 0:
+            self.queries += 1
+            return {"runsOrError": "not a connection"}
+        return await super().execute(query, variables)
+
+
+def test_watcher_keeps_polling_after_a_malformed_response():
+    client = MalformedOnceClient({"run-0": _events(0)})
+
+    async def watch():
+        async with MultiplexedRunWatcher(client) as watcher:
+            watcher.poller.min_interval = 0.01
+            timestamps = await asyncio.wait_for(
+                watcher.wait_for_lifecycle("run-0", max_wait=10), 5
+            )
+            return watcher, timestamps
+
+    watcher, timestamps = asyncio.run(watch())
+
+    assert timestamps == {"RUN_ENQUEUED": 0.0, "RUN_START": 2.0, "STEP_START": 3.0}
+    assert watcher.failures == 1
+
+
+def test_tracker_splits_full_lifecycle_into_phases():
+    tracker = LifecycleTracker(RUN_COMPLETION_EVENTS)
+    tracker.add_events([
+        {"eventType": "RUN_ENQUEUED", "timestamp": "1000"},
+        {"eventType": "RUN_DEQUEUED", "timestamp": "2000"},
+        {"eventType": "RUN_STARTING", "timestamp": "2500"},
+        {"eventType": "ENGINE_EVENT", "timestamp": "3000"},
+        {"eventType": "ENGINE_EVENT", "timestamp": "5000"},
+        {"eventType": "RUN_START", "timestamp": "9000"},
+        {"eventType": "ENGINE_EVENT", "timestamp": "9500"},
+        {"eventType": "STEP_START", "timestamp": "10000"},
+    ])
+    assert not tracker.done
+    tracker.add_events([
+        {"eventType": "STEP_SUCCESS", "timestamp": "11000"},
+        {"eventType": "RUN_SUCCESS", "timestamp": "11500"},
+    ])
+    assert tracker.done
+
+    phases = phase_durations(tracker.timestamps)
+    assert phases["Run queue"] == 1.0
+    assert phases["Launch"] == 2.5  # until the last engine event before RUN_START
+    assert phases["Code load"] == 4.0
+    # No step worker events: planning and step boot are not told apart
+    assert phases["Plan"] is None
+    assert phases["Step boot"] is None
+    assert phases["Plan + Step boot"] == 1.0
+    assert phases["Teardown"] == 0.5
+    assert "Launch + Code load" not in phases
+
+
+def test_phases_next_to_missing_events_are_unknown():
+    phases = phase_durations({"RUN_ENQUEUED": 1.0, "RUN_START": 4.0, "STEP_START": 5.0})
+    assert phases["Run queue"] is None
+    assert phases["Code load"] is None
+    assert phases["Plan + Step boot"] == 1.0
+    assert phases["Step"] is None
+
+
+def test_phases_around_a_missing_optional_boundary_are_merged():
+    timestamps = {
+        "RUN_ENQUEUED": 0.0,
+        "RUN_DEQUEUED": 1.0,
+        "RUN_STARTING": 1.5,
+        "RUN_START": 6.0,
+        "STEP_WORKER_STARTING": 7.0,
+        "STEP_START": 9.0,
+    }
+    intervals = phase_intervals(timestamps)
+    assert intervals["Launch"] is None
+    assert intervals["Code load"] is None
+    assert intervals["Launch + Code load"] == (1.5, 6.0)
+    assert intervals["Plan"] == (6.0, 7.0)
+    assert intervals["Step boot"] == (7.0, 9.0)
+    assert "Plan + Step boot" not in intervals
+
+    samples = [{"phases": phase_durations(timestamps)}, {"phases": {"Launch": 2.0}}]
+    summaries = summarize_phases(samples)
+    assert summaries["Launch + Code load"]["count"] == 1
+    assert summaries["Launch"]["count"] == 1
+    assert "Plan + Step boot" not in summaries
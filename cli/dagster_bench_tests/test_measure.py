@@ -0,0 +1,180 @@
+import asyncio
+
+import numpy as np
+import requests
+
+from dagster_bench.analyze_core import measure_prefixes
+from dagster_bench.client import AsyncDagsterGraphQLClient
+from dagster_bench.coldstart_core import free_port
+from dagster_bench.events import PollingWatcher
+from dagster_bench.measure_core import launch_asset_run, run_measurement
+from dagster_bench.metrics import BenchMetrics
+from dagster_bench.standin_core import LatencyModel, StandInServer
+from dagster_bench.utils import get_latest_partition
+
+
+def standin(**kwargs):
+    model = LatencyModel(time_scale=0.01, jitter=0.0, dequeue_interval=1.0)
+    return StandInServer(port=0, model=model, seed=0, **kwargs)
+
+
+def test_measure_records_every_phase():
+    with standin() as server:
+        result = asyncio.run(run_measurement(server.url, "2k", runs=2, quiet=True))
+
+    assert result["repo_location"] == "simple-asset-2k"
+    assert len(result["samples"]) == 2
+    for sample in result["samples"]:
+        assert all(duration is not None for duration in sample["phases"].values())
+        assert sample["phases"]["Code load"] > 0
+        # Polls are only kept for traces
+        assert "polls" not in sample
+    # The websocket is not available, so events were polled
+    assert server.requests["logs"] > 0
+
+
+def test_sequential_runs_stop_waiting_after_max_wait():
+    with standin() as server:
+        result = asyncio.run(run_measurement(server.url, "2k", runs=1, max_wait=0.01,
+                                             quiet=True))
+
+    assert result["samples"] == []
+
+
+def test_standin_rejects_batched_requests_like_the_webserver():
+    with standin() as server:
+        response = requests.post(f"{server.url}/graphql", json=[{"query": "{ version }"}])
+
+    assert response.status_code == 500
+    assert response.json()["errors"]
+
+
+def test_load_mode_survives_server_errors():
+    with standin(error_rate=0.1, max_concurrent_runs=4) as server:
+        result = asyncio.run(run_measurement(
+            server.url, "500", runs=12, concurrency=6, transport="poll", seed=1, quiet=True,
+        ))
+
+    assert result["load"]["failed"] == 0
+    assert len(result["samples"]) == 12
+    assert max(sample["in_flight"] for sample in result["samples"]) == 6
+    # One multiplexed query per tick watches every run in flight
+    assert server.requests["runs"] < server.requests["logs"]
+
+
+def test_polling_pages_through_truncated_logs():
+    async def measure(url):
+        async with AsyncDagsterGraphQLClient(url) as client:
+            run_id = await launch_asset_run(client, "simple-asset-250", "250_dummy_asset_3")
+            return await PollingWatcher(client).wait_for_lifecycle(
+                run_id, max_wait=10, required=("RUN_SUCCESS",)
+            )
+
+    with standin(page_size=2) as server:
+        timestamps = asyncio.run(measure(server.url))
+    assert {"RUN_ENQUEUED", "RUN_START", "STEP_START", "RUN_SUCCESS"} <= set(timestamps)
+
+
+def test_partitioned_assets_launch_latest_partition():
+    async def lookup(url):
+        async with AsyncDagsterGraphQLClient(url) as client:
+            return (
+                await get_latest_partition(client, "a1p2k_dummy_asset_0", "simple-asset-a1p2k"),
+                await get_latest_partition(client, "2k_dummy_asset_0", "simple-asset-2k"),
+            )
+
+    with standin() as server:
+        partitioned, unpartitioned = asyncio.run(lookup(server.url))
+    assert partitioned is not None and len(partitioned) == len("2025-10-31")
+    assert unpartitioned is None
+
+
+def test_code_load_grows_with_asset_count():
+    with standin(max_concurrent_runs=20) as server:
+        results = asyncio.run(measure_prefixes(["250", "10k"], server.url, runs=1))
+
+    def code_load(prefix):
+        return np.mean([s["phases"]["Code load"] for s in results[prefix]["samples"]])
+
+    assert code_load("10k") > code_load("250")
+
+
+def test_sharded_prefix_launches_on_the_owning_shard():
+    with standin(max_concurrent_runs=20) as server:
+        sharded = asyncio.run(run_measurement(server.url, "s4x10k", runs=4, quiet=True))
+        whole = asyncio.run(run_measurement(server.url, "10k", runs=2, quiet=True))
+
+    assert len(sharded["repo_location"]) == 4
+    assert len(sharded["samples"]) == 4
+    for sample in sharded["samples"]:
+        asset_num = int(sample["asset_key"].rpartition("_")[2])
+        assert sample["repo_location"] == f"simple-asset-s4x10k-{asset_num % 4}"
+
+    def code_load(result):
+        return np.mean([s["phases"]["Code load"] for s in result["samples"]])
+
+    # Every shard loads a quarter of the assets
+    assert code_load(sharded) < code_load(whole)
+
+
+def test_collapsed_layout_loads_faster_than_separate_assets():
+    with standin(max_concurrent_runs=20) as server:
+        results = asyncio.run(measure_prefixes(["10k", "m100x10k"], server.url, runs=1))
+
+    def code_load(prefix):
+        return np.mean([s["phases"]["Code load"] for s in results[prefix]["samples"]])
+
+    assert results["m100x10k"]["samples"][0]["asset_key"].startswith("m100x10k_dummy_asset_")
+    assert code_load("m100x10k") < code_load("10k")
+
+
+def test_upstream_closure_is_launched_with_the_asset():
+    with standin(max_concurrent_runs=20) as server:
+        result = asyncio.run(run_measurement(
+            server.url, "chain500", runs=3, upstream=True, upstream_depth=4, seed=3, quiet=True,
+        ))
+        closure = asyncio.run(run_measurement(
+            server.url, "chain500", runs=1, upstream=True, quiet=True,
+        ))
+
+    for sample in result["samples"]:
+        asset_num = int(sample["asset_key"].rpartition("_")[2])
+        assert sample["selected_assets"] == min(asset_num, 4) + 1
+    asset_num = int(closure["samples"][0]["asset_key"].rpartition("_")[2])
+    assert closure["samples"][0]["selected_assets"] == asset_num + 1
+    assert server.requests["graph"] == 2
+
+
+def test_metrics_record_runs_and_requests_per_location():
+    metrics = BenchMetrics()
+    port = free_port()
+    metrics.serve(port, "127.0.0.1")
+    with standin(error_rate=0.3, max_concurrent_runs=4) as server:
+        asyncio.run(run_measurement(
+            server.url, "s2x500", runs=6, concurrency=3, transport="poll", seed=1, quiet=True,
+            metrics=metrics,
+        ))
+
+    value = metrics.registry.get_sample_value
+    locations = ["simple-asset-s2x500-0", "simple-asset-s2x500-1"]
+    measured = [
+        value("bench_total_lag_seconds_count", {"location": location, "prefix": "s2x500"}) or 0
+        for location in locations
+    ]
+    assert sum(measured) == 6
+    assert value("bench_launch_latency_seconds_count",
+                 {"location": locations[0], "prefix": "s2x500"}) == measured[0]
+
+    client_labels = {"location": ",".join(locations), "prefix": "s2x500"}
+    assert value("bench_graphql_request_duration_seconds_count",
+                 {**client_labels, "operation": "LaunchAssetRun"}) >= 6
+    unavailable = sum(
+        sample.value
+        for family in metrics.registry.collect() if family.name == "bench_graphql_errors"
+        for sample in family.samples
+        if sample.name.endswith("_total") and sample.labels["reason"] == "http_503"
+    )
+    assert unavailable == server.requests["failed"] > 0
+
+    scraped = requests.get(f"http://127.0.0.1:{port}/metrics", timeout=5).text
+    assert 'bench_queue_lag_seconds_bucket{le="0.25",location="simple-asset-s2x500-0"' in scraped
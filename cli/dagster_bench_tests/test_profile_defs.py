@@ -0,0 +1,125 @@
+import argparse
+import runpy
+
+import pytest
+
+from dagster_bench.profile_defs_core import (
+    add_shape_arguments,
+    build_snapshot,
+    find_code_path,
+    run_probe,
+    shapes_from_args,
+    sweep_points,
+)
+from dagster_bench.topology import upstream_assets
+
+
+def test_sweep_points_ignore_partition_type_without_partitions():
+    points = sweep_points([10, 100], [0, 500], ["daily", "hourly"])
+    assert points == [
+        (10, 0, None),
+        (10, 500, "daily"),
+        (10, 500, "hourly"),
+        (100, 0, None),
+        (100, 500, "daily"),
+        (100, 500, "hourly"),
+    ]
+
+
+def test_shape_arguments_skip_dependencies_of_graph_assets():
+    parser = argparse.ArgumentParser()
+    add_shape_arguments(parser)
+    args = parser.parse_args(["--assets", "2k", "--layouts", "separate", "graph_asset",
+                              "--topologies", "none", "chain"])
+
+    points, shapes = shapes_from_args(parser, args)
+    assert points == [(2000, 0, None)]
+    assert shapes == [("separate", "none"), ("separate", "chain"), ("graph_asset", "none")]
+
+    with pytest.raises(SystemExit):
+        shapes_from_args(parser, parser.parse_args(["--edge-density", "2"]))
+
+
+def test_probe_loads_simple_repo_in_a_fresh_process():
+    pytest.importorskip("dagster")
+    code_path = find_code_path()
+    assert code_path is not None
+
+    result = run_probe(code_path, 5, 30, "daily", mode="memory", asset_prefix="t")
+    assert result["asset_definitions"] == 5
+    assert result["peak_memory_bytes"] > 0
+    assert all(result["timings"][stage] >= 0 for stage in ("module_import", "resolve"))
+
+
+def test_payload_partition_definitions_do_not_grow_with_partition_count():
+    pytest.importorskip("dagster")
+    code_path = find_code_path()
+
+    few = run_probe(code_path, 3, 10, "daily", mode="payload", asset_prefix="t", repeat=1)
+    many = run_probe(code_path, 3, 1000, "daily", mode="payload", asset_prefix="t", repeat=1)
+
+    assert few["payload"]["partitioned_asset_nodes"] == 3
+    assert few["payload"]["compressed_bytes"] < few["payload"]["bytes"]
+    assert many["payload"]["partition_definition_bytes"] == (
+        few["payload"]["partition_definition_bytes"]
+    )
+
+
+def test_collapsed_layouts_keep_every_asset_in_fewer_definitions():
+    pytest.importorskip("dagster")
+    code_path = find_code_path()
+
+    for layout in ("multi_asset", "graph_asset"):
+        result = run_probe(
+            code_path, 10, 0, None, asset_prefix="t", layout=layout, group_size=4,
+        )
+        assert result["asset_definitions"] == 10
+        assert result["definition_nodes"] == 3
+
+
+def test_precomputed_snapshot_matches_and_only_serves_its_settings(tmp_path):
+    pytest.importorskip("dagster")
+    code_path = find_code_path()
+
+    build_snapshot(code_path, tmp_path, 5, 0, None, asset_prefix="t", topology="chain")
+    cached = run_probe(code_path, 5, 0, None, mode="payload", asset_prefix="t", repeat=1,
+                       topology="chain", snapshot_cache=tmp_path)
+    fresh = run_probe(code_path, 5, 0, None, mode="payload", asset_prefix="t", repeat=1,
+                      topology="chain")
+
+    assert cached["snapshot_cached"] and not fresh["snapshot_cached"]
+    assert cached["payload"]["bytes"] == fresh["payload"]["bytes"]
+    with pytest.raises(Exception, match="No matching precomputed snapshot"):
+        run_probe(code_path, 6, 0, None, asset_prefix="t", topology="chain",
+                  snapshot_cache=tmp_path)
+
+
+def test_snapshot_cache_leaves_a_changed_from_def_alone(tmp_path, monkeypatch, caplog):
+    pytest.importorskip("dagster")
+    from dagster._core.remote_representation.external_data import RepositorySnap
+
+    snapshot_cache = runpy.run_path(str(find_code_path().with_name("snapshot_cache.py")))
+
+    def from_def(repository_def, defer_snapshots=False, include_jobs=True):
+        raise AssertionError("not called")
+
+    monkeypatch.setattr(RepositorySnap, "from_def", staticmethod(from_def))
+    assert not snapshot_cache["install_snapshot_cache"](None, {}, __file__, tmp_path)
+    assert RepositorySnap.from_def is from_def
+    assert "Not serving precomputed snapshots" in caplog.text
+
+
+@pytest.mark.parametrize("topology", ["none", "chain", "fan_in", "fan_out", "layered", "random"])
+def test_topology_mirror_matches_simple_repo(monkeypatch, topology):
+    pytest.importorskip("dagster")
+    monkeypatch.setenv("ASSET_PREFIX", "t")
+    monkeypatch.setenv("NUM_ASSETS", "50")
+    namespace = runpy.run_path(str(find_code_path()))
+
+    for density, layers, seed in [(0.1, 4, 0), (0.5, 10, 7)]:
+        assert upstream_assets(50, topology, density, layers, seed) == (
+            namespace["upstream_assets"](50, topology, density, layers, seed)
+        )
+    edges = upstream_assets(50, topology, 0.1, 4, 0)
+    assert (topology == "none") == (not edges)
+    assert all(parent < child for child, parents in edges.items() for parent in parents)
@@ -0,0 +1,76 @@
+import numpy as np
+
+from dagster_bench.results import ResultStore
+from dagster_bench.stats import (
+    bootstrap_ci,
+    bootstrap_median_change,
+    mann_whitney_u,
+    min_p_value,
+    summarize,
+    summarize_samples,
+)
+
+
+def test_summarize_reports_percentiles_and_intervals():
+    values = np.arange(1, 101, dtype=float)
+    summary = summarize(values)
+
+    assert summary["count"] == 100
+    assert summary["min"] == 1.0
+    assert summary["max"] == 100.0
+    assert summary["p50"] == 50.5
+    assert summary["p99"] > summary["p90"] > summary["p50"]
+    low, high = summary["p50_ci"]
+    assert low < 50.5 < high
+    assert summarize([]) == {"count": 0}
+
+
+def test_bootstrap_ci_is_reproducible():
+    values = [0.1, 0.4, 0.2, 0.9, 0.3]
+    median = lambda x: np.median(x, axis=1)  # noqa: E731
+    assert bootstrap_ci(values, median, seed=1) == bootstrap_ci(values, median, seed=1)
+    assert bootstrap_ci([0.5], median) == (0.5, 0.5)
+
+
+def test_result_store_round_trip(tmp_path):
+    store = ResultStore(str(tmp_path / "results" / "bench.jsonl"))
+    samples = [
+        {"run_id": "a", "enqueue_to_start": 1.0, "start_to_step": 0.5},
+        {"run_id": "b", "enqueue_to_start": 3.0, "start_to_step": 0.5},
+    ]
+    assert store.append(samples, kind="lag", session="s1", prefix="2k") == 2
+    store.append(samples[:1], kind="lag", session="s2", prefix="10k")
+
+    records = store.load(kind="lag", prefix="2k")
+    assert [record["run_id"] for record in records] == ["a", "b"]
+    assert all(record["session"] == "s1" for record in records)
+
+    summaries = summarize_samples(records)
+    assert summaries["Total"]["mean"] == 2.5
+
+
+def test_mann_whitney_u_ranks_ties_and_separated_samples():
+    probability, p_value = mann_whitney_u(np.arange(10), np.arange(10, 20))
+    assert probability == 1.0
+    assert p_value < 0.001
+    assert mann_whitney_u([1, 2, 2, 3], [3, 2, 2, 1]) == (0.5, 1.0)
+    assert mann_whitney_u([1.0] * 5, [1.0] * 5) == (0.5, 1.0)
+
+
+def test_mann_whitney_u_is_exact_for_small_samples():
+    # Two of the 20 ways to split six values 3 vs 3 are as separated as these
+    assert mann_whitney_u([1, 2, 3], [4, 5, 6]) == (1.0, 0.1)
+    assert min_p_value(3, 3) == 0.1
+    assert mann_whitney_u([1, 2, 3, 4], [5, 6, 7, 8])[1] == min_p_value(4, 4) < 0.05
+    # Ties: {1, 2, 2} against {2, 3, 3} is one of the 6 most extreme of 20 splits
+    assert abs(mann_whitney_u([1, 2, 2], [2, 3, 3])[1] - 0.3) < 1e-12
+
+
+def test_bootstrap_median_change_covers_the_shift():
+    rng = np.random.default_rng(0)
+    baseline = rng.gamma(4, 0.5, 200)
+    change = bootstrap_median_change(baseline, baseline * 1.3)
+    assert abs(change["relative"] - 0.3) < 1e-9
+    low, high = change["relative_ci"]
+    assert low < 0.3 < high
+    assert change["difference_ci"][0] > 0
@@ -0,0 +1,104 @@
+import asyncio
+import json
+
+from websockets.asyncio.server import serve
+
+from dagster_bench.subscription import GRAPHQL_WS_PROTOCOL, RunEventSubscriber
+
+EVENTS = [
+    {"eventType": "RUN_ENQUEUED", "timestamp": "1000"},
+    {"eventType": "RUN_START", "timestamp": "3500"},
+    {"eventType": "STEP_START", "timestamp": "5000"},
+]
+
+
+class WebsocketStandIn:
+    """Minimal graphql-ws server pushing canned run events one message at a time."""
+
+    def __init__(self, missing_runs=()):
+        self.missing_runs = set(missing_runs)
+        self.stopped = []
+
+    async def handler(self, websocket):
+        async for raw in websocket:
+            message = json.loads(raw)
+            if message["type"] == "connection_init":
+                await websocket.send(json.dumps({"type": "connection_ack"}))
+            elif message["type"] == "start":
+                run_id = message["payload"]["variables"]["runId"]
+                asyncio.create_task(self.push(websocket, message["id"], run_id))
+            elif message["type"] == "stop":
+                self.stopped.append(message["id"])
+
+    async def push(self, websocket, operation_id, run_id):
+        if run_id in self.missing_runs:
+            logs = {
+                "__typename": "PipelineRunLogsSubscriptionFailure",
+                "message": f"Could not load run with id {run_id}",
+                "missingRunId": run_id,
+            }
+            await websocket.send(json.dumps({
+                "type": "data", "id": operation_id, "payload": {"data": {"pipelineRunLogs": logs}},
+            }))
+            return
+        for i, event in enumerate(EVENTS):
+            await asyncio.sleep(0.01)
+            logs = {
+                "__typename": "PipelineRunLogsSubscriptionSuccess",
+                "messages": [event],
+                "cursor": str(i),
+            }
+            await websocket.send(json.dumps({
+                "type": "data", "id": operation_id, "payload": {"data": {"pipelineRunLogs": logs}},
+            }))
+
+
+class FallbackWatcher:
+    def __init__(self):
+        self.runs = []
+
+    async def wait_for_lifecycle(self, run_id, max_wait=300, required=()):
+        self.runs.append(run_id)
+        return {"RUN_ENQUEUED": 1.0}
+
+
+async def _with_stand_in(stand_in, test):
+    async with serve(
+        stand_in.handler, "127.0.0.1", 0, subprotocols=[GRAPHQL_WS_PROTOCOL]
+    ) as server:
+        port = server.sockets[0].getsockname()[1]
+        return await test(f"http://127.0.0.1:{port}")
+
+
+def test_subscriber_records_pushed_timestamps_and_unsubscribes():
+    stand_in = WebsocketStandIn()
+
+    async def test(url):
+        async with RunEventSubscriber(url, "admin", "admin") as subscriber:
+            results = await asyncio.gather(
+                subscriber.wait_for_lifecycle("run-1", max_wait=5),
+                subscriber.wait_for_lifecycle("run-2", max_wait=5),
+            )
+            # Give the stand-in a moment to receive the stop messages
+            await asyncio.sleep(0.05)
+            return results
+
+    results = asyncio.run(_with_stand_in(stand_in, test))
+
+    for timestamps in results:
+        assert timestamps == {"RUN_ENQUEUED": 1.0, "RUN_START": 3.5, "STEP_START": 5.0}
+    assert sorted(stand_in.stopped) == ["1", "2"]
+
+
+def test_subscriber_falls_back_to_polling_on_failure():
+    stand_in = WebsocketStandIn(missing_runs={"run-1"})
+    fallback = FallbackWatcher()
+
+    async def test(url):
+        async with RunEventSubscriber(url, fallback=fallback) as subscriber:
+            return await subscriber.wait_for_lifecycle("run-1", max_wait=5)
+
+    timestamps = asyncio.run(_with_stand_in(stand_in, test))
+
+    assert timestamps == {"RUN_ENQUEUED": 1.0}
+    assert fallback.runs == ["run-1"]
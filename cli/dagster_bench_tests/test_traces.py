@@ -0,0 +1,60 @@
+import asyncio
+import json
+
+from dagster_bench.measure_core import run_measurement
+from dagster_bench.traces import run_spans, to_chrome, to_otlp, write_trace
+from dagster_bench_tests.test_measure import standin
+
+
+def measured_samples(**kwargs):
+    with standin(max_concurrent_runs=4) as server:
+        result = asyncio.run(run_measurement(
+            server.url, "2k", runs=2, transport="poll", quiet=True, keep_polls=True, **kwargs
+        ))
+    return result["samples"]
+
+
+def test_run_spans_nest_phases_and_end_polling_at_step_start():
+    sample = measured_samples()[0]
+    spans = run_spans(sample)
+    root = spans[0]
+    names = [span["name"] for span in spans]
+
+    assert root["parent"] is None
+    assert root["start"] == sample["request_time"]
+    assert root["end"] == sample["timestamps"]["STEP_START"]
+    assert names[1:5] == ["prepare", "launch", "queue", "init"]
+
+    parents = {span["name"]: spans[span["parent"]]["name"] for span in spans[1:]}
+    assert parents["Run queue"] == parents["Code load"] == "queue"
+    assert parents["Plan"] == parents["Step boot"] == "init"
+    # Phases after STEP_START are outside the root
+    assert "Step" not in parents and "Teardown" not in parents
+
+    polls = [span for span in spans if span["name"] == "poll"]
+    assert polls and len(polls) <= len(sample["polls"])
+    assert "STEP_START" in polls[-1]["attributes"]["events"]
+    assert all(span["track"] == "polls" for span in polls)
+
+
+def test_trace_formats(tmp_path):
+    samples = measured_samples(seed=2)
+
+    otlp = to_otlp(samples)
+    spans = otlp["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    roots = [span for span in spans if "parentSpanId" not in span]
+    assert len(roots) == 2
+    assert len({span["traceId"] for span in spans}) == 2
+    ids = {span["spanId"] for span in spans}
+    assert all(span["parentSpanId"] in ids for span in spans if "parentSpanId" in span)
+    assert all(int(span["endTimeUnixNano"]) >= int(span["startTimeUnixNano"]) for span in spans)
+    assert to_otlp(samples) == otlp
+
+    chrome = to_chrome(samples)["traceEvents"]
+    complete = [event for event in chrome if event["ph"] == "X"]
+    assert len(complete) == len(spans)
+    assert {event["pid"] for event in complete} == {1, 2}
+
+    path = tmp_path / "trace.json"
+    write_trace(str(path), samples, "otlp")
+    assert json.loads(path.read_text()) == json.loads(json.dumps(otlp))
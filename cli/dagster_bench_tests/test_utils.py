@@ -0,0 +1,106 @@
+import asyncio
+
+from dagster_bench.utils import (
+    PartitionCache,
+    get_latest_partition,
+    location_names,
+    parse_asset_count,
+    parse_layout,
+    parse_partition_count,
+    route_asset,
+)
+
+
+class PartitionClient:
+    """Fake client serving partition and location lookups."""
+
+    def __init__(self, latest="2025-10-31", supports_connection=True):
+        self.latest = latest
+        self.supports_connection = supports_connection
+        self.location_timestamp = 1.0
+        self.queries = []
+
+    async def execute(self, query, variables=None):
+        if "workspaceLocationEntryOrError" in query:
+            self.queries.append("location")
+            return {"workspaceLocationEntryOrError": {"updatedTimestamp": self.location_timestamp}}
+        if "partitionKeyConnection" in query:
+            self.queries.append("latest")
+            if not self.supports_connection:
+                raise Exception("GraphQL request failed: Client error '400 Bad Request'")
+            return {"assetNodeOrError": {
+                "__typename": "AssetNode",
+                "partitionDefinition": {"type": "TIME_WINDOW"},
+                "partitionKeyConnection": {"results": [self.latest]},
+            }}
+        self.queries.append("all")
+        return {"assetNodeOrError": {"partitionKeys": ["2025-10-30", self.latest]}}
+
+
+def test_parse_asset_count():
+    assert parse_asset_count("10k") == 10000
+    assert parse_asset_count("a1p2k") == 1
+    assert parse_asset_count("500") == 500
+
+
+def test_sharded_prefixes_route_assets_by_modulo():
+    assert parse_asset_count("s4x10k") == 10000
+    assert parse_partition_count("s2xa10p500") == 500
+    assert location_names("2k") == ["simple-asset-2k"]
+    locations = location_names("s4x10k")
+    assert locations == [f"simple-asset-s4x10k-{index}" for index in range(4)]
+    assert [route_asset(n, locations)[-1] for n in (0, 5, 10, 15)] == ["0", "1", "2", "3"]
+    assert route_asset(7, "simple-asset-2k") == "simple-asset-2k"
+
+
+def test_layout_prefixes_keep_the_asset_count():
+    assert parse_layout("m100x10k") == ("multi_asset", 100, "10k")
+    assert parse_layout("s4xg50xa10p500") == ("graph_asset", 50, "a10p500")
+    assert parse_layout("10k") == ("separate", None, "10k")
+    assert parse_asset_count("g100x10k") == 10000
+    assert parse_partition_count("m5xa10p500") == 500
+    assert location_names("s2xm100x10k")[1] == "simple-asset-s2xm100x10k-1"
+
+
+def test_parse_partition_count():
+    assert parse_partition_count("a1p2k") == 2000
+    assert parse_partition_count("a10p500") == 500
+    assert parse_partition_count("2k") == 0
+
+
+def test_partition_cache_reuses_lookups_until_location_reloads():
+    client = PartitionClient()
+    cache = PartitionCache(ttl=300, version_check_interval=0)
+
+    async def lookups():
+        first = await get_latest_partition(client, "a_dummy_asset_0", "loc", cache=cache)
+        second = await get_latest_partition(client, "a_dummy_asset_0", "loc", cache=cache)
+        client.location_timestamp = 2.0
+        client.latest = "2025-11-01"
+        third = await get_latest_partition(client, "a_dummy_asset_0", "loc", cache=cache)
+        return first, second, third
+
+    assert asyncio.run(lookups()) == ("2025-10-31", "2025-10-31", "2025-11-01")
+    assert client.queries.count("latest") == 2
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_partition_cache_shares_concurrent_lookups():
+    client = PartitionClient()
+    cache = PartitionCache()
+
+    async def lookups():
+        return await asyncio.gather(*(
+            get_latest_partition(client, "a_dummy_asset_0", "loc", cache=cache) for _ in range(5)
+        ))
+
+    assert asyncio.run(lookups()) == ["2025-10-31"] * 5
+    assert client.queries.count("location") == 1
+    assert client.queries.count("latest") == 1
+
+
+def test_latest_partition_falls_back_to_listing_all_keys():
+    client = PartitionClient(supports_connection=False)
+
+    assert asyncio.run(get_latest_partition(client, "a_dummy_asset_0", "loc")) == "2025-10-31"
+    assert client.queries == ["latest", "all"]
@@ -32,6 +32,9 @@ kubectl create namespace $NAMESPACE --dry-run=client -o yaml | kubectl apply -f
 # Create the secrets
 envsubst < "$SECRET_FILE" | kubectl apply -f -
 
+# Create the volume claim of the gldas-noah download cache
+kubectl apply --namespace $NAMESPACE -f "$SCRIPT_DIR/gldas-cache.yaml"
+
 # Add the Helm repository
 helm repo add dagster $HELM_REPO
 helm repo update
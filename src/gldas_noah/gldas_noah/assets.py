@@ -1,33 +1,47 @@
 import os
-import requests
 import time
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from datetime import datetime
 
-from dagster import asset, AssetExecutionContext, MaterializeResult
+from dagster import (
+    asset,
+    AssetExecutionContext,
+    BackfillPolicy,
+    MaterializeResult,
+    TimeWindowPartitionsDefinition,
+)
 
+from .cache import DownloadCache, MAX_BYTES
+from .s3 import s3_client_from_env, stream_to_s3
 
-def download_file(url, directory, filename=None):
-    if not os.path.exists(directory):
-        os.makedirs(directory)
-    
-    local_filename = filename if filename else url.split('/')[-1]
-    local_path = os.path.join(directory, local_filename)
+# GLDAS NOAH 0.25 degree 3-hourly granules (version 2.1) start on 2000-01-01 00:00 UTC
+GLDAS_BASE_URL = "https://hydro1.gesdisc.eosdis.nasa.gov/data/GLDAS/GLDAS_NOAH025_3H.2.1"
+PARTITION_FORMAT = "%Y-%m-%d-%H:%M"
 
-    with requests.get(url, stream=True) as r:
-        r.raise_for_status()
-        with open(local_path, 'wb') as f:
-            for chunk in r.iter_content(chunk_size=8192):
-                f.write(chunk)
-    
-    return local_path
+gldas_partitions = TimeWindowPartitionsDefinition(
+    cron_schedule="0 */3 * * *",
+    start="2000-01-01-00:00",
+    fmt=PARTITION_FORMAT,
+)
 
-@asset
+
+def granule_url(partition_key, base_url=GLDAS_BASE_URL):
+    """Return the URL of the granule of a partition, under {base_url}/{year}/{day of year}/"""
+    start = datetime.strptime(partition_key, PARTITION_FORMAT)
+    filename = f"GLDAS_NOAH025_3H.A{start:%Y%m%d}.{start:%H%M}.021.nc4"
+    return f"{base_url}/{start:%Y}/{start:%j}/{filename}"
+
+
+# A backfill of any range of partitions runs as one run (one pod and one definition load),
+# which downloads its granules with a pool of GLDAS_DOWNLOAD_POOL workers
+@asset(partitions_def=gldas_partitions, backfill_policy=BackfillPolicy.single_run())
 def gldas_noah025_3h(context: AssetExecutionContext) -> MaterializeResult:
 
-    # Dummy file to download (to check ephermeral volume storage)
-    url = "https://raw.githubusercontent.com/kubernetes/ingress-nginx/main/deploy/static/provider/kind/deploy.yaml"
+    base_url = os.getenv("GLDAS_BASE_URL", GLDAS_BASE_URL)
 
     # Data Provider Configs
     api_key = os.getenv("GLDAS_DATA_APIKEY")
+    headers = {"Authorization": f"Bearer {api_key}"} if api_key else None
 
     # AWS S3
     s3_bucket = os.getenv("GLDAS_S3_BUCKET")
@@ -35,14 +49,60 @@ def gldas_noah025_3h(context: AssetExecutionContext) -> MaterializeResult:
     s3_key = os.getenv("GLDAS_S3_ACCESS_KEY")
     s3_secret = os.getenv("GLDAS_S3_SECRET_KEY")
 
-    scratch_space = "/tmp/gldas"
-    context.log.info(f"Starting downloading GLDAS file from {url} to {scratch_space}")
-    local_path = download_file(url, scratch_space)
-    context.log.info(f"Finished downloading GLDAS file to {local_path}")
-    time.sleep(60)
+    # "s3" streams the files into the bucket without staging them on the gldas-tmp volume
+    destination = os.getenv("GLDAS_DESTINATION", "local")
+    pool_size = int(os.getenv("GLDAS_DOWNLOAD_POOL", "4"))
+    connections = int(os.getenv("GLDAS_DOWNLOAD_CONNECTIONS", "4"))
+    s3_client = s3_client_from_env() if destination == "s3" else None
+    # Granules that did not change upstream are not downloaded again, and the least
+    # recently used ones are evicted to keep the cache within GLDAS_CACHE_MAX_BYTES
+    cache = DownloadCache(
+        os.getenv("GLDAS_SCRATCH_SPACE", "/tmp/gldas"),
+        max_bytes=int(os.getenv("GLDAS_CACHE_MAX_BYTES", str(MAX_BYTES))),
+    ) if destination != "s3" else None
+
+    def fetch(partition_key):
+        url = granule_url(partition_key, base_url)
+        if destination == "s3":
+            s3_object = f"gldas/{url.split('/')[-1]}"
+            stream_to_s3(url, s3_bucket, s3_object, s3_client, headers=headers)
+            return f"s3://{s3_bucket}/{s3_object}"
+        return cache.fetch(url, headers=headers, connections=connections)
+
+    partition_keys = context.partition_keys
+    context.log.info(
+        f"Starting fetching {len(partition_keys)} GLDAS granules "
+        f"({partition_keys[0]} to {partition_keys[-1]}) to {destination} "
+        f"with {pool_size} workers"
+    )
+    with ThreadPoolExecutor(max_workers=pool_size) as executor:
+        futures = {key: executor.submit(fetch, key) for key in partition_keys}
+        # The run fails with the first failed granule, so don't start fetching the others.
+        # Fetches in progress still finish, and stay in the cache for the retry.
+        wait(futures.values(), return_when=FIRST_EXCEPTION)
+        for future in futures.values():
+            future.cancel()
+    skipped = sum(future.cancelled() for future in futures.values())
+    failed = {
+        key: error for key, future in futures.items()
+        if not future.cancelled() and (error := future.exception())
+    }
+    for key, error in failed.items():
+        context.log.error(f"Failed fetching the granule of {key}: {error}")
+    if failed:
+        raise Exception(
+            f"Failed fetching {len(failed)} of {len(partition_keys)} GLDAS granules "
+            f"({skipped} not started)"
+        )
+    locations = [futures[key].result() for key in partition_keys]
+    context.log.info(f"Finished fetching {len(locations)} GLDAS granules")
+
+    time.sleep(int(os.getenv("GLDAS_HOLD_SECONDS", "60")))
     return MaterializeResult(
         metadata={
-            "local_path": local_path,
+            "granules": len(locations),
+            "first_location": locations[0],
+            "last_location": locations[-1],
             "api_key": api_key,
             "s3_bucket": s3_bucket,
             "s3_region": s3_region,
@@ -0,0 +1,173 @@
+"""Content-addressed cache of HTTP downloads with a byte budget.
+
+Files are stored once per content under objects/<sha256>, and index.json maps every URL
+to its object together with the ETag and Last-Modified it was downloaded with. A cached
+URL is revalidated with a conditional request and only downloaded again when the server
+reports a change. Whenever the objects exceed max_bytes, the least recently used URLs
+are evicted. Unfinished downloads are kept under partial/, so download_file resumes them.
+A URL is downloaded by one fetcher at a time, across the threads and processes sharing
+the directory; the others wait and reuse its download.
+
+The cache only pays off on a directory that outlives a run, such as a persistent volume
+shared by the run pods: an emptyDir starts empty in every pod.
+"""
+
+import contextlib
+import fcntl
+import hashlib
+import json
+import os
+import threading
+
+import requests
+
+from .download import HEADERS, TIMEOUT, download_file
+
+MAX_BYTES = 16 * 1024 ** 3
+
+
+class DownloadCache:
+
+    def __init__(self, directory, max_bytes=MAX_BYTES):
+        self.directory = str(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        for name in ('objects', 'partial'):
+            os.makedirs(os.path.join(self.directory, name), exist_ok=True)
+
+    def object_path(self, digest):
+        return os.path.join(self.directory, 'objects', digest)
+
+    @contextlib.contextmanager
+    def _index(self):
+        # Guards the index against the other threads and processes sharing the directory
+        with self._lock, open(os.path.join(self.directory, 'index.lock'), 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            path = os.path.join(self.directory, 'index.json')
+            try:
+                with open(path) as f:
+                    index = json.load(f)
+            except (OSError, ValueError):
+                index = {'clock': 0, 'entries': {}}
+            yield index
+            temporary_path = path + '.tmp'
+            with open(temporary_path, 'w') as f:
+                json.dump(index, f)
+            os.replace(temporary_path, path)
+
+    @contextlib.contextmanager
+    def _download_lock(self, name):
+        # Fetchers of the same URL would write the same partial file and its part state
+        with open(os.path.join(self.directory, 'partial', name + '.lock'), 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+
+    def _use(self, index, url, entry):
+        index['clock'] += 1
+        entry['used'] = index['clock']
+        index['entries'][url] = entry
+
+    def size(self):
+        """Return the bytes taken by cached objects."""
+        with self._index() as index:
+            return sum(self._objects(index).values())
+
+    def _objects(self, index):
+        return {entry['sha256']: entry['size'] for entry in index['entries'].values()}
+
+    def _evict(self, index, keep):
+        entries = index['entries']
+        sizes = self._objects(index)
+        total = sum(sizes.values())
+        # Other URLs may have the same content, so objects are counted by their URLs
+        references = {}
+        for entry in entries.values():
+            references[entry['sha256']] = references.get(entry['sha256'], 0) + 1
+
+        for url in sorted(entries, key=lambda url: entries[url]['used']):
+            if total <= self.max_bytes:
+                return
+            if url == keep:
+                continue
+            digest = entries.pop(url)['sha256']
+            references[digest] -= 1
+            if not references[digest]:
+                total -= sizes[digest]
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(self.object_path(digest))
+
+    def _validate(self, url, entry, headers):
+        """Ask the server whether url changed since entry was stored.
+
+        Returns (unchanged, validators of the current version).
+        """
+        # One byte is enough to learn the validators when there is nothing to revalidate
+        conditional = {**headers, 'Range': 'bytes=0-0'}
+        if entry and entry.get('etag'):
+            conditional['If-None-Match'] = entry['etag']
+        if entry and entry.get('last_modified'):
+            conditional['If-Modified-Since'] = entry['last_modified']
+        with requests.get(url, headers=conditional, stream=True, timeout=TIMEOUT) as r:
+            r.raise_for_status()
+            validators = {
+                'etag': r.headers.get('ETag'),
+                'last_modified': r.headers.get('Last-Modified'),
+            }
+            return r.status_code == 304, validators
+
+    def fetch(self, url, headers=None, **download_options):
+        """Return the path of the cached content of url, downloading it when it changed.
+
+        download_options are passed on to download_file.
+        """
+        headers = {**HEADERS, **(headers or {})}
+        with self._index() as index:
+            entry = index['entries'].get(url)
+            if entry and not os.path.exists(self.object_path(entry['sha256'])):
+                entry = None
+
+        can_validate = entry and (entry.get('etag') or entry.get('last_modified'))
+        unchanged, validators = self._validate(url, entry if can_validate else None, headers)
+        if unchanged:
+            with self._index() as index:
+                if url in index['entries']:
+                    entry = index['entries'][url]
+                    self._use(index, url, entry)
+                    return self.object_path(entry['sha256'])
+            # Evicted by another fetch in the meantime
+            return self.fetch(url, headers, **download_options)
+
+        partial_name = hashlib.sha256(url.encode()).hexdigest()
+        with self._download_lock(partial_name):
+            # Another fetcher may have downloaded this version while we waited for the lock
+            with self._index() as index:
+                entry = index['entries'].get(url)
+                if (
+                    entry and any(validators.values())
+                    and all(entry.get(name) == value for name, value in validators.items())
+                    and os.path.exists(self.object_path(entry['sha256']))
+                ):
+                    self._use(index, url, entry)
+                    return self.object_path(entry['sha256'])
+
+            partial_path = download_file(
+                url, os.path.join(self.directory, 'partial'), partial_name, headers=headers,
+                **download_options,
+            )
+            with open(partial_path, 'rb') as f:
+                digest = hashlib.file_digest(f, 'sha256').hexdigest()
+            size = os.path.getsize(partial_path)
+            os.replace(partial_path, self.object_path(digest))
+
+            with self._index() as index:
+                previous = index['entries'].get(url)
+                self._use(index, url, {'sha256': digest, 'size': size, **validators})
+                # The content the URL had before is dropped unless other URLs have it too
+                if previous and all(
+                    entry['sha256'] != previous['sha256']
+                    for entry in index['entries'].values()
+                ):
+                    with contextlib.suppress(FileNotFoundError):
+                        os.remove(self.object_path(previous['sha256']))
+                self._evict(index, keep=url)
+        return self.object_path(digest)
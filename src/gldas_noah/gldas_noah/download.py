@@ -0,0 +1,228 @@
+"""Parallel, resumable HTTP downloads.
+
+Files are fetched in concurrent Range requests into a `.part` file next to the target,
+and every finished part is recorded in a `.part.json` state file. A download that is
+interrupted (e.g. by a pod restart) continues with the parts that are missing, as long
+as the remote file has the same size and ETag (or Last-Modified, when the server sends no
+ETag). Without either validator a change of the remote file cannot be detected, so the
+download starts over. Servers that do not support ranges get a single stream.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+
+PART_SIZE = 16 * 1024 * 1024
+BUFFER_SIZE = 1024 * 1024
+CONNECTIONS = 4
+TIMEOUT = 60
+
+# Byte ranges only line up with the file when the server does not compress the response
+HEADERS = {'Accept-Encoding': 'identity'}
+
+
+class ChecksumMismatch(Exception):
+    pass
+
+
+def parse_checksum(checksum):
+    """Split 'algorithm:hexdigest' (e.g. 'sha256:ab12...') into a hash object and digest."""
+    if checksum is None:
+        return None, None
+    algorithm, separator, digest = checksum.partition(':')
+    if not separator:
+        raise ValueError(f"Expected a checksum like 'sha256:<hexdigest>', got {checksum!r}")
+    return hashlib.new(algorithm), digest.lower()
+
+
+def probe(session, url, headers=HEADERS):
+    """Return (size, validator) of url, with size None when the server does not serve ranges.
+
+    The validator is the ETag, or the Last-Modified date when there is none; either can be
+    sent as If-Range. It is None when the server sends neither.
+    """
+    with session.get(url, headers={**headers, 'Range': 'bytes=0-0'}, stream=True,
+                     timeout=TIMEOUT) as r:
+        r.raise_for_status()
+        validator = r.headers.get('ETag') or r.headers.get('Last-Modified')
+        content_range = r.headers.get('Content-Range', '')
+        if r.status_code != 206 or '/' not in content_range:
+            return None, validator
+        total = content_range.rsplit('/', 1)[1]
+        return (int(total) if total.isdigit() else None), validator
+
+
+def read_state(state_path, identity):
+    """Return the parts finished by an earlier attempt at the same remote file."""
+    try:
+        with open(state_path) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return set()
+    if state.get('identity') != identity:
+        return set()
+    return set(state.get('done', []))
+
+
+def write_state(state_path, identity, done):
+    temporary_path = state_path + '.tmp'
+    with open(temporary_path, 'w') as f:
+        json.dump({'identity': identity, 'done': sorted(done)}, f)
+    os.replace(temporary_path, state_path)
+
+
+def stream_into(response, fd, offset, buffer, expected=None, hasher=None):
+    """Copy a response body into fd from offset, reusing buffer. Returns the bytes copied."""
+    view = memoryview(buffer)
+    copied = 0
+    while True:
+        count = response.raw.readinto(buffer)
+        if not count:
+            break
+        os.pwrite(fd, view[:count], offset + copied)
+        if hasher is not None:
+            hasher.update(view[:count])
+        copied += count
+    if expected is not None and copied != expected:
+        raise Exception(f"Expected {expected} bytes from offset {offset}, received {copied}")
+    return copied
+
+
+def download_single(session, url, part_path, hasher, buffer_size, headers=HEADERS):
+    """Download url in one stream, as servers without range support require."""
+    fd = os.open(part_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        with session.get(url, headers=headers, stream=True, timeout=TIMEOUT) as r:
+            r.raise_for_status()
+            length = r.headers.get('Content-Length')
+            stream_into(r, fd, 0, bytearray(buffer_size),
+                        int(length) if length and length.isdigit() else None, hasher)
+    finally:
+        os.close(fd)
+
+
+def download_ranges(url, part_path, state_path, size, validator, hasher, connections,
+                    part_size, buffer_size, headers=HEADERS):
+    """Download the missing parts of url concurrently into part_path.
+
+    The checksum is computed while parts are still downloading, by reading back every
+    part as soon as all parts before it are finished. Parts of an earlier attempt are
+    only reused when the validator (ETag or Last-Modified) is known and unchanged.
+    """
+    identity = {'url': url, 'size': size, 'validator': validator, 'part_size': part_size}
+    parts = [(start, min(start + part_size, size)) for start in range(0, size, part_size)]
+    if validator is None:
+        # A same-size change would go unnoticed and mix parts of both versions
+        for path in (part_path, state_path):
+            if os.path.exists(path):
+                os.remove(path)
+    done = read_state(state_path, identity) if os.path.exists(part_path) else set()
+
+    fd = os.open(part_path, os.O_RDWR | os.O_CREAT, 0o644)
+    local = threading.local()
+    lock = threading.Lock()
+    sessions = []
+
+    def fetch(index):
+        if not hasattr(local, 'session'):
+            # One connection and one buffer per worker, reused for all of its parts
+            local.session = requests.Session()
+            local.buffer = bytearray(buffer_size)
+            sessions.append(local.session)
+        start, stop = parts[index]
+        part_headers = {**headers, 'Range': f'bytes={start}-{stop - 1}'}
+        if validator:
+            part_headers['If-Range'] = validator
+        with local.session.get(url, headers=part_headers, stream=True, timeout=TIMEOUT) as r:
+            r.raise_for_status()
+            if r.status_code != 206:
+                raise Exception(f"{url} changed while downloading (status {r.status_code})")
+            stream_into(r, fd, start, local.buffer, stop - start)
+        with lock:
+            done.add(index)
+            write_state(state_path, identity, done)
+        return index
+
+    finished = set(done)
+    hashed = 0
+    view = memoryview(bytearray(buffer_size))
+
+    def hash_finished_prefix():
+        # Advance the checksum over every part whose predecessors are all on disk
+        nonlocal hashed
+        while hashed < len(parts) and hashed in finished:
+            start, stop = parts[hashed]
+            while start < stop:
+                count = os.preadv(fd, [view[:min(buffer_size, stop - start)]], start)
+                if not count:
+                    raise Exception(f"{part_path} is shorter than {size} bytes")
+                hasher.update(view[:count])
+                start += count
+            hashed += 1
+
+    executor = ThreadPoolExecutor(max_workers=connections)
+    try:
+        os.ftruncate(fd, size)
+        pending = {executor.submit(fetch, i) for i in range(len(parts)) if i not in done}
+        while pending:
+            if hasher is not None:
+                hash_finished_prefix()
+            completed, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in completed:
+                finished.add(future.result())
+        if hasher is not None:
+            hash_finished_prefix()
+    finally:
+        # Parts that already started are finished and recorded for the next attempt
+        executor.shutdown(cancel_futures=True)
+        for session in sessions:
+            session.close()
+        os.close(fd)
+
+
+def download_file(url, directory, filename=None, checksum=None, connections=CONNECTIONS,
+                  part_size=PART_SIZE, buffer_size=BUFFER_SIZE, headers=None):
+    """Download url into directory and return the local path.
+
+    checksum ('algorithm:hexdigest') is verified before the file is moved into place; a
+    mismatch removes the download and raises ChecksumMismatch. headers (e.g. an
+    Authorization header) are sent with every request.
+    """
+    if connections < 1 or part_size < 1 or buffer_size < 1:
+        raise ValueError("connections, part_size and buffer_size must be positive")
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+
+    local_filename = filename if filename else url.split('/')[-1]
+    local_path = os.path.join(directory, local_filename)
+    part_path = local_path + '.part'
+    state_path = part_path + '.json'
+    hasher, digest = parse_checksum(checksum)
+    headers = {**HEADERS, **(headers or {})}
+
+    with requests.Session() as session:
+        size, validator = probe(session, url, headers)
+        if size is None or size <= part_size or connections <= 1:
+            if os.path.exists(state_path):
+                os.remove(state_path)
+            download_single(session, url, part_path, hasher, buffer_size, headers)
+        else:
+            download_ranges(url, part_path, state_path, size, validator, hasher,
+                            connections, part_size, buffer_size, headers)
+
+    if hasher is not None and hasher.hexdigest() != digest:
+        for path in (part_path, state_path):
+            if os.path.exists(path):
+                os.remove(path)
+        raise ChecksumMismatch(
+            f"{checksum.split(':')[0]} of {url} is {hasher.hexdigest()}, expected {digest}"
+        )
+
+    os.replace(part_path, local_path)
+    if os.path.exists(state_path):
+        os.remove(state_path)
+    return local_path
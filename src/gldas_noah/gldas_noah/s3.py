@@ -0,0 +1,114 @@
+"""Stream HTTP downloads straight into S3 multipart uploads.
+
+The response is read into parts of PART_SIZE bytes that are uploaded concurrently while
+the next ones are read. At most MAX_IN_FLIGHT parts are held in memory; reading waits
+for an upload to finish when all of them are taken. Nothing is written to disk.
+"""
+
+import io
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from .download import HEADERS, TIMEOUT, ChecksumMismatch, parse_checksum
+
+# S3 requires at least 5 MiB for every part but the last
+PART_SIZE = 16 * 1024 * 1024
+MAX_IN_FLIGHT = 4
+
+
+def s3_client_from_env():
+    """Create an S3 client from the GLDAS_S3_* environment variables."""
+    import boto3
+
+    return boto3.client(
+        's3',
+        region_name=os.getenv("GLDAS_S3_REGION"),
+        aws_access_key_id=os.getenv("GLDAS_S3_ACCESS_KEY"),
+        aws_secret_access_key=os.getenv("GLDAS_S3_SECRET_KEY"),
+        # For S3-compatible stores such as MinIO
+        endpoint_url=os.getenv("GLDAS_S3_ENDPOINT_URL") or None,
+    )
+
+
+def read_part(response, buffer):
+    """Fill buffer from the response body. Returns the bytes read, fewer only at the end."""
+    view = memoryview(buffer)
+    filled = 0
+    while filled < len(buffer):
+        count = response.raw.readinto(view[filled:])
+        if not count:
+            break
+        filled += count
+    return filled
+
+
+def stream_to_s3(url, bucket, key, s3_client, checksum=None, part_size=PART_SIZE,
+                 max_in_flight=MAX_IN_FLIGHT, headers=None):
+    """Stream url into s3://bucket/key with a multipart upload and return the bytes copied.
+
+    checksum ('algorithm:hexdigest') is verified once the last part has been read; on a
+    mismatch, or any other failure, the upload is aborted so no object is created.
+    headers (e.g. an Authorization header) are sent with the download request.
+    """
+    if part_size < 5 * 1024 * 1024 or max_in_flight < 1:
+        raise ValueError("part_size must be at least 5 MiB and max_in_flight positive")
+    hasher, digest = parse_checksum(checksum)
+
+    upload_id = s3_client.create_multipart_upload(Bucket=bucket, Key=key)['UploadId']
+    # Released when an upload finishes, so at most max_in_flight parts wait in memory
+    slots = threading.BoundedSemaphore(max_in_flight)
+
+    def upload(number, data):
+        try:
+            response = s3_client.upload_part(
+                Bucket=bucket, Key=key, UploadId=upload_id, PartNumber=number,
+                Body=io.BytesIO(data),
+            )
+            return {'PartNumber': number, 'ETag': response['ETag']}
+        finally:
+            slots.release()
+
+    executor = ThreadPoolExecutor(max_workers=max_in_flight)
+    futures = []
+    copied = 0
+    try:
+        with requests.get(url, headers={**HEADERS, **(headers or {})}, stream=True,
+                          timeout=TIMEOUT) as r:
+            r.raise_for_status()
+            buffer = bytearray(part_size)
+            while True:
+                count = read_part(r, buffer)
+                if not count and futures:
+                    break
+                slots.acquire()
+                # Fail fast instead of reading on after an upload failed
+                for future in futures:
+                    if future.done() and future.exception() is not None:
+                        slots.release()
+                        raise future.exception()
+                data = bytes(memoryview(buffer)[:count])
+                if hasher is not None:
+                    hasher.update(data)
+                copied += count
+                futures.append(executor.submit(upload, len(futures) + 1, data))
+                if count < part_size:
+                    break
+
+        parts = [future.result() for future in futures]
+        if hasher is not None and hasher.hexdigest() != digest:
+            raise ChecksumMismatch(
+                f"{checksum.split(':')[0]} of {url} is {hasher.hexdigest()}, expected {digest}"
+            )
+        s3_client.complete_multipart_upload(
+            Bucket=bucket, Key=key, UploadId=upload_id, MultipartUpload={'Parts': parts},
+        )
+    except BaseException:
+        executor.shutdown(cancel_futures=True)
+        s3_client.abort_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id)
+        raise
+    finally:
+        executor.shutdown()
+    return copied
@@ -0,0 +1,100 @@
+import hashlib
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+class FileServer(ThreadingHTTPServer):
+    """Local HTTP server for files held in memory, with optional Range support.
+
+    requests records (path, Range header, status) of every request. A start offset in
+    fail_ranges makes the next range request from that offset break off halfway. Requests
+    with the current ETag in If-None-Match get 304 Not Modified. Without etags, no ETag is
+    sent and If-Range is matched against last_modified, which is sent when set.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, ranges=True):
+        super().__init__(("127.0.0.1", 0), FileHandler)
+        self.files = {}
+        self.ranges = ranges
+        self.etags = True
+        self.last_modified = None
+        self.fail_ranges = set()
+        self.requests = []
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.server_address[1]}/{path}"
+
+    def etag(self, path):
+        if not self.etags:
+            return None
+        return '"' + hashlib.md5(self.files[path]).hexdigest() + '"'
+
+    def validators(self, path):
+        """Return the ETag and Last-Modified headers of path."""
+        headers = {"ETag": self.etag(path), "Last-Modified": self.last_modified}
+        return {name: value for name, value in headers.items() if value is not None}
+
+
+class FileHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        path = self.path.lstrip("/")
+        content = self.server.files.get(path)
+        if content is None:
+            self.server.requests.append((path, self.headers.get("Range"), 404))
+            self.send_error(404)
+            return
+
+        etag = self.server.etag(path)
+        if etag and self.headers.get("If-None-Match") == etag:
+            self.server.requests.append((path, self.headers.get("Range"), 304))
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        start, stop, status = 0, len(content), 200
+        match = re.fullmatch(r"bytes=(\d+)-(\d*)", self.headers.get("Range") or "")
+        if_range = self.headers.get("If-Range")
+        validator = etag or self.server.last_modified
+        if self.server.ranges and match and (if_range is None or if_range == validator):
+            start = int(match.group(1))
+            stop = min(int(match.group(2)) + 1 if match.group(2) else stop, len(content))
+            status = 206
+        self.server.requests.append((path, self.headers.get("Range"), status))
+
+        self.send_response(status)
+        self.send_header("Content-Length", str(stop - start))
+        for name, value in self.server.validators(path).items():
+            self.send_header(name, value)
+        if self.server.ranges:
+            self.send_header("Accept-Ranges", "bytes")
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{stop - 1}/{len(content)}")
+        self.end_headers()
+
+        if status == 206 and start in self.server.fail_ranges:
+            self.server.fail_ranges.discard(start)
+            self.wfile.write(content[start:start + (stop - start) // 2])
+            self.close_connection = True
+            return
+        self.wfile.write(content[start:stop])
+
+
+@pytest.fixture
+def file_server():
+    server = FileServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
@@ -3,4 +3,72 @@ def test_gldas_noah025_3h():
     assert 1 == 1
 
 def test_resources():
-    assert 2 == 2
\ No newline at end of file
+    assert 2 == 2
+
+def test_granule_url_follows_the_gldas_layout():
+    from gldas_noah.assets import granule_url
+
+    assert granule_url("2000-02-01-21:00", "https://data") == (
+        "https://data/2000/032/GLDAS_NOAH025_3H.A20000201.2100.021.nc4"
+    )
+
+
+def test_backfill_fetches_a_partition_range_in_one_run(file_server, tmp_path, monkeypatch):
+    from dagster import DagsterInstance, materialize
+    from dagster._core.storage.tags import (
+        ASSET_PARTITION_RANGE_END_TAG,
+        ASSET_PARTITION_RANGE_START_TAG,
+    )
+
+    from gldas_noah.assets import gldas_noah025_3h, gldas_partitions, granule_url
+
+    keys = gldas_partitions.get_partition_keys()[:10]
+    for key in keys:
+        path = granule_url(key, "gldas")
+        file_server.files[path] = path.encode()
+    monkeypatch.setenv("GLDAS_BASE_URL", file_server.url("gldas"))
+    monkeypatch.setenv("GLDAS_SCRATCH_SPACE", str(tmp_path))
+    monkeypatch.setenv("GLDAS_HOLD_SECONDS", "0")
+    monkeypatch.setenv("GLDAS_DOWNLOAD_POOL", "3")
+    instance = DagsterInstance.ephemeral()
+
+    result = materialize(
+        [gldas_noah025_3h],
+        instance=instance,
+        tags={ASSET_PARTITION_RANGE_START_TAG: keys[0], ASSET_PARTITION_RANGE_END_TAG: keys[-1]},
+    )
+
+    assert result.success
+    assert len(list((tmp_path / "objects").iterdir())) == 10
+    assert instance.get_materialized_partitions(gldas_noah025_3h.key) == set(keys)
+
+
+def test_backfill_stops_fetching_after_the_first_failure(file_server, tmp_path, monkeypatch):
+    from dagster import DagsterInstance, materialize
+    from dagster._core.storage.tags import (
+        ASSET_PARTITION_RANGE_END_TAG,
+        ASSET_PARTITION_RANGE_START_TAG,
+    )
+
+    from gldas_noah.assets import gldas_noah025_3h, gldas_partitions, granule_url
+
+    keys = gldas_partitions.get_partition_keys()[:10]
+    # The first granule is missing upstream
+    for key in keys[1:]:
+        path = granule_url(key, "gldas")
+        file_server.files[path] = path.encode()
+    monkeypatch.setenv("GLDAS_BASE_URL", file_server.url("gldas"))
+    monkeypatch.setenv("GLDAS_SCRATCH_SPACE", str(tmp_path))
+    monkeypatch.setenv("GLDAS_HOLD_SECONDS", "0")
+    monkeypatch.setenv("GLDAS_DOWNLOAD_POOL", "1")
+
+    result = materialize(
+        [gldas_noah025_3h],
+        instance=DagsterInstance.ephemeral(),
+        tags={ASSET_PARTITION_RANGE_START_TAG: keys[0], ASSET_PARTITION_RANGE_END_TAG: keys[-1]},
+        raise_on_error=False,
+    )
+
+    assert not result.success
+    # The worker may pick up the next granule before the others are cancelled
+    assert len({path for path, _, _ in file_server.requests}) <= 2
@@ -0,0 +1,70 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from gldas_noah.cache import DownloadCache
+
+
+def statuses(server):
+    return [status for _, _, status in server.requests]
+
+
+def test_unchanged_files_are_revalidated_instead_of_downloaded(file_server, tmp_path):
+    file_server.files["a.nc4"] = b"a" * 1000
+    cache = DownloadCache(tmp_path)
+
+    path = cache.fetch(file_server.url("a.nc4"))
+    downloads = len(file_server.requests)
+    assert cache.fetch(file_server.url("a.nc4")) == path
+
+    assert statuses(file_server)[downloads:] == [304]
+    assert open(path, "rb").read() == b"a" * 1000
+
+
+def test_changed_files_replace_their_cached_content(file_server, tmp_path):
+    file_server.files["a.nc4"] = b"old"
+    cache = DownloadCache(tmp_path)
+    old_path = cache.fetch(file_server.url("a.nc4"))
+
+    file_server.files["a.nc4"] = b"new"
+    new_path = cache.fetch(file_server.url("a.nc4"))
+
+    assert open(new_path, "rb").read() == b"new"
+    assert not os.path.exists(old_path)
+
+
+def test_identical_content_is_stored_once(file_server, tmp_path):
+    file_server.files["a.nc4"] = file_server.files["b.nc4"] = b"same" * 100
+    cache = DownloadCache(tmp_path)
+
+    assert cache.fetch(file_server.url("a.nc4")) == cache.fetch(file_server.url("b.nc4"))
+    assert cache.size() == 400
+
+
+def test_least_recently_used_files_are_evicted_over_budget(file_server, tmp_path):
+    for name in "abc":
+        file_server.files[f"{name}.nc4"] = name.encode() * 1000
+    cache = DownloadCache(tmp_path, max_bytes=2500)
+
+    a = cache.fetch(file_server.url("a.nc4"))
+    b = cache.fetch(file_server.url("b.nc4"))
+    cache.fetch(file_server.url("a.nc4"))
+    c = cache.fetch(file_server.url("c.nc4"))
+
+    assert os.path.exists(a) and os.path.exists(c)
+    assert not os.path.exists(b)
+    assert cache.size() == 2000
+
+
+def test_concurrent_fetches_of_a_url_download_it_once(file_server, tmp_path):
+    file_server.files["a.nc4"] = b"a" * 100_000
+    # One cache per fetcher, like run pods sharing the volume
+    caches = [DownloadCache(tmp_path) for _ in range(4)]
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        paths = list(executor.map(lambda cache: cache.fetch(file_server.url("a.nc4")), caches))
+
+    assert len(set(paths)) == 1
+    assert open(paths[0], "rb").read() == b"a" * 100_000
+    downloads = [request for request in file_server.requests if request[1] != "bytes=0-0"]
+    assert len(downloads) == 1
+    assert not [name for name in os.listdir(tmp_path / "partial") if not name.endswith(".lock")]
@@ -0,0 +1,107 @@
+import hashlib
+import os
+
+import pytest
+
+from gldas_noah.download import ChecksumMismatch, download_file
+
+PART_SIZE = 64 * 1024
+
+
+def serve(server, size=10 * PART_SIZE + 123):
+    content = os.urandom(size)
+    server.files["granule.nc4"] = content
+    return content, "sha256:" + hashlib.sha256(content).hexdigest()
+
+
+def ranges(server):
+    return [header for _, header, status in server.requests if status == 206]
+
+
+def test_downloads_parts_concurrently_and_verifies_checksum(file_server, tmp_path):
+    content, checksum = serve(file_server)
+
+    path = download_file(file_server.url("granule.nc4"), tmp_path, checksum=checksum,
+                         connections=4, part_size=PART_SIZE, buffer_size=4096)
+
+    assert open(path, "rb").read() == content
+    # The probe and one request per part
+    assert len(ranges(file_server)) == 1 + 11
+    assert os.listdir(tmp_path) == ["granule.nc4"]
+
+
+def test_falls_back_to_a_single_stream_without_range_support(file_server, tmp_path):
+    file_server.ranges = False
+    content, checksum = serve(file_server)
+
+    path = download_file(file_server.url("granule.nc4"), tmp_path, checksum=checksum,
+                         part_size=PART_SIZE)
+
+    assert open(path, "rb").read() == content
+    assert [status for _, _, status in file_server.requests] == [200, 200]
+
+
+def test_resumes_the_missing_parts_after_an_interruption(file_server, tmp_path):
+    content, checksum = serve(file_server)
+    file_server.fail_ranges.add(5 * PART_SIZE)
+    url = file_server.url("granule.nc4")
+
+    with pytest.raises(Exception):
+        download_file(url, tmp_path, checksum=checksum, connections=2, part_size=PART_SIZE)
+    assert os.path.exists(tmp_path / "granule.nc4.part.json")
+    first_attempt = len(ranges(file_server))
+
+    path = download_file(url, tmp_path, checksum=checksum, connections=2, part_size=PART_SIZE)
+
+    assert open(path, "rb").read() == content
+    # The probe and only the parts the first attempt did not finish
+    assert len(ranges(file_server)) - first_attempt < 1 + 11
+    assert f"bytes={5 * PART_SIZE}-{6 * PART_SIZE - 1}" in ranges(file_server)[first_attempt:]
+    assert os.listdir(tmp_path) == ["granule.nc4"]
+
+
+def interrupt_then_change(server, tmp_path, last_modified=None):
+    """Break off a download, then replace the file with one of the same size."""
+    serve(server)
+    server.fail_ranges.add(5 * PART_SIZE)
+    url = server.url("granule.nc4")
+    with pytest.raises(Exception):
+        download_file(url, tmp_path, connections=2, part_size=PART_SIZE)
+    assert os.path.exists(tmp_path / "granule.nc4.part.json")
+
+    server.last_modified = last_modified
+    content, checksum = serve(server)
+    return url, content, checksum
+
+
+def test_last_modified_detects_a_change_without_an_etag(file_server, tmp_path):
+    file_server.etags = False
+    file_server.last_modified = "Mon, 05 Oct 2026 10:00:00 GMT"
+    url, content, checksum = interrupt_then_change(
+        file_server, tmp_path, last_modified="Tue, 06 Oct 2026 10:00:00 GMT"
+    )
+
+    path = download_file(url, tmp_path, checksum=checksum, connections=2, part_size=PART_SIZE)
+
+    assert open(path, "rb").read() == content
+
+
+def test_starts_over_without_an_etag_or_last_modified(file_server, tmp_path):
+    file_server.etags = False
+    url, content, checksum = interrupt_then_change(file_server, tmp_path)
+    first_attempt = len(ranges(file_server))
+
+    path = download_file(url, tmp_path, checksum=checksum, connections=2, part_size=PART_SIZE)
+
+    assert open(path, "rb").read() == content
+    # The probe and every part, since finished parts could belong to the old file
+    assert len(ranges(file_server)) - first_attempt == 1 + 11
+
+
+def test_checksum_mismatch_removes_the_download(file_server, tmp_path):
+    serve(file_server)
+
+    with pytest.raises(ChecksumMismatch):
+        download_file(file_server.url("granule.nc4"), tmp_path, checksum="sha256:" + "0" * 64,
+                      part_size=PART_SIZE)
+    assert os.listdir(tmp_path) == []
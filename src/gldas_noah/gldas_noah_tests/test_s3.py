@@ -0,0 +1,46 @@
+import hashlib
+import os
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from gldas_noah.download import ChecksumMismatch
+from gldas_noah.s3 import stream_to_s3
+
+PART_SIZE = 5 * 1024 * 1024
+
+
+@pytest.fixture
+def s3():
+    with mock_aws():
+        client = boto3.client("s3", region_name="eu-west-1")
+        client.create_bucket(
+            Bucket="gldas", CreateBucketConfiguration={"LocationConstraint": "eu-west-1"}
+        )
+        yield client
+
+
+def test_streams_the_file_in_multipart_upload_parts(file_server, s3):
+    content = os.urandom(2 * PART_SIZE + 1234)
+    file_server.files["granule.nc4"] = content
+    checksum = "sha256:" + hashlib.sha256(content).hexdigest()
+
+    copied = stream_to_s3(file_server.url("granule.nc4"), "gldas", "g/granule.nc4", s3,
+                          checksum=checksum, part_size=PART_SIZE, max_in_flight=2)
+
+    assert copied == len(content)
+    assert s3.get_object(Bucket="gldas", Key="g/granule.nc4")["Body"].read() == content
+    # Multipart ETags end with the number of parts
+    assert s3.head_object(Bucket="gldas", Key="g/granule.nc4")["ETag"].endswith('-3"')
+
+
+def test_checksum_mismatch_aborts_the_upload(file_server, s3):
+    file_server.files["granule.nc4"] = os.urandom(PART_SIZE + 1)
+
+    with pytest.raises(ChecksumMismatch):
+        stream_to_s3(file_server.url("granule.nc4"), "gldas", "g/granule.nc4", s3,
+                     checksum="sha256:" + "0" * 64, part_size=PART_SIZE)
+
+    assert "Contents" not in s3.list_objects_v2(Bucket="gldas")
+    assert "Uploads" not in s3.list_multipart_uploads(Bucket="gldas")
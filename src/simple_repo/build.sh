@@ -30,6 +30,7 @@ docker buildx create --name multiarch-builder --use 2>/dev/null || docker buildx
 docker buildx build \
     --platform linux/amd64,linux/arm64 \
     --tag "${IMAGE_NAME}:${TAG}" \
+    --build-arg SNAPSHOT_CONFIGS="${SNAPSHOT_CONFIGS}" \
     --push \
     ${PWD}
 
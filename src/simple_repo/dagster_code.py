@@ -1,7 +1,21 @@
+import math
 import os
+import random
+import sys
 import time
 from datetime import datetime
-from dagster import asset, Definitions, DailyPartitionsDefinition, HourlyPartitionsDefinition
+from dagster import (
+    AssetKey,
+    AssetOut,
+    DailyPartitionsDefinition,
+    Definitions,
+    HourlyPartitionsDefinition,
+    Output,
+    asset,
+    graph_multi_asset,
+    multi_asset,
+    op,
+)
 
 
 # Get configuration from environment variables
@@ -9,6 +23,61 @@ NUM_ASSETS = int(os.getenv("NUM_ASSETS", "100"))
 NUM_PARTITIONS = int(os.getenv("NUM_PARTITIONS", "0"))  # 0 means no partitions
 PARTITION_TYPE = os.getenv("PARTITION_TYPE", "daily").lower()  # daily or hourly
 
+# Sharding: split the NUM_ASSETS assets over SHARD_COUNT code locations.
+# Shard SHARD_INDEX builds the assets whose number i satisfies i % SHARD_COUNT == SHARD_INDEX,
+# keeping the asset names of the unsharded location so asset keys stay stable.
+SHARD_COUNT = int(os.getenv("SHARD_COUNT", "1"))
+SHARD_INDEX = int(os.getenv("SHARD_INDEX", "0"))
+
+if SHARD_COUNT < 1 or not 0 <= SHARD_INDEX < SHARD_COUNT:
+    raise ValueError(
+        f"Invalid shard {SHARD_INDEX} of {SHARD_COUNT}: "
+        "SHARD_COUNT must be at least 1 and 0 <= SHARD_INDEX < SHARD_COUNT"
+    )
+
+# Layout of the same NUM_ASSETS logical assets:
+# - separate:    one @asset per asset
+# - multi_asset: one subsettable @multi_asset per ASSET_GROUP_SIZE assets, one output each
+# - graph_asset: one subsettable @graph_multi_asset per ASSET_GROUP_SIZE assets, wrapping
+#                one op per asset
+# Asset names are the same in every layout, so each asset can still be launched on its own.
+ASSET_LAYOUT = os.getenv("ASSET_LAYOUT", "separate").lower()
+ASSET_GROUP_SIZE = int(os.getenv("ASSET_GROUP_SIZE", "100"))
+
+if ASSET_LAYOUT not in ("separate", "multi_asset", "graph_asset"):
+    raise ValueError(
+        f"Invalid ASSET_LAYOUT {ASSET_LAYOUT!r}: use separate, multi_asset or graph_asset"
+    )
+if ASSET_GROUP_SIZE < 1:
+    raise ValueError(f"Invalid ASSET_GROUP_SIZE {ASSET_GROUP_SIZE}: must be at least 1")
+
+# Dependencies between the assets, generated deterministically from TOPOLOGY_SEED. Asset i
+# only ever depends on assets with smaller numbers, so every topology is a DAG:
+# - none:    no dependencies
+# - chain:   asset i depends on asset i-1
+# - fan_in:  the last asset depends on every other asset
+# - fan_out: every other asset depends on asset 0
+# - layered: NUM_LAYERS equal layers; each asset depends on every asset of the previous
+#            layer with probability EDGE_DENSITY, and on at least one of them
+# - random:  asset i depends on every asset j < i with probability EDGE_DENSITY
+ASSET_TOPOLOGY = os.getenv("ASSET_TOPOLOGY", "none").lower()
+EDGE_DENSITY = float(os.getenv("EDGE_DENSITY", "0.001"))
+NUM_LAYERS = int(os.getenv("NUM_LAYERS", "10"))
+TOPOLOGY_SEED = int(os.getenv("TOPOLOGY_SEED", "0"))
+
+if ASSET_TOPOLOGY not in ("none", "chain", "fan_in", "fan_out", "layered", "random"):
+    raise ValueError(
+        f"Invalid ASSET_TOPOLOGY {ASSET_TOPOLOGY!r}: "
+        "use none, chain, fan_in, fan_out, layered or random"
+    )
+if not 0 <= EDGE_DENSITY <= 1 or NUM_LAYERS < 1:
+    raise ValueError(
+        f"Invalid EDGE_DENSITY {EDGE_DENSITY} or NUM_LAYERS {NUM_LAYERS}: "
+        "EDGE_DENSITY must be between 0 and 1 and NUM_LAYERS at least 1"
+    )
+if ASSET_TOPOLOGY != "none" and ASSET_LAYOUT == "graph_asset":
+    raise ValueError("ASSET_TOPOLOGY needs ASSET_LAYOUT separate or multi_asset")
+
 # Get asset prefix - REQUIRED to ensure stable asset IDs across process restarts
 ASSET_PREFIX = os.getenv("ASSET_PREFIX")
 
@@ -42,19 +111,84 @@ if NUM_PARTITIONS > 0:
         partitions_def = DailyPartitionsDefinition(start_date=start_date)
 
 
+def sample_range(rng, start, stop, probability):
+    """Pick every number in [start, stop) with the given probability, in O(picked) time."""
+    if probability <= 0:
+        return []
+    if probability >= 1:
+        return list(range(start, stop))
+    picked = []
+    log_skip = math.log(1.0 - probability)
+    i = start - 1
+    while True:
+        # Geometric gaps between picks, as in Batagelj & Brandes' G(n, p) generator
+        i += 1 + int(math.log(1.0 - rng.random()) / log_skip)
+        if i >= stop:
+            return picked
+        picked.append(i)
+
+
+def upstream_assets(num_assets, topology, density, num_layers, seed):
+    """Return {asset number: [numbers of the assets it depends on]} for a topology."""
+    rng = random.Random(seed)
+    if topology == "chain":
+        return {i: [i - 1] for i in range(1, num_assets)}
+    if topology == "fan_in":
+        return {num_assets - 1: list(range(num_assets - 1))} if num_assets > 1 else {}
+    if topology == "fan_out":
+        return {i: [0] for i in range(1, num_assets)}
+    if topology == "layered":
+        layers = min(num_layers, num_assets)
+        starts = [layer * num_assets // layers for layer in range(layers + 1)]
+        upstream = {}
+        for layer in range(1, layers):
+            previous = (starts[layer - 1], starts[layer])
+            for i in range(starts[layer], starts[layer + 1]):
+                parents = sample_range(rng, *previous, density)
+                upstream[i] = parents or [rng.randrange(*previous)]
+        return upstream
+    if topology == "random":
+        upstream = {}
+        for i in range(1, num_assets):
+            parents = sample_range(rng, 0, i, density)
+            if parents:
+                upstream[i] = parents
+        return upstream
+    return {}
+
+
+upstream = upstream_assets(
+    NUM_ASSETS, ASSET_TOPOLOGY, EDGE_DENSITY, NUM_LAYERS, TOPOLOGY_SEED
+)
+
+# Dagster walks the asset job's graph recursively, one frame per dependency level, so deep
+# graphs like a long chain exceed the default recursion limit of 1000. Only chains and
+# layers get deep; the other topologies keep the default limit.
+GRAPH_DEPTH = {"chain": NUM_ASSETS, "layered": min(NUM_LAYERS, NUM_ASSETS)}.get(ASSET_TOPOLOGY, 0)
+if GRAPH_DEPTH:
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 2 * GRAPH_DEPTH + 1000))
+
+
+def asset_name(i):
+    return f"{ASSET_PREFIX}_dummy_asset_{i}"
+
+
 # Dynamically create assets
 def create_dummy_asset(i):
+    # Dependencies on assets of other shards are kept, as cross-location dependencies
+    deps = [asset_name(j) for j in upstream.get(i, [])]
     if partitions_def:
         @asset(
             name=f"{ASSET_PREFIX}_dummy_asset_{i}",
-            partitions_def=partitions_def
+            partitions_def=partitions_def,
+            deps=deps,
         )
         def dummy_asset():
             """A partitioned dummy asset that sleeps for 100ms."""
             time.sleep(0.1)  # Sleep for 100ms
             return f"Asset {ASSET_PREFIX}_{i} completed"
     else:
-        @asset(name=f"{ASSET_PREFIX}_dummy_asset_{i}")
+        @asset(name=f"{ASSET_PREFIX}_dummy_asset_{i}", deps=deps)
         def dummy_asset():
             """A dummy asset that sleeps for 100ms."""
             time.sleep(0.1)  # Sleep for 100ms
@@ -63,11 +197,110 @@ def create_dummy_asset(i):
     return dummy_asset
 
 
-# Generate all assets
-assets = [create_dummy_asset(i) for i in range(NUM_ASSETS)]
+def create_dummy_multi_asset(group, numbers):
+    """One op producing the assets in numbers, materializing only the selected ones."""
+    external = sorted({j for i in numbers for j in upstream.get(i, [])} - set(numbers))
+
+    @multi_asset(
+        name=f"{ASSET_PREFIX}_dummy_multi_asset_{group}",
+        outs={asset_name(i): AssetOut(is_required=False) for i in numbers},
+        deps=[asset_name(j) for j in external],
+        internal_asset_deps={
+            asset_name(i): {AssetKey(asset_name(j)) for j in upstream.get(i, [])}
+            for i in numbers
+        },
+        partitions_def=partitions_def,
+        can_subset=True,
+    )
+    def dummy_multi_asset(context):
+        """Dummy assets that sleep for 100ms each."""
+        for name in sorted(context.selected_output_names):
+            time.sleep(0.1)  # Sleep for 100ms
+            yield Output(f"Asset {name} completed", output_name=name)
+
+    return dummy_multi_asset
+
+
+def create_dummy_op(i):
+    @op(name=f"{ASSET_PREFIX}_dummy_op_{i}")
+    def dummy_op():
+        """A dummy op that sleeps for 100ms."""
+        time.sleep(0.1)  # Sleep for 100ms
+        return f"Asset {ASSET_PREFIX}_{i} completed"
+
+    return dummy_op
+
+
+def create_dummy_graph_asset(group, numbers):
+    """A graph of one op per asset in numbers; unselected ops are not executed."""
+    ops = {i: create_dummy_op(i) for i in numbers}
+
+    @graph_multi_asset(
+        name=f"{ASSET_PREFIX}_dummy_graph_asset_{group}",
+        outs={asset_name(i): AssetOut() for i in numbers},
+        partitions_def=partitions_def,
+        can_subset=True,
+    )
+    def dummy_graph_asset():
+        return {asset_name(i): dummy_op() for i, dummy_op in ops.items()}
+
+    return dummy_graph_asset
+
+
+# This shard's asset numbers (all of them when not sharded)
+asset_numbers = [i for i in range(NUM_ASSETS) if i % SHARD_COUNT == SHARD_INDEX]
+
+if ASSET_LAYOUT == "separate":
+    assets = [create_dummy_asset(i) for i in asset_numbers]
+else:
+    create_group = (
+        create_dummy_multi_asset if ASSET_LAYOUT == "multi_asset" else create_dummy_graph_asset
+    )
+    assets = [
+        create_group(start // ASSET_GROUP_SIZE, asset_numbers[start:start + ASSET_GROUP_SIZE])
+        for start in range(0, len(asset_numbers), ASSET_GROUP_SIZE)
+    ]
 
 
 # Define the code location
 defs = Definitions(
     assets=assets,
 )
+
+
+# Every setting the definitions depend on; a precomputed snapshot is only used when they
+# match the ones it was built with (see snapshot_cache.py)
+SNAPSHOT_SETTINGS = {
+    "NUM_ASSETS": NUM_ASSETS,
+    "NUM_PARTITIONS": NUM_PARTITIONS,
+    "PARTITION_TYPE": PARTITION_TYPE,
+    "ASSET_PREFIX": ASSET_PREFIX,
+    "SHARD_COUNT": SHARD_COUNT,
+    "SHARD_INDEX": SHARD_INDEX,
+    "ASSET_LAYOUT": ASSET_LAYOUT,
+    "ASSET_GROUP_SIZE": ASSET_GROUP_SIZE,
+    "ASSET_TOPOLOGY": ASSET_TOPOLOGY,
+    "EDGE_DENSITY": EDGE_DENSITY,
+    "NUM_LAYERS": NUM_LAYERS,
+    "TOPOLOGY_SEED": TOPOLOGY_SEED,
+}
+
+# Serve the repository snapshot precomputed at image build time, if there is one
+SNAPSHOT_CACHE_DIR = os.getenv("SNAPSHOT_CACHE_DIR")
+
+SNAPSHOT_CACHED = False
+
+if SNAPSHOT_CACHE_DIR:
+    import importlib.util
+
+    # Loaded from next to this file, as the code server may not have /app on sys.path
+    spec = importlib.util.spec_from_file_location(
+        "snapshot_cache", os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                       "snapshot_cache.py")
+    )
+    snapshot_cache = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(snapshot_cache)
+
+    SNAPSHOT_CACHED = snapshot_cache.install_snapshot_cache(
+        defs, SNAPSHOT_SETTINGS, __file__, SNAPSHOT_CACHE_DIR
+    )
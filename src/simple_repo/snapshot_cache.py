@@ -0,0 +1,180 @@
+"""Repository snapshots of dagster_code.py precomputed at image build time.
+
+The code server builds a repository snapshot (RepositorySnap) every time the webserver or
+daemon fetches the location, which takes seconds for thousands of assets. `build` runs
+during the image build and stores the snapshots of the given configurations; at startup,
+dagster_code.py calls install_snapshot_cache, which serves them while the code, the
+settings and the Dagster version match the build.
+
+Dagster has no public hook for this, so install_snapshot_cache replaces the private
+RepositorySnap.from_def for this repository only and leaves everything else untouched. It
+checks the signature it was written against first, and leaves Dagster alone with a
+warning when an upgrade changed it.
+
+Only code servers benefit: run workers don't build repository snapshots, and every
+process, run pods included, still imports dagster_code.py and builds every asset. So this
+shortens the cold start and reloads of a location, not the init lag of a run.
+
+Usage (at build time), one NAME=value,NAME=value environment per deployment, separated
+by semicolons or given as separate arguments:
+    python snapshot_cache.py build --directory /app/snapshots \\
+        "NUM_ASSETS=10000,ASSET_PREFIX=10k;NUM_ASSETS=2000,ASSET_PREFIX=2k"
+"""
+
+import argparse
+import gzip
+import hashlib
+import inspect
+import json
+import logging
+import os
+import runpy
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# Requests with defer_snapshots=True (webserver, daemon) leave the job snapshots out
+VARIANTS = {"deferred": True, "full": False}
+
+# Parameters of RepositorySnap.from_def that install_snapshot_cache replaces it for
+FROM_DEF_PARAMETERS = ["repository_def", "defer_snapshots"]
+
+logger = logging.getLogger(__name__)
+
+
+def cache_key(code_path, settings) -> str:
+    """Return the key of a snapshot: hash of the code, its settings and the Dagster version."""
+    import dagster
+
+    digest = hashlib.sha256(Path(code_path).read_bytes()).hexdigest()
+    identity = {"code": digest, "dagster": dagster.__version__, "settings": settings}
+    return hashlib.sha256(json.dumps(identity, sort_keys=True).encode()).hexdigest()
+
+
+def snapshot_path(directory, key) -> Path:
+    return Path(directory) / f"{key}.json.gz"
+
+
+def write_snapshots(code_path, directory) -> Path:
+    """Load code_path with the current environment and store its repository snapshots."""
+    from dagster import serialize_value
+    from dagster._core.remote_representation.external_data import RepositorySnap
+
+    namespace = runpy.run_path(str(code_path))
+    repository_def = namespace["defs"].get_repository_def()
+    path = snapshot_path(directory, cache_key(code_path, namespace["SNAPSHOT_SETTINGS"]))
+    record = {
+        "key": path.name.split(".")[0],
+        "snapshots": {
+            variant: serialize_value(
+                RepositorySnap.from_def(repository_def, defer_snapshots=deferred)
+            )
+            for variant, deferred in VARIANTS.items()
+        },
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with gzip.open(path, "wt") as f:
+        json.dump(record, f)
+    return path
+
+
+def install_snapshot_cache(defs, settings, code_path, directory) -> bool:
+    """Serve the repository snapshots of defs from directory when a matching one exists.
+
+    Returns whether a snapshot was found. Snapshots are read on the first request.
+    """
+    try:
+        from dagster import deserialize_value
+        from dagster._core.remote_representation.external_data import RepositorySnap
+    except ImportError:
+        # Private API, only available in some Dagster versions
+        return False
+
+    original = RepositorySnap.from_def
+    parameters = list(inspect.signature(original).parameters)
+    if parameters != FROM_DEF_PARAMETERS:
+        logger.warning(
+            "Not serving precomputed snapshots: RepositorySnap.from_def takes %s instead of "
+            "%s in this Dagster version", parameters, FROM_DEF_PARAMETERS,
+        )
+        return False
+
+    key = cache_key(code_path, settings)
+    path = snapshot_path(directory, key)
+    if not path.exists():
+        return False
+
+    loaded = {}
+
+    def from_def(repository_def, defer_snapshots=False):
+        if repository_def is not defs.get_repository_def():
+            return original(repository_def, defer_snapshots=defer_snapshots)
+        variant = "deferred" if defer_snapshots else "full"
+        if variant not in loaded:
+            with gzip.open(path, "rt") as f:
+                record = json.load(f)
+            if record.get("key") != key:
+                return original(repository_def, defer_snapshots=defer_snapshots)
+            loaded[variant] = deserialize_value(record["snapshots"][variant], RepositorySnap)
+        return loaded[variant]
+
+    RepositorySnap.from_def = staticmethod(from_def)
+    return True
+
+
+def parse_configs(value) -> list[dict]:
+    """Parse 'NAME=value,NAME=value;NAME=value' into one environment per deployment."""
+    configs = []
+    for deployment in filter(str.strip, value.split(";")):
+        config = {}
+        for item in filter(str.strip, deployment.split(",")):
+            name, separator, setting = item.partition("=")
+            if not separator:
+                raise argparse.ArgumentTypeError(f"Expected NAME=value, got {item!r}")
+            config[name.strip()] = setting.strip()
+        configs.append(config)
+    return configs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute repository snapshots")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build = subparsers.add_parser("build", help="Store the snapshots of some configurations")
+    build.add_argument("configs", nargs="*", type=parse_configs,
+                       help="Environments of deployments, e.g. "
+                            "'NUM_ASSETS=2000,ASSET_PREFIX=2k;NUM_ASSETS=500,ASSET_PREFIX=500'")
+    build.add_argument("--directory", default="snapshots",
+                       help="Directory the snapshots are stored in (default: snapshots)")
+    build.add_argument("--code", default=str(Path(__file__).with_name("dagster_code.py")),
+                       help="Code file (default: dagster_code.py next to this file)")
+    write = subparsers.add_parser("write", help="Store the snapshot of the current environment")
+    write.add_argument("--directory", default="snapshots")
+    write.add_argument("--code", default=str(Path(__file__).with_name("dagster_code.py")))
+    args = parser.parse_args()
+
+    if args.command == "write":
+        print(write_snapshots(args.code, args.directory))
+        return
+
+    # Every configuration is loaded in its own process, as dagster_code.py reads its
+    # settings at import time
+    for config in [config for configs in args.configs for config in configs]:
+        env = {name: value for name, value in os.environ.items() if name != "SNAPSHOT_CACHE_DIR"}
+        env.update(config)
+        start = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable, __file__, "write", "--directory", args.directory,
+             "--code", args.code],
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if completed.returncode != 0:
+            print(completed.stderr, file=sys.stderr)
+            sys.exit(f"Failed to build the snapshot of {config}")
+        print(f"{config}: {completed.stdout.strip()} ({time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()